@@ -2,15 +2,11 @@
 Top level API (:mod:`pyproject2conda`)
 ======================================
 """
-# ruff: noqa: RUF067
 
-from importlib.metadata import PackageNotFoundError
-from importlib.metadata import version as _version
+from typing import TYPE_CHECKING
 
-try:
-    __version__ = _version("pyproject2conda")
-except PackageNotFoundError:  # pragma: no cover
-    __version__ = "999"
+if TYPE_CHECKING:
+    __version__: str
 
 
 __author__ = """William P. Krekelberg"""
@@ -19,3 +15,20 @@ __author__ = """William P. Krekelberg"""
 __all__ = [
     "__version__",
 ]
+
+
+def __getattr__(name: str) -> str:
+    # Looking up the installed version is slow, so only do it on request.
+    if name == "__version__":
+        from importlib.metadata import PackageNotFoundError
+        from importlib.metadata import version as _version
+
+        try:
+            value = _version("pyproject2conda")
+        except PackageNotFoundError:  # pragma: no cover
+            value = "999"
+        globals()[name] = value
+        return value
+
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -0,0 +1,215 @@
+"""
+Persistent cache (:mod:`~pyproject2conda.cache`)
+================================================
+
+Opt-in on-disk cache shared between invocations of ``pyproject2conda``.
+
+Two caches are kept under the cache directory: ``parse`` (parsed
+``pyproject.toml`` files, keyed by file content) and ``render`` (rendered
+outputs, keyed by the inputs of each output).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+from contextlib import suppress
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pyproject2conda.utils import atomic_write_bytes
+
+from ._typing_compat import override
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import Any
+
+
+DEFAULT_MAX_SIZE = 32 * 2**20
+"""Default maximum size (in bytes) of a :class:`DiskCache`."""
+
+
+def user_cache_dir() -> Path:
+    """
+    Default location of cache.
+
+    Uses the environment variable ``P2C_CACHE_DIR`` if set.  Otherwise, use the
+    platform specific user cache directory.
+    """
+    if path := os.environ.get("P2C_CACHE_DIR"):
+        return Path(path)
+
+    base: str | Path | None
+    if sys.platform == "win32":  # pragma: no cover
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":  # pragma: no cover
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "pyproject2conda"
+
+
+def hash_key(*parts: bytes | str) -> str:
+    """Hex digest of ``parts``, including the version of ``pyproject2conda``."""
+    from pyproject2conda import __version__
+
+    h = hashlib.sha256(__version__.encode())
+    for part in parts:
+        h.update(b"\0")
+        h.update(part.encode() if isinstance(part, str) else part)
+    return h.hexdigest()
+
+
+class DiskCache:
+    """
+    Directory of files keyed by hash with least recently used eviction.
+
+    Entries are written atomically, so that several processes can share a
+    cache directory.  Reading an entry bumps its modification time, and the
+    oldest entries are removed once the total size exceeds ``max_size``.
+
+    Parameters
+    ----------
+    path : path-like
+        Cache directory.  Created on first write.
+    max_size : int
+        Maximum total size in bytes of cached entries.
+    """
+
+    suffix: str = ".cache"
+
+    def __init__(self, path: str | Path, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.path = Path(path)
+        self.max_size = max_size
+        # upper bound on total size, so that not every write scans the directory
+        self._size: int | None = None
+
+    def _entry(self, key: str) -> Path:
+        return self.path / f"{key}{self.suffix}"
+
+    def _iter_entries(self) -> Iterable[Path]:
+        return self.path.glob(f"*{self.suffix}")
+
+    def get(self, key: str) -> bytes | None:
+        """Cached value for ``key``, or ``None`` if missing."""
+        path = self._entry(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+
+        # mark as recently used
+        with suppress(OSError):
+            os.utime(path)
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        """Store ``data`` under ``key``."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(self._entry(key), data)
+        if self._size is not None:
+            self._size += len(data)
+        if self._size is None or self._size > self.max_size:
+            self.evict()
+
+    def delete(self, key: str) -> None:
+        """Remove entry ``key`` (if any)."""
+        self._entry(key).unlink(missing_ok=True)
+
+    def evict(self, max_size: int | None = None) -> int:
+        """Remove least recently used entries until below ``max_size``.  Returns number removed."""
+        if max_size is None:
+            max_size = self.max_size
+
+        entries: list[tuple[float, int, Path]] = []
+        for path in self._iter_entries():
+            try:
+                st = path.stat()
+            except OSError:  # pragma: no cover
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries, key=itemgetter(0)):
+            if total <= max_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        self._size = total
+        return removed
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        _ = self.evict(max_size=-1)
+
+
+class TieredCache(DiskCache):
+    """
+    :class:`DiskCache` with an in-process tier of recently used entries.
+
+    Entries read or written in this process are kept in memory (up to
+    ``memory_entries``, least recently used first out), so repeated lookups
+    in one run do not touch the disk.
+
+    Parameters
+    ----------
+    path : path-like
+        Cache directory.  Created on first write.
+    max_size : int
+        Maximum total size in bytes of cached entries on disk.
+    memory_entries : int
+        Maximum number of entries kept in memory.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_size: int = DEFAULT_MAX_SIZE,
+        memory_entries: int = 256,
+    ) -> None:
+        super().__init__(path, max_size=max_size)
+        self.memory_entries = memory_entries
+        self._memory: dict[str, bytes] = {}
+
+    def __getstate__(self) -> dict[str, Any]:
+        # do not send in-process tier to worker processes
+        return {**self.__dict__, "_memory": {}}
+
+    def _remember(self, key: str, data: bytes) -> None:
+        memory = self._memory
+        memory.pop(key, None)
+        if len(memory) >= self.memory_entries:
+            del memory[next(iter(memory))]
+        memory[key] = data
+
+    @override
+    def get(self, key: str) -> bytes | None:
+        """Cached value for ``key`` (from memory, then disk), or ``None`` if missing."""
+        if (data := self._memory.get(key)) is None:
+            data = super().get(key)
+        if data is not None:
+            self._remember(key, data)
+        return data
+
+    @override
+    def set(self, key: str, data: bytes) -> None:
+        """Store ``data`` under ``key`` (in memory and on disk)."""
+        super().set(key, data)
+        self._remember(key, data)
+
+    @override
+    def delete(self, key: str) -> None:
+        """Remove entry ``key`` (in memory and on disk)."""
+        self._memory.pop(key, None)
+        super().delete(key)
+
+    @override
+    def clear(self) -> None:
+        """Remove all entries (in memory and on disk)."""
+        self._memory.clear()
+        super().clear()
@@ -6,29 +6,38 @@ Console script for pyproject2conda (:mod:`~pyproject2conda.cli`)
 
 from __future__ import annotations
 
-import locale
 import logging
 import os
+from contextlib import contextmanager
 from enum import Enum
-from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Annotated
 
 import typer
 from typer.core import TyperGroup
 
-from pyproject2conda import __version__
-from pyproject2conda.requirements import ParseDepends
+from pyproject2conda.project import CONTEXTS, get_context, get_header_cmd
 from pyproject2conda.utils import (
-    parse_pythons,
+    diff_file,
+    unique_list,
     update_target,
+    write_if_changed,
 )
 
 from ._typing_compat import override
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+    from typing import Any
+
     import click
 
+    from pyproject2conda.cache import DiskCache, TieredCache
+    from pyproject2conda.config import Config
+    from pyproject2conda.context import ProjectContext
+    from pyproject2conda.manifest import Manifest
+    from pyproject2conda.requirements import ParseDepends
+
 # * Logger -----------------------------------------------------------------------------
 
 FORMAT = "%(message)s [%(name)s - %(levelname)s]"
@@ -68,6 +77,8 @@ def _callback_columns(
 def _callback_version(value: bool) -> None:
     """Versioning call back."""
     if value:
+        from pyproject2conda import __version__
+
         typer.echo(f"pyproject2conda, version {__version__}")
         raise typer.Exit
 
@@ -95,12 +106,28 @@ class _AliasedGroup(TyperGroup):
     def list_commands(self, ctx: click.Context) -> list[str]:  # noqa: ARG002
         return list(self.commands)
 
+    @override
+    def invoke(self, ctx: click.Context) -> Any:
+        try:
+            return super().invoke(ctx)
+        except ValueError as e:
+            # Report unresolvable dependencies without a traceback
+            import click
+
+            from pyproject2conda.dependencies import DependencyConflictError
+            from pyproject2conda.graph import DependencyCycleError
+
+            if isinstance(e, (DependencyConflictError, DependencyCycleError)):
+                raise click.ClickException(str(e)) from e
+            raise
+
 
 app_typer: typer.Typer = typer.Typer(cls=_AliasedGroup, no_args_is_help=True)
 
 
 @app_typer.callback()
 def main(
+    ctx: typer.Context,
     version: Annotated[  # noqa: ARG001
         bool,
         typer.Option("--version", "-v", callback=_callback_version, is_eager=True),
@@ -115,6 +142,59 @@ def main(
             is_eager=True,
         ),
     ] = None,
+    cache: Annotated[
+        bool,
+        typer.Option(
+            "--cache/--no-cache",
+            envvar="P2C_CACHE",
+            help="""
+            Cache parsed ``pyproject.toml`` files (and resolved requirements) on
+            disk, keyed by file content.  Later calls against an unchanged file
+            skip parsing.  Outputs of ``project`` are also cached, keyed by the
+            inputs of each output, so that unchanged outputs are copied from
+            the cache instead of rendered.  Each cache is limited in size, and
+            least recently used entries are removed.  The cache directory can
+            be shared by parallel jobs.
+            """,
+        ),
+    ] = False,
+    cache_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--cache-dir",
+            envvar="P2C_CACHE_DIR",
+            help="Location of cache.  Defaults to user cache directory.",
+            show_default=False,
+        ),
+    ] = None,
+    timings: Annotated[
+        bool,
+        typer.Option(
+            "--timings/--no-timings",
+            envvar="P2C_TIMINGS",
+            help="""
+            Print wall time spent in each phase (loading, resolving, config,
+            rendering, writing) and counters (requirement parses, marker
+            evaluations, config lookups, outputs rendered/skipped, bytes
+            written) to stderr. With ``--jobs`` greater than one, work done in
+            worker processes is not recorded.
+            """,
+        ),
+    ] = False,
+    timings_output: Annotated[
+        Path | None,
+        typer.Option(
+            "--timings-output",
+            help="Write timings (see ``--timings``) as json to this file.",
+        ),
+    ] = None,
+    profile: Annotated[
+        Path | None,
+        typer.Option(
+            "--profile",
+            help="Write :mod:`cProfile` statistics to this file (view with, e.g., ``python -m pstats``).",
+        ),
+    ] = None,
 ) -> None:
     """
     Extract conda ``environment.yaml`` and pip ``requirement.txt`` files from ``pyproject.toml``
@@ -130,7 +210,10 @@ def main(
             $ p2c y ...
             $ python -m pyproject2conda yaml ...
     """
-    return
+    # Files are loaded once per invocation
+    CONTEXTS.clear()
+    _set_caches(cache, cache_dir)
+    _set_timings(ctx, timings, timings_output, profile)
 
 
 # * Options ----------------------------------------------------------------------------
@@ -146,6 +229,40 @@ PYPROJECT_CLI = Annotated[
         show_default="pyproject.toml",
     ),
 ]
+PYPROJECTS_CLI = Annotated[
+    list[Path] | None,
+    typer.Option(
+        "--pyproject-file",
+        "--file",
+        "-f",
+        help="""
+        input pyproject.toml file. Can specify multiple times to process
+        multiple projects.
+        """,
+        show_default="pyproject.toml",
+    ),
+]
+RECURSIVE_CLI = Annotated[
+    list[Path] | None,
+    typer.Option(
+        "--recursive",
+        help="""
+        Process each ``pyproject.toml`` file with a ``tool.pyproject2conda``
+        table under this directory.  Can specify multiple times.  Paths matching
+        ``.gitignore`` files (or ``--exclude``) are skipped.
+        """,
+    ),
+]
+EXCLUDE_CLI = Annotated[
+    list[str] | None,
+    typer.Option(
+        "--exclude",
+        help="""
+        Gitignore-style pattern (relative to ``--recursive`` directory) of
+        paths to skip.  Can specify multiple times.
+        """,
+    ),
+]
 EXTRAS_CLI = Annotated[
     list[str] | None,
     typer.Option(
@@ -292,7 +409,9 @@ PYTHON_VERSION_CLI = Annotated[
          against. That is, this version is used to limit packages in resulting
          output. For example, if have a line like ``a-package; python_version <
          '3.9'``, Using ``--python-version 3.10`` will not include ``a-package``,
-         while ``--python-version 3.8`` will include ``a-package``.
+         while ``--python-version 3.8`` will include ``a-package``. Packages
+         with markers that cannot be decided from the python version (e.g.,
+         ``sys_platform == 'win32'``) are included.
          """,
     ),
 ]
@@ -317,6 +436,22 @@ PYTHON_CLI = Annotated[
         """,
     ),
 ]
+PLATFORM_CLI = Annotated[
+    list[str] | None,
+    typer.Option(
+        "--platform",
+        help="""
+        Conda platform (subdir) to create output for (e.g., ``linux-64``,
+        ``osx-arm64``, ``win-64``).  Can be specified multiple times, in which
+        case one output is created per platform, and output file names must
+        contain ``{platform}``.  Packages are filtered using the platform's
+        environment markers (``sys_platform``, ``platform_machine``, etc).  In
+        project mode, use option ``platforms = [...]`` in pyproject.toml, and
+        ``{platform}`` in templates (``-{platform}`` is appended to templates
+        without it).
+        """,
+    ),
+]
 HEADER_CLI = Annotated[
     bool | None,
     typer.Option(
@@ -379,6 +514,7 @@ TEMPLATE_PYTHON_CLI = Annotated[
         * {py} -> "38"
         * {py_version} -> "3.8"
         * {env} -> "dev"
+        * {platform} -> "linux-64" (with ``--platform``)
         """,
     ),
 ]
@@ -400,6 +536,21 @@ YAML_EXT_CLI = Annotated[
         """,
     ),
 ]
+JOBS_CLI = Annotated[
+    int,
+    typer.Option(
+        "--jobs",
+        "-j",
+        envvar="P2C_JOBS",
+        min=0,
+        help="""
+        Number of worker processes used to render outputs. The default (``1``)
+        renders outputs serially in the current process. Pass ``0`` to use one
+        process per available cpu. Output and logging order does not depend on
+        the number of jobs.
+        """,
+    ),
+]
 DRY_CLI = Annotated[
     bool,
     typer.Option(
@@ -407,6 +558,19 @@ DRY_CLI = Annotated[
         help="If passed, do a dry run",
     ),
 ]
+CHECK_CLI = Annotated[
+    bool,
+    typer.Option(
+        "--check",
+        help="""
+        Check that outputs are up to date, without writing them.  Renders each
+        output (in parallel with ``--jobs``), compares it to the file, and prints
+        a unified diff for each file that differs.  Exits with a nonzero code if
+        any file is missing or out of date.  The command in a header is not
+        compared.
+        """,
+    ),
+]
 USER_CONFIG_CLI = Annotated[
     str | None,
     typer.Option(
@@ -419,6 +583,21 @@ USER_CONFIG_CLI = Annotated[
         """,
     ),
 ]
+MANIFEST_CLI = Annotated[
+    Path | None,
+    typer.Option(
+        "--manifest",
+        help="""
+        File recording fingerprints of the inputs used to create each output.
+        Can also be set with ``manifest = ...`` in ``tool.pyproject2conda``
+        (relative to ``pyproject.toml``). If set, ``--overwrite check``
+        recreates an output only if the ``pyproject.toml`` tables, user config,
+        ``.python-version`` files, or options it was created from changed (or
+        the output itself changed), instead of comparing file modification
+        times.
+        """,
+    ),
+]
 # For conda-requirements
 PREFIX_CLI = Annotated[
     str | None,
@@ -454,31 +633,104 @@ REMOVE_WHITESPACE_OPTION = typer.Option(
 
 
 # * Utils ------------------------------------------------------------------------------
-def _get_header_cmd(
-    custom_command: str | None,
-    header: bool | None,
-    output: str | Path | None,
-) -> str | None:
-    if custom_command is not None:
-        return custom_command
+_PARSE_CACHE: DiskCache | None = None
+_RENDER_CACHE: TieredCache | None = None
 
-    if (header is None or header) and ("PRE_COMMIT" in os.environ):
-        return "pre-commit"
 
-    if header is None:
-        header = output is not None
+def _set_caches(cache: bool, cache_dir: Path | None = None) -> None:
+    global _PARSE_CACHE, _RENDER_CACHE  # noqa: PLW0603  # pylint: disable=global-statement
 
-    if header:
-        import sys
+    if not cache:
+        _PARSE_CACHE = _RENDER_CACHE = None
+        return
 
-        return " ".join([Path(sys.argv[0]).name, *sys.argv[1:]])
+    from pyproject2conda.cache import DiskCache, TieredCache, user_cache_dir
 
-    return None
+    cache_dir = cache_dir or user_cache_dir()
+    _PARSE_CACHE = DiskCache(cache_dir / "parse")
+    # keep in-process tier for repeated invocations in one process
+    if _RENDER_CACHE is None or _RENDER_CACHE.path != cache_dir / "render":
+        _RENDER_CACHE = TieredCache(cache_dir / "render")
+
+
+def _set_timings(
+    ctx: click.Context,
+    timings: bool,
+    timings_output: Path | None = None,
+    profile: Path | None = None,
+) -> None:
+    """Start timings and/or profiling.  Results are reported when ``ctx`` closes."""
+    if not (timings or timings_output or profile):
+        return
+
+    from pyproject2conda.timings import TIMINGS
+
+    if timings or timings_output:
+        TIMINGS.start()
+
+    if profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    def _report() -> None:
+        if profile:
+            profiler.disable()
+            profiler.dump_stats(profile)
+
+        if not TIMINGS.enabled:
+            return
+
+        TIMINGS.stop()
+        if timings_output:
+            import json
+
+            timings_output.write_text(json.dumps(TIMINGS.to_dict(), indent=2))
+        if timings:
+            typer.echo(TIMINGS.report(), err=True)
+
+    ctx.call_on_close(_report)
 
 
-@lru_cache
 def _get_requirement_parser(filename: str | Path) -> ParseDepends:
-    return ParseDepends.from_path(filename)
+    return get_context(filename, cache=_PARSE_CACHE).parser
+
+
+def _iter_platforms(
+    platforms: Sequence[str] | None, *outputs: str | Path | None
+) -> Iterator[tuple[str | None, list[str | Path | None]]]:
+    """
+    Iterate over platforms (or ``None`` if no platforms), and ``outputs`` for each.
+
+    ``{platform}`` in ``outputs`` is replaced by the platform.
+    """  # noqa: DOC402
+    if not platforms:
+        yield None, list(outputs)
+        return
+
+    from pyproject2conda.markers import platform_environment
+
+    platforms = unique_list(platforms)
+    for platform in platforms:
+        _ = platform_environment(platform)  # validate
+
+    if len(platforms) > 1:
+        for output in outputs:
+            if output is not None and "{platform}" not in str(output):  # noqa: RUF027
+                msg = (
+                    f"Output {output} must contain {{platform}} with multiple platforms"
+                )
+                raise ValueError(msg)
+
+    for platform in platforms:
+        yield (
+            platform,
+            [
+                None if output is None else str(output).replace("{platform}", platform)
+                for output in outputs
+            ],
+        )
 
 
 def _log_skipping(
@@ -540,6 +792,7 @@ def yaml(
     python_include: PYTHON_INCLUDE_CLI = None,
     python_version: PYTHON_VERSION_CLI = None,
     python: PYTHON_CLI = None,
+    platform: PLATFORM_CLI = None,
     skip_package: SKIP_PACKAGE_CLI = False,
     pip_only: PIP_ONLY_CLI = False,
     sort: SORT_DEPENDENCIES_CLI = True,
@@ -553,44 +806,49 @@ def yaml(
     remove_whitespace: Annotated[bool, REMOVE_WHITESPACE_OPTION] = True,
 ) -> None:
     """Create yaml file from dependencies and optional-dependencies."""
-    if not update_target(output, pyproject_filename, overwrite=overwrite.value):
-        _log_skipping(logger, "yaml", output)
-        return
-
     if not channels:
         channels = None
 
-    python_include, python_version = parse_pythons(
+    python_include, python_version = get_context(
+        pyproject_filename, cache=_PARSE_CACHE
+    ).parse_pythons(
         python_include=python_include,
         python_version=python_version,
         python=python,
-        toml_path=pyproject_filename,
     )
 
-    d = _get_requirement_parser(pyproject_filename)
-
-    _log_creating(logger, "yaml", output)
-
-    s = d.to_conda_yaml(
-        extras=extras,
-        groups=groups,
-        extras_or_groups=extras_or_groups,
-        channels=channels,
-        name=name,
-        output=output,
-        python_include=python_include,
-        python_version=python_version,
-        skip_package=skip_package,
-        pip_only=pip_only,
-        header_cmd=_get_header_cmd(custom_command, header, output),
-        sort=sort,
-        conda_deps=deps,
-        pip_deps=reqs,
-        allow_empty=allow_empty,
-        remove_whitespace=remove_whitespace,
-    )
-    if not output:
-        print(s, end="")
+    for platform_, (output_,) in _iter_platforms(platform, output):
+        if not update_target(output_, pyproject_filename, overwrite=overwrite.value):
+            _log_skipping(logger, "yaml", output_)
+            continue
+
+        d = _get_requirement_parser(pyproject_filename)
+
+        _log_creating(logger, "yaml", output_)
+
+        s = d.to_conda_yaml(
+            extras=extras,
+            groups=groups,
+            extras_or_groups=extras_or_groups,
+            channels=channels,
+            name=name,
+            output=output_,
+            python_include=python_include,
+            python_version=python_version,
+            platform=platform_,
+            skip_package=skip_package,
+            pip_only=pip_only,
+            header_cmd=get_header_cmd(custom_command, header, output_),
+            sort=sort,
+            conda_deps=deps,
+            pip_deps=reqs,
+            allow_empty=allow_empty,
+            remove_whitespace=remove_whitespace,
+        )
+        if not output_:
+            if platform and len(platform) > 1:
+                print(f"# platform: {platform_}")
+            print(s, end="")
 
 
 # ** Requirements
@@ -627,7 +885,7 @@ def requirements(
         extras_or_groups=extras_or_groups,
         output=output,
         skip_package=skip_package,
-        header_cmd=_get_header_cmd(custom_command, header, output),
+        header_cmd=get_header_cmd(custom_command, header, output),
         sort=sort,
         pip_deps=reqs,
         allow_empty=allow_empty,
@@ -638,15 +896,326 @@ def requirements(
 
 
 # ** From project
+def _run_project_job(
+    pyproject_filename: Path, style: str, d: dict[str, Any], check: bool = False
+) -> tuple[str, int]:
+    """
+    Create single output for ``project``.
+
+    Returns anything written to stdout and the number of unchanged (not
+    rewritten) files.  With ``check``, nothing is written.  Instead, returns
+    the diff of the file with the rendered output, and the number of files
+    which differ.
+    """
+    from pyproject2conda.project import render_output
+    from pyproject2conda.requirements import EMPTY_ENVIRONMENT
+
+    text = render_output(
+        get_context(pyproject_filename, cache=_PARSE_CACHE),
+        style,
+        d,
+        cache=_RENDER_CACHE,
+    )
+    if d["output"] is None:
+        return text, 0
+    if text == EMPTY_ENVIRONMENT:
+        return "", 0
+    if check:
+        diff = diff_file(d["output"], text, name=d["diff_name"])
+        return ("", 0) if diff is None else (diff, 1)
+    return "", int(not write_if_changed(d["output"], text))
+
+
+class _RecordHandler(logging.Handler):
+    """Collect log records (in workers), to be handled by parent process."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    @override
+    def emit(self, record: logging.LogRecord) -> None:
+        # format message here, as arguments may not pickle
+        record.msg, record.args = record.getMessage(), None
+        self.records.append(record)
+
+
+_RECORD_HANDLER: _RecordHandler | None = None
+
+
+def _init_worker_logging(level: int) -> None:
+    """Collect log records of worker process at ``level``, to be handled by parent process."""
+    global _RECORD_HANDLER  # noqa: PLW0603  # pylint: disable=global-statement
+
+    _RECORD_HANDLER = _RecordHandler()
+    logger.handlers[:] = [_RECORD_HANDLER]
+    logger.propagate = False
+    logger.setLevel(level)
+
+
+def _pop_worker_records() -> list[logging.LogRecord]:
+    """Log records collected since last call (in worker)."""
+    assert _RECORD_HANDLER is not None  # noqa: S101
+    records, _RECORD_HANDLER.records = _RECORD_HANDLER.records, []
+    return records
+
+
+def _init_project_worker(
+    pyproject_filename: Path,
+    data: dict[str, Any],
+    level: int,
+    render_cache: TieredCache | None = None,
+) -> None:
+    """
+    Initialize worker process for ``project --jobs``.
+
+    The parsed ``pyproject.toml`` is sent once per worker (instead of once per
+    output).  Log records are handled by the parent process so that they
+    appear in a stable order.
+    """
+    global _RENDER_CACHE  # noqa: PLW0603  # pylint: disable=global-statement
+
+    from pyproject2conda.context import ProjectContext
+
+    _RENDER_CACHE = render_cache
+    _init_worker_logging(level)
+    path = Path(pyproject_filename).resolve()
+    CONTEXTS[path] = ProjectContext(path, data=data)
+
+
+def _run_project_worker(
+    pyproject_filename: Path, style: str, d: dict[str, Any], check: bool = False
+) -> tuple[str, int, list[logging.LogRecord]]:
+    out = _run_project_job(pyproject_filename, style, d, check=check)
+    return (*out, _pop_worker_records())
+
+
+def _iter_project_jobs(
+    pyproject_filename: Path,
+    styles: Sequence[str],
+    ds: Sequence[dict[str, Any]],
+    jobs: int,
+    check: bool = False,
+) -> Iterator[tuple[str, int]]:
+    """Run jobs for ``project``, possibly in parallel.  Results are yielded in order."""  # noqa: DOC402
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(ds))
+
+    if jobs <= 1:
+        for style, d in zip(styles, ds, strict=True):
+            if not check:
+                _log_creating(logger, style, d["output"])
+            yield _run_project_job(pyproject_filename, style, d, check=check)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_project_worker,
+        initargs=(
+            pyproject_filename,
+            _get_requirement_parser(pyproject_filename).data,
+            logger.getEffectiveLevel(),
+            _RENDER_CACHE,
+        ),
+    ) as executor:
+        for style, d, (text, n, records) in zip(
+            styles,
+            ds,
+            executor.map(
+                partial(_run_project_worker, pyproject_filename, check=check),
+                styles,
+                ds,
+                chunksize=max(1, len(ds) // (4 * jobs)),
+            ),
+            strict=True,
+        ):
+            if not check:
+                _log_creating(logger, style, d["output"])
+            for record in records:
+                logger.handle(record)
+            yield text, n
+
+
+def _set_check_options(d: dict[str, Any], root: Path | None) -> None:
+    """Update options ``d`` of ``project`` to check (instead of write) output."""
+    # The command line is not an input, so use the command of the existing
+    # header (if any).  Only whether there is a header is checked.
+    if d["header"] and (header_cmd := _read_header_cmd(d["output"])) is not None:
+        d["custom_command"] = header_cmd
+    d["diff_name"] = os.path.relpath(Path.cwd() / d["output"], root or ".")
+
+
+def _read_header_cmd(output: str | Path) -> str | None:
+    """Command in header of existing file ``output``, if any."""
+    from itertools import islice
+
+    try:
+        with Path(output).open(encoding="utf-8", errors="replace") as f:
+            for line in islice(f, 10):
+                if line.startswith("#     $ "):
+                    return line[8:].rstrip("\r\n")
+    except OSError:
+        pass
+    return None
+
+
+def _get_manifest(
+    c: Config, pyproject_filename: Path, manifest: Path | None
+) -> Manifest | None:
+    """Manifest from option ``--manifest``, or config ``manifest``."""
+    if manifest is None and (manifest_config := c.manifest()) is not None:
+        manifest = pyproject_filename.parent / manifest_config
+
+    if manifest is None:
+        return None
+
+    from pyproject2conda.manifest import Manifest
+
+    return Manifest.from_path(manifest)
+
+
+def _needs_update(
+    pyproject_filename: Path,
+    style: str,
+    d: dict[str, Any],
+    user_config: str | None,
+    output_manifest: Manifest | None,
+) -> tuple[bool, str | None]:
+    """Whether to (re)create output of ``project``, and fingerprint of its inputs (if using manifest)."""
+    if output_manifest is not None and d["output"] is not None:
+        from pyproject2conda.project import output_fingerprint
+
+        fingerprint_ = output_fingerprint(
+            _get_requirement_parser(pyproject_filename), style, d
+        )
+        update = (
+            not output_manifest.is_current(d["output"], fingerprint_)
+            if d["overwrite"] == "check"
+            else update_target(d["output"], overwrite=d["overwrite"])
+        )
+        return update, fingerprint_
+
+    # Special case: have output and userconfig.  Check update
+    update = update_target(
+        d["output"],
+        pyproject_filename,
+        *([user_config] if user_config else []),
+        overwrite=d["overwrite"],
+    )
+    return update, None
+
+
+def _project(  # noqa: C901, PLR0912
+    pyproject_filename: Path,
+    *,
+    user_config: str | None,
+    manifest: Path | None,
+    dry: bool,
+    jobs: int,
+    options: dict[str, Any],
+    check: bool = False,
+    root: Path | None = None,
+) -> int:
+    """
+    Create outputs of ``project`` for ``pyproject_filename``.
+
+    With ``check``, compare outputs to files instead, and return the number of
+    files which are out of date.  Paths in diffs are relative to ``root``
+    (default current directory).
+    """
+    from pyproject2conda.timings import TIMINGS
+
+    if check and dry:
+        msg = "cannot specify both --check and --dry"
+        raise ValueError(msg)
+
+    c = get_context(pyproject_filename, cache=_PARSE_CACHE).config(user_config)
+
+    if user_config == "infer" or user_config is None:
+        user_config = c.user_config()
+
+    output_manifest = (
+        None if dry or check else _get_manifest(c, pyproject_filename, manifest)
+    )
+
+    with TIMINGS.phase("config"):
+        env_options = list(c.iter_envs(**options))
+
+    styles: list[str] = []
+    ds: list[dict[str, Any]] = []
+    fingerprints: list[str | None] = []
+    for style, d in env_options:
+        if dry:
+            d["dry_output"] = d["output"]
+            d["output"] = None
+
+        # Resolve header in this process, so workers do not need `sys.argv`
+        header_cmd = get_header_cmd(d["custom_command"], d["header"], d["output"])
+        d.update(custom_command=header_cmd, header=header_cmd is not None)
+
+        if check:
+            _set_check_options(d, root)
+            update, fingerprint_ = True, None
+        else:
+            update, fingerprint_ = _needs_update(
+                pyproject_filename, style, d, user_config, output_manifest
+            )
+
+        if not update:
+            TIMINGS.count("outputs-skipped")
+            if options["verbose"]:
+                _log_skipping(logger, style, d["output"])
+            continue
+
+        d["overwrite"] = Overwrite("force")
+
+        styles.append(style)
+        ds.append(d)
+        fingerprints.append(fingerprint_)
+
+    dry_outputs = [d.pop("dry_output", None) for d in ds]
+    # unchanged outputs (or, with check, outputs which differ)
+    count = 0
+    for style, dry_output, (out, n) in zip(
+        styles,
+        dry_outputs,
+        _iter_project_jobs(pyproject_filename, styles, ds, jobs=jobs, check=check),
+        strict=True,
+    ):
+        if dry:
+            # small header
+            print("# " + "-" * 20)
+            print(f"# Creating {style} {dry_output}")
+        print(out, end="")
+        count += n
+
+    if check:
+        logger.info("Checked %s output(s), %s out of date", len(ds), count)
+        return count
+
+    if count:
+        logger.info("%s unchanged output(s) not rewritten", count)
+
+    if output_manifest is not None:
+        for d, fingerprint_ in zip(ds, fingerprints, strict=True):
+            if fingerprint_ is not None:
+                output_manifest.record(d["output"], fingerprint_)
+        output_manifest.save()
+    return 0
 
 
 # @app_typer.command("p", hidden=True)
 @app_typer.command()
 def project(
-    pyproject_filename: PYPROJECT_CLI,
+    pyproject_filenames: PYPROJECTS_CLI = None,
     envs: ENVS_CLI = None,
     template: TEMPLATE_CLI = None,
     template_python: TEMPLATE_PYTHON_CLI = None,
+    platform: PLATFORM_CLI = None,
     reqs: REQS_CLI = None,
     deps: DEPS_CLI = None,
     reqs_ext: REQS_EXT_CLI = ".txt",
@@ -661,6 +1230,11 @@ def project(
     user_config: USER_CONFIG_CLI = "infer",
     allow_empty: Annotated[bool | None, ALLOW_EMPTY_OPTION] = None,
     remove_whitespace: Annotated[bool | None, REMOVE_WHITESPACE_OPTION] = None,
+    jobs: JOBS_CLI = 1,
+    manifest: MANIFEST_CLI = None,
+    recursive: RECURSIVE_CLI = None,
+    exclude: EXCLUDE_CLI = None,
+    check: CHECK_CLI = False,
 ) -> None:
     """
     Create multiple environment files from ``pyproject.toml`` specification.
@@ -670,56 +1244,377 @@ def project(
     config file option will be plural. For example, the command line option
     ``--group`` becomes the config file option ``groups = ...``.  Boolean options
     like ``--sort/--no-sort`` become ``sort = true/false`` in the config file.
+
+    With multiple ``--file`` options, or ``--recursive``, each project is
+    processed as if ``project`` were run from the directory of its
+    ``pyproject.toml`` file (so that relative paths, including outputs,
+    ``--user-config``, ``--manifest``, and ``.python-version`` files, are
+    relative to that directory).  Projects are processed in a single process
+    (or ``--jobs`` worker processes, one project per job).  Errors are
+    reported for each project, and do not stop other projects from being
+    processed.
     """
-    from pyproject2conda.config import Config
+    kwargs: dict[str, Any] = {
+        "user_config": user_config,
+        "manifest": manifest,
+        "dry": dry,
+        "check": check,
+        "root": Path.cwd(),
+        "options": {
+            "envs": envs,
+            "reqs_ext": reqs_ext,
+            "yaml_ext": yaml_ext,
+            "template": template,
+            "template_python": template_python,
+            "platforms": platform or None,
+            "reqs": reqs,
+            "deps": deps,
+            "sort": sort,
+            "header": header,
+            "custom_command": custom_command,
+            "overwrite": overwrite.value,
+            "verbose": verbose,
+            "allow_empty": allow_empty,
+            "remove_whitespace": remove_whitespace,
+            "pip_only": pip_only or None,
+        },
+    }
 
-    c = Config.from_file(pyproject_filename, user_config=user_config)
+    if recursive or (pyproject_filenames and len(pyproject_filenames) > 1):
+        _run_projects(
+            _find_projects(pyproject_filenames, recursive, exclude),
+            jobs=jobs,
+            kwargs=kwargs,
+        )
+    elif count := _project(
+        pyproject_filenames[0] if pyproject_filenames else Path("pyproject.toml"),
+        jobs=jobs,
+        **kwargs,
+    ):
+        logger.error("%s output(s) out of date", count)
+        raise typer.Exit(1)
+
+
+# ** Many projects
+@contextmanager
+def _working_directory(path: Path) -> Iterator[None]:
+    old_cwd = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(old_cwd)
+
+
+def _find_projects(
+    pyproject_filenames: Sequence[Path] | None,
+    recursive: Sequence[Path] | None,
+    exclude: Sequence[str] | None,
+) -> list[Path]:
+    """Resolved paths of projects to process, without duplicates."""
+    from pyproject2conda.discover import find_projects
+
+    paths = [
+        *(pyproject_filenames or []),
+        *(
+            path
+            for root in recursive or []
+            for path in find_projects(root, exclude or ())
+        ),
+    ]
+    return unique_list(path.resolve() for path in paths)
 
-    if user_config == "infer" or user_config is None:
-        user_config = c.user_config()
 
-    for style, d in c.iter_envs(
-        envs=envs,
-        reqs_ext=reqs_ext,
-        yaml_ext=yaml_ext,
-        template=template,
-        template_python=template_python,
-        reqs=reqs,
-        deps=deps,
-        sort=sort,
-        header=header,
-        custom_command=custom_command,
-        overwrite=overwrite.value,
-        verbose=verbose,
-        allow_empty=allow_empty,
-        remove_whitespace=remove_whitespace,
-        pip_only=pip_only or None,
-    ):
-        if dry:
-            # small header
-            print("# " + "-" * 20)
-            print("# Creating {style} {output}".format(style=style, output=d["output"]))
-            d["output"] = None
+def _run_projects_job(
+    pyproject_filename: Path, kwargs: dict[str, Any]
+) -> tuple[int, str | None]:
+    """
+    Process single project of many, from its directory.
 
-        # Special case: have output and userconfig.  Check update
-        if not update_target(
-            d["output"],
-            pyproject_filename,
-            *([user_config] if user_config else []),
-            overwrite=d["overwrite"],
+    Returns the number of outputs out of date (with ``--check``) and error
+    message (or ``None`` on success).  Any error (e.g., from a malformed
+    configuration) is reported, so that other projects are still processed.
+    Loaded files are released once the project is done.
+    """
+    from ._compat import tomllib
+
+    logger.info("Processing %s", pyproject_filename)
+    try:
+        with _working_directory(pyproject_filename.parent):
+            return _project(pyproject_filename, jobs=1, **kwargs), None
+    except (OSError, ValueError, tomllib.TOMLDecodeError) as e:
+        return 0, str(e)
+    except Exception as e:  # noqa: BLE001
+        return 0, f"{type(e).__name__}: {e}"
+    finally:
+        CONTEXTS.pop(pyproject_filename, None)
+
+
+def _init_projects_worker(
+    level: int,
+    parse_cache: DiskCache | None = None,
+    render_cache: TieredCache | None = None,
+) -> None:
+    """Initialize worker process for ``project --recursive --jobs``."""
+    global _PARSE_CACHE, _RENDER_CACHE  # pylint: disable=global-statement
+
+    _PARSE_CACHE, _RENDER_CACHE = parse_cache, render_cache
+    _init_worker_logging(level)
+
+
+def _run_projects_worker(
+    pyproject_filename: Path, kwargs: dict[str, Any]
+) -> tuple[int, str | None, str, list[logging.LogRecord]]:
+    from contextlib import redirect_stdout
+    from io import StringIO
+
+    with redirect_stdout(StringIO()) as f:
+        count, error = _run_projects_job(pyproject_filename, kwargs)
+    return count, error, f.getvalue(), _pop_worker_records()
+
+
+def _iter_projects_jobs(
+    pyproject_filenames: Sequence[Path], jobs: int, kwargs: dict[str, Any]
+) -> Iterator[tuple[int, str | None]]:
+    """Run :func:`_run_projects_job` for each project, possibly in parallel.  Results are yielded in order."""  # noqa: DOC402
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(pyproject_filenames))
+
+    if jobs <= 1:
+        for path in pyproject_filenames:
+            yield _run_projects_job(path, kwargs)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_projects_worker,
+        initargs=(logger.getEffectiveLevel(), _PARSE_CACHE, _RENDER_CACHE),
+    ) as executor:
+        for count, error, out, records in executor.map(
+            partial(_run_projects_worker, kwargs=kwargs), pyproject_filenames
         ):
-            if verbose:
-                _log_skipping(logger, style, d["output"])
-        else:
+            for record in records:
+                logger.handle(record)
+            print(out, end="")
+            yield count, error
+
+
+def _run_projects(
+    pyproject_filenames: Sequence[Path], jobs: int, kwargs: dict[str, Any]
+) -> None:
+    """
+    Run ``project`` for each of ``pyproject_filenames``.
+
+    Errors (and, with ``--check``, outputs out of date) are collected, and
+    reported after all projects are processed.  Output and logging order does
+    not depend on the number of jobs.
+    """
+    errors: dict[Path, str] = {}
+    count = 0
+    for path, (n, error) in zip(
+        pyproject_filenames,
+        _iter_projects_jobs(pyproject_filenames, jobs, kwargs),
+        strict=True,
+    ):
+        count += n
+        if error is not None:
+            logger.error("%s: %s", path, error)
+            errors[path] = error
+
+    if count:
+        logger.error("%s output(s) out of date", count)
+    if errors:
+        logger.error(
+            "%s of %s project(s) failed: %s",
+            len(errors),
+            len(pyproject_filenames),
+            ", ".join(map(str, errors)),
+        )
+    if count or errors:
+        raise typer.Exit(1)
+
+
+# ** Watch
+class _ProjectWatcher:
+    """
+    Warm state for ``watch``.
+
+    Holds the parsed ``pyproject.toml`` and user config, and the fingerprint
+    of each output (see :func:`~pyproject2conda.project.output_fingerprint`), so that only outputs whose
+    inputs changed are regenerated.
+    """
+
+    def __init__(
+        self,
+        pyproject_filename: Path,
+        user_config: str | None,
+        options: dict[str, Any],
+    ) -> None:
+        self.pyproject_filename = Path(pyproject_filename).resolve()
+        self.user_config_option = user_config
+        self.options = options
+
+        self.fingerprints: dict[str | Path, str] = {}
+        self.context: ProjectContext | None = None
+        self.user_config: Path | None = None
+        self.reload(set(self.paths()))
+
+    def paths(self) -> list[Path]:
+        """Files to watch."""
+        from pyproject2conda.context import PYTHON_VERSION_FILES
+
+        return [
+            self.pyproject_filename,
+            *([self.user_config] if self.user_config else []),
+            *(Path(p).resolve() for p in PYTHON_VERSION_FILES),
+        ]
+
+    def reload(self, changed: set[Path]) -> None:
+        """Re-parse files in ``changed`` and rebuild config."""
+        from pyproject2conda.context import ProjectContext
+
+        context = (
+            ProjectContext(self.pyproject_filename)
+            if self.context is None
+            else self.context.reload(changed)
+        )
+        self.context = CONTEXTS[self.pyproject_filename] = context
+
+        user_config = (
+            "infer" if self.user_config_option is None else self.user_config_option
+        )
+        path = context.user_config_path(user_config)
+        self.user_config = path.resolve() if path else None
+        self.config: Config = context.config(user_config)
+
+    def update(self) -> list[tuple[str, str | Path]]:
+        """Regenerate outputs with changed inputs.  Returns ``(style, output)`` of regenerated outputs."""
+        from pyproject2conda.project import output_fingerprint
+
+        parser = _get_requirement_parser(self.pyproject_filename)
+
+        out: list[tuple[str, str | Path]] = []
+        fingerprints: dict[str | Path, str] = {}
+        for style, d in self.config.iter_envs(**self.options):
+            header_cmd = get_header_cmd(d["custom_command"], d["header"], d["output"])
+            d.update(custom_command=header_cmd, header=header_cmd is not None)
+
+            fingerprints[d["output"]] = fingerprint_ = output_fingerprint(
+                parser, style, d
+            )
+            if (
+                self.fingerprints.get(d["output"]) == fingerprint_
+                and Path(d["output"]).exists()
+            ):
+                continue
+
             d["overwrite"] = Overwrite("force")
-            if style == "yaml":
-                yaml(pyproject_filename=pyproject_filename, **d)
+            _log_creating(logger, style, d["output"])
+            _run_project_job(self.pyproject_filename, style, d)
+            out.append((style, d["output"]))
+
+        self.fingerprints = fingerprints
+        return out
 
-            elif style == "requirements":
-                requirements(pyproject_filename=pyproject_filename, **d)
-            else:  # pragma: no cover
-                msg = f"unknown style {style}"
-                raise ValueError(msg)
+
+@app_typer.command()
+def watch(
+    pyproject_filename: PYPROJECT_CLI,
+    envs: ENVS_CLI = None,
+    template: TEMPLATE_CLI = None,
+    template_python: TEMPLATE_PYTHON_CLI = None,
+    reqs: REQS_CLI = None,
+    deps: DEPS_CLI = None,
+    reqs_ext: REQS_EXT_CLI = ".txt",
+    yaml_ext: YAML_EXT_CLI = ".yaml",
+    sort: SORT_DEPENDENCIES_CLI = True,
+    header: HEADER_CLI = None,
+    custom_command: CUSTOM_COMMAND_CLI = None,
+    verbose: VERBOSE_CLI = None,
+    pip_only: PIP_ONLY_CLI = False,
+    user_config: USER_CONFIG_CLI = "infer",
+    allow_empty: Annotated[bool | None, ALLOW_EMPTY_OPTION] = None,
+    remove_whitespace: Annotated[bool | None, REMOVE_WHITESPACE_OPTION] = None,
+    interval: Annotated[
+        float,
+        typer.Option(
+            "--interval",
+            min=0.0,
+            help="Seconds between polls of watched files (or debounce time for file notifications).",
+        ),
+    ] = 0.1,
+    poll: Annotated[
+        bool,
+        typer.Option(
+            "--poll",
+            help="Always poll watched files, even if ``watchfiles`` is installed.",
+        ),
+    ] = False,
+) -> None:
+    """
+    Watch ``pyproject.toml`` and regenerate outputs of ``project`` on change.
+
+    Watches ``pyproject.toml``, the user config, and ``.python-version``
+    files.  Parsed files are kept in memory, and only outputs whose inputs
+    changed are regenerated.  Uses native file notifications if
+    ``watchfiles`` is installed (``pip install 'pyproject2conda[watch]'``),
+    otherwise polls the files.  Stop with ``Ctrl-C``.
+    """
+    from pyproject2conda.watch import iter_changes
+
+    from ._compat import tomllib
+
+    watcher = _ProjectWatcher(
+        pyproject_filename,
+        user_config=user_config,
+        options={
+            "envs": envs,
+            "reqs_ext": reqs_ext,
+            "yaml_ext": yaml_ext,
+            "template": template,
+            "template_python": template_python,
+            "reqs": reqs,
+            "deps": deps,
+            "sort": sort,
+            "header": header,
+            "custom_command": custom_command,
+            "overwrite": Overwrite.force.value,
+            "verbose": verbose,
+            "allow_empty": allow_empty,
+            "remove_whitespace": remove_whitespace,
+            "pip_only": pip_only or None,
+        },
+    )
+    watcher.update()
+
+    try:
+        paths: list[Path] = []
+        while (new_paths := watcher.paths()) != paths:
+            paths = new_paths
+            logger.info("Watching %s", ", ".join(map(str, paths)))
+            # Without --poll, use native notifications if available
+            for changed in iter_changes(paths, interval=interval, poll=poll or None):
+                logger.info("Changed %s", ", ".join(map(str, sorted(changed))))
+                try:
+                    watcher.reload(changed)
+                    watcher.update()
+                except (OSError, ValueError, tomllib.TOMLDecodeError) as e:
+                    # keep watching (file may be in the middle of an edit)
+                    logger.error("%s", e)  # noqa: TRY400
+                if watcher.paths() != paths:
+                    # e.g., user config moved, so restart with new paths
+                    break
+    except ImportError as e:
+        import click
+
+        msg = f"{e}  Or pass `--poll` to poll the files."
+        raise click.ClickException(msg) from e
+    except KeyboardInterrupt:  # pragma: no cover
+        pass
 
 
 # ** Conda requirements
@@ -737,6 +1632,7 @@ def conda_requirements(
     python_include: PYTHON_INCLUDE_CLI = None,
     python_version: PYTHON_VERSION_CLI = None,
     python: PYTHON_CLI = None,
+    platform: PLATFORM_CLI = None,
     channels: CHANNEL_CLI = None,
     skip_package: SKIP_PACKAGE_CLI = False,
     prefix: PREFIX_CLI = None,
@@ -757,11 +1653,12 @@ def conda_requirements(
     conda install --file {path_conda}
     pip install -r {path_pip}
     """
-    python_include, python_version = parse_pythons(
+    python_include, python_version = get_context(
+        pyproject_filename, cache=_PARSE_CACHE
+    ).parse_pythons(
         python_include=python_include,
         python_version=python_version,
         python=python,
-        toml_path=pyproject_filename,
     )
 
     if path_conda and not path_pip:
@@ -778,26 +1675,32 @@ def conda_requirements(
 
     d = _get_requirement_parser(pyproject_filename)
 
-    deps_str, reqs_str = d.to_conda_requirements(
-        extras=extras,
-        groups=groups,
-        extras_or_groups=extras_or_groups,
-        python_include=python_include,
-        python_version=python_version,
-        channels=channels,
-        prepend_channel=prepend_channel,
-        output_conda=path_conda,
-        output_pip=path_pip,
-        skip_package=skip_package,
-        header_cmd=_get_header_cmd(custom_command, header, path_conda),
-        sort=sort,
-        conda_deps=deps,
-        pip_deps=reqs,
-    )
-
-    if not path_conda:
-        s = f"#conda requirements\n{deps_str}\n#pip requirements\n{reqs_str}"
-        print(s, end="")
+    for platform_, (path_conda_, path_pip_) in _iter_platforms(
+        platform, path_conda, path_pip
+    ):
+        deps_str, reqs_str = d.to_conda_requirements(
+            extras=extras,
+            groups=groups,
+            extras_or_groups=extras_or_groups,
+            python_include=python_include,
+            python_version=python_version,
+            platform=platform_,
+            channels=channels,
+            prepend_channel=prepend_channel,
+            output_conda=path_conda_,
+            output_pip=path_pip_,
+            skip_package=skip_package,
+            header_cmd=get_header_cmd(custom_command, header, path_conda_),
+            sort=sort,
+            conda_deps=deps,
+            pip_deps=reqs,
+        )
+
+        if not path_conda_:
+            s = f"#conda requirements\n{deps_str}\n#pip requirements\n{reqs_str}"
+            if platform and len(platform) > 1:
+                s = f"# platform: {platform_}\n{s}"
+            print(s, end="")
 
 
 # ** json
@@ -811,6 +1714,7 @@ def to_json(
     python_include: PYTHON_INCLUDE_CLI = None,
     python_version: PYTHON_VERSION_CLI = None,
     python: PYTHON_CLI = None,
+    platform: PLATFORM_CLI = None,
     channels: CHANNEL_CLI = None,
     sort: SORT_DEPENDENCIES_CLI = True,
     output: OUTPUT_CLI = None,
@@ -827,47 +1731,55 @@ def to_json(
     "dependencies": conda dependencies.
     "pip": pip dependencies.
     "channels": conda channels.
-    """
-    if not update_target(output, pyproject_filename, overwrite=overwrite.value):
-        _log_skipping(logger, "yaml", output)
-        return
+    "platform": conda platform (if passed).
 
+    With multiple platforms and no output file, one line is printed per platform.
+    """
     import json
 
     d = _get_requirement_parser(pyproject_filename)
 
-    python_include, python_version = parse_pythons(
+    python_include, python_version = get_context(
+        pyproject_filename, cache=_PARSE_CACHE
+    ).parse_pythons(
         python_include=python_include,
         python_version=python_version,
         python=python,
-        toml_path=pyproject_filename,
     )
 
-    conda_deps, pip_deps = d.conda_and_pip_requirements(
-        extras=extras,
-        groups=groups,
-        extras_or_groups=extras_or_groups,
-        python_include=python_include,
-        python_version=python_version,
-        skip_package=skip_package,
-        sort=sort,
-        conda_deps=deps,
-        pip_deps=reqs,
-    )
-
-    result = {
-        "dependencies": conda_deps,
-        "pip": pip_deps,
-    }
-
-    if channels := channels or d.channels:
-        result["channels"] = channels
-
-    if output:
-        with Path(output).open("w", encoding=locale.getpreferredencoding(False)) as f:
-            json.dump(result, f)
-    else:
-        print(json.dumps(result))  # , indent=2))
+    for platform_, (output_,) in _iter_platforms(platform, output):
+        if not update_target(output_, pyproject_filename, overwrite=overwrite.value):
+            _log_skipping(logger, "yaml", output_)
+            continue
+
+        conda_deps, pip_deps = d.conda_and_pip_requirements(
+            extras=extras,
+            groups=groups,
+            extras_or_groups=extras_or_groups,
+            python_include=python_include,
+            python_version=python_version,
+            platform=platform_,
+            skip_package=skip_package,
+            sort=sort,
+            conda_deps=deps,
+            pip_deps=reqs,
+        )
+
+        result: dict[str, Any] = {
+            "dependencies": conda_deps,
+            "pip": pip_deps,
+        }
+
+        if channels_ := channels or d.channels:
+            result["channels"] = channels_
+
+        if platform_:
+            result["platform"] = platform_
+
+        if output_:
+            _ = write_if_changed(output_, json.dumps(result))
+        else:
+            print(json.dumps(result))  # , indent=2))
 
 
 # * Click app
@@ -6,8 +6,7 @@ Read/use config/pyproject.toml file (:mod:`~pyproject2conda.config`)
 from __future__ import annotations
 
 from functools import cached_property
-from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, cast
 
 from pyproject2conda.utils import (
     conda_env_name_from_template,
@@ -18,8 +17,11 @@ from pyproject2conda.utils import (
     select_pythons,
 )
 
+from .timings import TIMINGS
+
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Sequence
+    from collections.abc import Iterator, Mapping, MutableMapping, Sequence
+    from pathlib import Path
     from typing import Any
 
     from ._typing_compat import Self
@@ -36,7 +38,13 @@ def _raise_if_underscore(key: str) -> None:
 
 # * Utilities
 class Config:  # noqa: PLR0904
-    """Class to parse toml file with [tool.pyproject2conda] section"""
+    """
+    Class to parse toml file with [tool.pyproject2conda] section
+
+    Options of each env, merged with overrides and top level options, are
+    collected in a table on first use, so ``data`` should not be modified
+    afterwards.
+    """
 
     def __init__(
         self,
@@ -49,6 +57,7 @@ class Config:  # noqa: PLR0904
             [] if default_pythons is None else default_pythons
         )
         self.all_pythons: list[str] = [] if all_pythons is None else all_pythons
+        self._tables: dict[tuple[str | None, bool], Mapping[str, Any]] = {}
 
     def get_in(self, *keys: str, default: Any = None) -> Any:
         """Utility to extract from nested dict."""
@@ -66,18 +75,54 @@ class Config:  # noqa: PLR0904
         return out
 
     @property
-    def envs(self) -> dict[str, Any]:
+    def envs(self) -> Mapping[str, Any]:
         """All environments"""
         return self.get_in("envs", default={})  # type: ignore[no-any-return]
 
-    def _get_override(self, env: str) -> dict[str, Any]:
-        out: dict[str, Any] = {}
+    @cached_property
+    def _override_table(self) -> dict[str, dict[str, Any]]:
+        """Merged options of overrides, by env.  Later overrides take precedence."""
+        out: dict[str, dict[str, Any]] = {}
         for override in self.overrides:
-            if env in override["envs"]:
-                out.update(**override)
-        out.pop("envs", None)
+            options = {k: v for k, v in override.items() if k != "envs"}
+            envs = override["envs"]
+            for env in [envs] if isinstance(envs, str) else envs:
+                out.setdefault(env, {}).update(options)
         return out
 
+    def _get_override(self, env: str) -> dict[str, Any]:
+        return self._override_table.get(env, {})
+
+    def _table(self, env_name: str | None, inherit: bool) -> Mapping[str, Any]:
+        """
+        Options for ``env_name``.
+
+        If ``inherit``, options of the env are merged with overrides (which take
+        precedence) and top level options.  Tables are created on first use.
+        """
+        if (table := self._tables.get((env_name, inherit))) is not None:
+            return table
+
+        TIMINGS.count("config-tables")
+        if env_name is None:
+            table = self.data
+        elif env_name not in self.envs:
+            msg = f"env {env_name} not in config"
+            raise ValueError(msg)
+        elif inherit:
+            table = {
+                **{
+                    k: v for k, v in self.data.items() if k not in {"envs", "overrides"}
+                },
+                **self.envs[env_name],
+                **self._get_override(env_name),
+            }
+        else:
+            table = self.envs[env_name]
+
+        self._tables[env_name, inherit] = table
+        return table
+
     def _get_value(
         self,
         key: str,
@@ -87,35 +132,15 @@ class Config:  # noqa: PLR0904
         default: Any = None,
     ) -> Any:
         """Get a value from thing"""
-        value: Any
-        if env_name is None:
-            value = self.get_in(key, default=None)
-
-        else:
-            # try to get from env definition
-            if env_name not in self.data["envs"]:
-                msg = f"env {env_name} not in config"
-                raise ValueError(msg)
-
-            value = self.get_in("envs", env_name, key, default=None)
-
-            if inherit:
-                # If have override, use it.
-                if (value_ := self._get_override(env_name).get(key)) is not None:
-                    value = value_
-
-                # finally, try to get from top level
-                if value is None:
-                    value = self.get_in(key, default=None)
+        TIMINGS.count("config-lookups")
+        table = self._table(env_name, inherit)
+        value: Any = table.get(key)
 
         # For case that key contains a dash, also consider the case where
         # dashes are underscores
         if value is None and "-" in key:
-            value = self._get_value(
-                key=key.replace("-", "_"),
-                env_name=env_name,
-                inherit=inherit,
-            )
+            key = key.replace("-", "_")
+            value = table.get(key)
 
         # raise error for underscores
         if value is not None:
@@ -150,6 +175,16 @@ class Config:  # noqa: PLR0904
         )
         return select_pythons(out, self.default_pythons, self.all_pythons)
 
+    def platforms(self, env_name: str | None = None, inherit: bool = True) -> list[str]:
+        """Conda platforms (subdirs) getter"""
+        return self._get_value(  # type: ignore[no-any-return]
+            key="platforms",
+            env_name=env_name,
+            inherit=inherit,
+            as_list=True,
+            default=list,
+        )
+
     def pip_only(
         self, env_name: str | None = None, inherit: bool = True, default: bool = False
     ) -> bool:
@@ -313,6 +348,10 @@ class Config:  # noqa: PLR0904
         """Flag user_config"""
         return self._get_value(key="user-config", default=None)  # type: ignore[no-any-return]
 
+    def manifest(self, env_name: str | None = None) -> str | None:  # noqa: ARG002
+        """Flag manifest"""
+        return self._get_value(key="manifest", default=None)  # type: ignore[no-any-return]
+
     def allow_empty(self, env_name: str | None = None, default: bool = False) -> bool:
         """Allow empty option."""
         return self._get_value(  # type: ignore[no-any-return]
@@ -330,34 +369,35 @@ class Config:  # noqa: PLR0904
         )
 
     def assign_user_config(self, user: Self) -> Self:
-        """Assign user_config to self."""
-        from copy import deepcopy
-
-        data = deepcopy(self.data)
-
-        # get user envs
-
-        if "envs" not in data:
-            data["envs"] = {}
-
-        if "overrides" not in data:
-            data["overrides"] = []
-
-        for key in ("envs", "overrides"):
-            if (u := user.get_in(key)) is not None:
-                d = data[key]
-                if isinstance(d, list):
-                    if not isinstance(u, list):
-                        msg = f"expected list, got {type(u)}"
-                        raise TypeError(msg)
-                    d.extend(u)  # pyright: ignore[reportUnknownMemberType]
-                elif isinstance(d, dict):  # pragma: no cover
-                    if not isinstance(u, dict):
-                        msg = f"expected dict, got {type(u)}"
-                        raise TypeError(msg)
-                    d.update(**u)  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
+        """
+        Assign user_config to self.
 
-        return type(self)(data)
+        Envs of ``user`` replace envs of the same name, and overrides of
+        ``user`` are applied after those of ``self``.  Tables are shared with
+        ``self`` and ``user`` (not copied), so neither should be modified.
+        """
+        from collections import ChainMap
+
+        envs: MutableMapping[str, Any] = self.get_in("envs", default={})
+        overrides: list[Any] = self.get_in("overrides", default=[])
+
+        if (u := user.get_in("envs")) is not None:
+            if not isinstance(u, dict):  # pragma: no cover
+                msg = f"expected dict, got {type(u)}"
+                raise TypeError(msg)
+            envs = ChainMap(u, envs)  # pyright: ignore[reportUnknownArgumentType]
+
+        if (u := user.get_in("overrides")) is not None:
+            if not isinstance(u, list):
+                msg = f"expected list, got {type(u)}"
+                raise TypeError(msg)
+            overrides = [*overrides, *u]  # pyright: ignore[reportUnknownVariableType]
+
+        return type(self)(
+            {**self.data, "envs": envs, "overrides": overrides},
+            default_pythons=self.default_pythons,
+            all_pythons=self.all_pythons,
+        )
 
     def _get_output_and_templates(
         self, env_name: str, **defaults: Any
@@ -397,44 +437,73 @@ class Config:  # noqa: PLR0904
         data: dict[str, Any] = {
             k: defaults.get(k, getattr(self, k)(env_name)) for k in keys
         }
-
-        if not pythons:
-            if output is None:
-                output = filename_from_template(
-                    template=template,
-                    env_name=env_name,
-                    ext=defaults.get("yaml_ext", self.yaml_ext(env_name)),
-                )
-            data.update(output=output)
-
-            if python_include := self.python_include(env_name):
-                data.update(python_include=python_include)
-
-            if python_version := self.python_version(env_name):
-                data.update(python_version=python_version)
-
-            data.update(
-                name=conda_env_name_from_template(
-                    name=data["name"], python_version=python_version, env_name=env_name
-                )
+        ext = defaults.get("yaml_ext", self.yaml_ext(env_name))
+
+        platforms: list[str] = defaults.get("platforms", self.platforms(env_name))
+        if platforms:
+            # one output per platform
+            template, template_python = (
+                t if t is None or "{platform}" in t else t + "-{platform}"
+                for t in (template, template_python)
             )
+            if output is not None and len(platforms) > 1 and "{platform}" not in output:
+                msg = f"output {output} of env {env_name} must contain {{platform}} for multiple platforms"
+                raise ValueError(msg)
 
-            yield ("yaml", data)
-
-        else:
-            for python in pythons:
-                output = filename_from_template(
-                    template=template_python,
-                    python_version=python,
-                    env_name=env_name,
-                    ext=defaults.get("yaml_ext", self.yaml_ext(env_name)),
-                )
-
-                name = conda_env_name_from_template(
-                    name=data["name"], python_version=python, env_name=env_name
+        platforms_: list[str | None] = [*platforms] or [None]
+        for platform in platforms_:
+            if platform is not None:
+                data["platform"] = [platform]
+
+            if not pythons:
+                if output is None:
+                    output_ = filename_from_template(
+                        template=template, env_name=env_name, ext=ext, platform=platform
+                    )
+                else:
+                    output_ = (
+                        output.replace("{platform}", platform) if platform else output
+                    )
+
+                options: dict[str, Any] = {"output": output_}
+                if python_include := self.python_include(env_name):
+                    options.update(python_include=python_include)
+
+                if python_version := self.python_version(env_name):
+                    options.update(python_version=python_version)
+
+                options.update(
+                    name=conda_env_name_from_template(
+                        name=data["name"],
+                        python_version=python_version,
+                        env_name=env_name,
+                        platform=platform,
+                    )
                 )
 
-                yield ("yaml", dict(data, python=python, output=output, name=name))
+                yield ("yaml", dict(data, **options))
+
+            else:
+                for python in pythons:
+                    output_ = filename_from_template(
+                        template=template_python,
+                        python_version=python,
+                        env_name=env_name,
+                        ext=ext,
+                        platform=platform,
+                    )
+
+                    name = conda_env_name_from_template(
+                        name=data["name"],
+                        python_version=python,
+                        env_name=env_name,
+                        platform=platform,
+                    )
+
+                    yield (
+                        "yaml",
+                        dict(data, python=python, output=output_, name=name),
+                    )
 
     def _iter_reqs(
         self, env_name: str, remove_whitespace: bool | None = None, **defaults: Any
@@ -496,27 +565,42 @@ class Config:  # noqa: PLR0904
 
     @classmethod
     def from_toml_dict(
-        cls, data_toml: dict[str, Any], user_config: dict[str, Any] | None = None
+        cls,
+        data_toml: dict[str, Any],
+        user_config: dict[str, Any] | None = None,
+        *,
+        default_pythons: list[str] | None = None,
+        all_pythons: list[str] | None = None,
     ) -> Self:
-        """Create from toml dictionaries."""
+        """
+        Create from toml dictionaries.
+
+        ``data_toml`` is not modified.  If not passed, ``default_pythons`` are
+        read from ``.python-version-default`` or ``.python-version``, and
+        ``all_pythons`` from ``data_toml``.
+        """
         data = get_in(["tool", "pyproject2conda"], data_toml, default={})
 
         for key in ("default-envs", "default_envs"):
             if key in data:
                 _raise_if_underscore(key)
 
-                default_envs = data[key]
-
-                if "envs" not in data:
-                    data["envs"] = {}
-
-                for env in default_envs:
-                    data["envs"][env] = {"extras-or-groups": True}
+                data = {
+                    **data,
+                    "envs": {
+                        **data.get("envs", {}),
+                        **{env: {"extras-or-groups": True} for env in data[key]},
+                    },
+                }
 
         c = cls(
             data,
-            default_pythons=get_default_pythons_with_fallback(),
-            all_pythons=get_all_pythons(data_toml),
+            default_pythons=get_default_pythons_with_fallback()
+            if default_pythons is None
+            else default_pythons,
+            all_pythons=get_all_pythons(data_toml)
+            if all_pythons is None
+            else all_pythons,
         )
 
         # add in "default_envs"
@@ -544,19 +628,6 @@ class Config:  # noqa: PLR0904
         cls, path: str | Path, user_config: str | Path | None = "infer"
     ) -> Self:
         """Create from toml file(s)."""
-        from ._compat import tomllib
-
-        with Path(path).open("rb") as f:
-            data = tomllib.load(f)
-
-        c = cls.from_toml_dict(data)
+        from .context import ProjectContext
 
-        if user_config == "infer" and (user_config := c.user_config()) is not None:
-            # relative path
-            user_config = Path(path).parent / Path(user_config)
-
-        if user_config and Path(user_config).exists():
-            u = cls.from_file(user_config)
-            c = c.assign_user_config(u)
-
-        return c
+        return cast("Self", ProjectContext(path).config(user_config))
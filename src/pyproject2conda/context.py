@@ -0,0 +1,223 @@
+"""
+Project context (:mod:`~pyproject2conda.context`)
+=================================================
+
+Files of a project, each loaded at most once.
+
+A :class:`ProjectContext` holds the parsed ``pyproject.toml``, user config,
+and ``.python-version`` files, and hands the same data to
+:class:`~pyproject2conda.config.Config`,
+:class:`~pyproject2conda.requirements.ParseDepends`, and python selection.
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .timings import TIMINGS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import Any
+
+    from ._typing_compat import Self
+    from .cache import DiskCache
+    from .config import Config
+    from .requirements import ParseDepends
+
+
+PYTHON_VERSION_FILES = (".python-version-default", ".python-version")
+"""Files with default python versions, in order of precedence."""
+
+
+def _stat(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ProjectContext:
+    """
+    Loaded files of a project.
+
+    Each file is loaded on first use, and kept for the lifetime of the
+    context.  Use :meth:`changed` and :meth:`reload` to pick up changes to
+    files.
+
+    Parameters
+    ----------
+    path : path-like
+        Path to ``pyproject.toml`` file.
+    data : dict, optional
+        Parsed ``pyproject.toml``.  Default is to load ``path`` on first use.
+    cache : DiskCache, optional
+        Passed to :meth:`~pyproject2conda.requirements.ParseDepends.from_path`.
+
+    Examples
+    --------
+    >>> context = ProjectContext(
+    ...     "pyproject.toml",
+    ...     data={"project": {"name": "hello", "dependencies": ["numpy"]}},
+    ... )
+    >>> context.parser.pip_requirements()
+    ['numpy']
+    >>> context.parse_pythons(None, None, None)
+    (None, None)
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        data: dict[str, Any] | None = None,
+        cache: DiskCache | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.cache = cache
+        self._files: dict[Path, dict[str, Any]] = {}
+        # modification time and size of files when loaded
+        self._stats: dict[Path, tuple[int, int] | None] = {}
+        if data is not None:
+            from .requirements import ParseDepends
+
+            self.parser = ParseDepends(data)
+
+    @cached_property
+    def parser(self) -> ParseDepends:
+        """Requirements parser for ``pyproject.toml``."""
+        from .requirements import ParseDepends
+
+        TIMINGS.count("files-loaded")
+        self._stats[self.path] = _stat(self.path)
+        return ParseDepends.from_path(self.path, cache=self.cache)
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """Parsed ``pyproject.toml``."""
+        return self.parser.data
+
+    def load(self, path: str | Path) -> dict[str, Any]:
+        """Parsed toml file ``path`` (e.g., a user config)."""
+        path = Path(path)
+        if (data := self._files.get(path)) is None:
+            from ._compat import tomllib
+
+            TIMINGS.count("files-loaded")
+            self._stats[path] = _stat(path)
+            with TIMINGS.phase("load"), path.open("rb") as f:
+                data = self._files[path] = tomllib.load(f)
+        return data
+
+    @cached_property
+    def default_pythons(self) -> list[str]:
+        """Python versions from first of :data:`PYTHON_VERSION_FILES` in current directory."""
+        from .utils import get_default_pythons_with_fallback
+
+        for name in PYTHON_VERSION_FILES:
+            path = Path(name).resolve()
+            self._stats[path] = _stat(path)
+        return get_default_pythons_with_fallback(PYTHON_VERSION_FILES)
+
+    @cached_property
+    def all_pythons(self) -> list[str]:
+        """Python versions from ``project.classifiers``."""
+        from .utils import get_all_pythons
+
+        return get_all_pythons(self.data)
+
+    def parse_pythons(
+        self,
+        python_include: str | None,
+        python_version: str | None,
+        python: str | None,
+    ) -> tuple[str | None, str | None]:
+        """Create python_include/python_version (see :func:`~pyproject2conda.utils.parse_pythons`)."""
+        from .utils import parse_pythons
+
+        return parse_pythons(
+            python_include,
+            python_version,
+            python,
+            default_pythons=self.default_pythons if python else None,
+            all_pythons=self.all_pythons if python else None,
+        )
+
+    @cached_property
+    def _config(self) -> Config:
+        from .config import Config
+
+        return Config.from_toml_dict(
+            self.data,
+            default_pythons=self.default_pythons,
+            all_pythons=self.all_pythons,
+        )
+
+    def user_config_path(self, user_config: str | Path | None = "infer") -> Path | None:
+        """
+        Path to user config.
+
+        If ``user_config`` is ``"infer"``, use ``tool.pyproject2conda.user-config``,
+        relative to the directory of ``pyproject.toml``.
+        """
+        if user_config == "infer":
+            if (inferred := self._config.user_config()) is None:
+                return None
+            return self.path.parent / inferred
+        return Path(user_config) if user_config else None
+
+    def config(self, user_config: str | Path | None = "infer") -> Config:
+        """
+        Config from ``pyproject.toml`` and user config.
+
+        Parameters
+        ----------
+        user_config : path-like or "infer", optional
+            User config (see :meth:`user_config_path`).  User config is
+            ignored if it does not exist.
+        """
+        from .config import Config
+
+        c = self._config
+        if (path := self.user_config_path(user_config)) is None:
+            return c
+        if not path.exists():
+            # so that creating the user config is a change
+            self._stats[path] = None
+            return c
+        return c.assign_user_config(
+            Config.from_toml_dict(self.load(path), default_pythons=self.default_pythons)
+        )
+
+    def changed(self) -> set[Path]:
+        """Files which changed (or were created or removed) since loaded."""
+        return {path for path, stat in self._stats.items() if _stat(path) != stat}
+
+    def reload(self, changed: Iterable[str | Path]) -> Self:
+        """New context, sharing files not in ``changed``."""
+        changed = {Path(p).resolve() for p in changed}
+
+        new = type(self)(
+            self.path,
+            data=None
+            if self.path.resolve() in changed or "parser" not in self.__dict__
+            else self.data,
+            cache=self.cache,
+        )
+        new._files = {  # noqa: SLF001
+            path: data
+            for path, data in self._files.items()
+            if path.resolve() not in changed
+        }
+        new._stats = {  # noqa: SLF001
+            path: stat
+            for path, stat in self._stats.items()
+            if path.resolve() not in changed
+        }
+        if "default_pythons" in self.__dict__ and changed.isdisjoint(
+            Path(p).resolve() for p in PYTHON_VERSION_FILES
+        ):
+            new.default_pythons = self.default_pythons
+        return new
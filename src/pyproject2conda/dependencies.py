@@ -0,0 +1,234 @@
+"""
+Dependency sets (:mod:`~pyproject2conda.dependencies`)
+======================================================
+
+Merge requirements on the same package.
+
+Requirements are indexed by canonical name (:pep:`503`), so that, for
+example, ``numpy>=1.24`` and ``NumPy<2`` are merged to the single requirement
+``numpy<2,>=1.24``, and ``conda-forge::numpy`` and ``numpy`` are merged to
+``conda-forge::numpy``.  Requirements with different markers or direct
+references (urls) are kept separate.  This includes conda requirements, which
+have their marker removed, if the marker could not be decided.  Version specifiers are intersected,
+and intersections which are provably empty (e.g., ``numpy>=2`` and
+``numpy<2``) raise :class:`DependencyConflictError`.  Merging is linear in
+the number of requirements.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from packaging.specifiers import SpecifierSet
+from packaging.version import InvalidVersion, Version
+
+from .timings import TIMINGS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+    from typing import TypeAlias
+
+    from packaging.markers import Marker
+
+    from .requirements import RequirementRecord
+
+    DependencyLike: TypeAlias = RequirementRecord | str
+
+
+class DependencyConflictError(ValueError):
+    """Raised if requirements on the same package cannot be merged."""
+
+    def __init__(self, name: str, requirements: Sequence[str], reason: str) -> None:
+        self.name = name
+        self.requirements = tuple(requirements)
+        listed = ", ".join(repr(x) for x in self.requirements)
+        super().__init__(f"Conflicting requirements for {name!r}: {listed} ({reason})")
+
+
+def _compatible_upper(version: Version) -> Version:
+    # ~=1.4.5 is equivalent to >=1.4.5,<1.5
+    release = version.release[:-1]
+    return Version(".".join(map(str, (*release[:-1], release[-1] + 1))))
+
+
+def specifier_is_empty(specifier: str | SpecifierSet) -> bool:  # noqa: C901, PLR0912
+    """
+    Whether ``specifier`` provably matches no version.
+
+    This is conservative: ``False`` means no contradiction was found, not that
+    a matching version exists.  Bounds from ``<``, ``<=``, ``>``, ``>=``,
+    ``~=``, and pins from ``==`` are compared.  Wildcards and ``===`` are only
+    checked against pins.
+
+    Examples
+    --------
+    >>> specifier_is_empty(">=2,<2")
+    True
+    >>> specifier_is_empty("==1.0,!=1.0")
+    True
+    >>> specifier_is_empty(">=1.24,<2")
+    False
+    """
+    if isinstance(specifier, str):
+        specifier = SpecifierSet(specifier)
+
+    pins: set[Version] = set()
+    excluded: set[Version] = set()
+    # bounds are pairs of version and whether it is included
+    lower: tuple[Version, bool] | None = None
+    upper: tuple[Version, bool] | None = None
+
+    def _lower(version: Version, inclusive: bool) -> None:
+        nonlocal lower
+        if (
+            lower is None
+            or version > lower[0]
+            or (version == lower[0] and not inclusive)
+        ):
+            lower = (version, inclusive)
+
+    def _upper(version: Version, inclusive: bool) -> None:
+        nonlocal upper
+        if (
+            upper is None
+            or version < upper[0]
+            or (version == upper[0] and not inclusive)
+        ):
+            upper = (version, inclusive)
+
+    for spec in specifier:
+        operator, value = spec.operator, spec.version
+        if value.endswith(".*") or operator == "===":
+            continue
+        try:
+            version = Version(value)
+        except InvalidVersion:  # pragma: no cover
+            continue
+
+        if operator == "==":
+            pins.add(version)
+        elif operator == "!=":
+            excluded.add(version)
+        elif operator in {">=", ">"}:
+            _lower(version, operator == ">=")
+        elif operator in {"<=", "<"}:
+            _upper(version, operator == "<=")
+        elif operator == "~=":
+            _lower(version, True)
+            _upper(_compatible_upper(version), False)
+
+    if pins:
+        if len(pins) > 1:
+            return True
+        return not specifier.contains(next(iter(pins)), prereleases=True)
+
+    if lower is None or upper is None:
+        return False
+    if lower[0] > upper[0]:
+        return True
+    if lower[0] == upper[0]:
+        return not (lower[1] and upper[1]) or lower[0] in excluded
+    return False
+
+
+@lru_cache(maxsize=4096)
+def _intersect(first: str, second: str) -> str | None:
+    """Intersection of specifiers, or ``None`` if provably empty."""
+    out = SpecifierSet(first) & SpecifierSet(second)
+    return None if specifier_is_empty(out) else str(out)
+
+
+def _key(record: RequirementRecord, marker: Marker | None = None) -> object:
+    if marker is None:
+        marker = record.marker
+    if record.url is None and marker is None:
+        return record.canonical_name
+    return (
+        record.canonical_name,
+        record.url,
+        None if marker is None else str(marker),
+    )
+
+
+class DependencySet:
+    """
+    Requirements merged by canonical name.
+
+    Requirements with the same canonical name, direct reference, and marker
+    are merged: version specifiers are intersected, extras are combined, and
+    a conda channel on either requirement is kept.  Strings (e.g., ``-e .``)
+    are kept as is, without duplicates.  Order of first appearance is
+    preserved.
+
+    Parameters
+    ----------
+    requirements : iterable of RequirementRecord or str
+    """
+
+    def __init__(self, requirements: Iterable[DependencyLike] = ()) -> None:
+        self._items: dict[object, DependencyLike] = {}
+        self.update(requirements)
+
+    def add(self, requirement: DependencyLike, marker: Marker | None = None) -> None:
+        """
+        Add ``requirement``.
+
+        ``marker`` is the (undecided) marker of a requirement whose marker was
+        removed, such as a conda requirement.  The requirement is then only
+        merged with requirements with the same marker.
+
+        Raises :class:`DependencyConflictError` if it cannot be merged with a
+        requirement on the same package.
+        """
+        if isinstance(requirement, str):
+            # not a canonical name, as it did not parse as a requirement
+            self._items.setdefault((requirement,), requirement)
+            return
+
+        key = _key(requirement, marker)
+        if (existing := self._items.get(key)) is None:
+            self._items[key] = requirement
+        elif existing is not requirement and existing != requirement:
+            self._items[key] = self._merge(existing, requirement)  # type: ignore[arg-type]
+
+    def update(self, requirements: Iterable[DependencyLike]) -> None:
+        """Add each of ``requirements``."""
+        # Pooled requirements are often repeated (e.g., by extras which include
+        # other extras), so skip repeated objects up front.
+        for requirement in {id(x): x for x in requirements}.values():
+            self.add(requirement)
+
+    @staticmethod
+    def _merge(
+        first: RequirementRecord, second: RequirementRecord
+    ) -> RequirementRecord:
+        TIMINGS.count("requirements-merged")
+        if first.channel and second.channel and first.channel != second.channel:
+            raise DependencyConflictError(
+                first.name, [first.string, second.string], "different channels"
+            )
+
+        specifier = first.specifier or second.specifier
+        if first.specifier and second.specifier and first.specifier != second.specifier:
+            if (intersection := _intersect(first.specifier, second.specifier)) is None:
+                raise DependencyConflictError(
+                    first.name,
+                    [first.string, second.string],
+                    "no version satisfies both",
+                )
+            specifier = intersection
+
+        return replace(
+            first,
+            channel=first.channel or second.channel,
+            extras=tuple(sorted({*first.extras, *second.extras})),
+            specifier=specifier,
+        )
+
+    def __iter__(self) -> Iterator[DependencyLike]:
+        return iter(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
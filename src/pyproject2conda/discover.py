@@ -0,0 +1,236 @@
+"""
+Discover projects (:mod:`~pyproject2conda.discover`)
+====================================================
+
+Find ``pyproject.toml`` files under a directory for ``project --recursive``.
+
+Directories are walked once.  Files and directories matching ``.gitignore``
+files found along the way, or extra gitignore-style exclude patterns, are
+skipped (ignored directories are not descended into).  The supported
+pattern syntax is that of ``.gitignore``: ``*``, ``?``, ``[...]``, ``**``,
+leading ``/`` (anchored), trailing ``/`` (directories only), and ``!``
+(negation).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from ._typing_compat import Self
+
+
+PYPROJECT_NAME = "pyproject.toml"
+IGNORE_FILE = ".gitignore"
+
+
+def _translate(pattern: str) -> str:
+    """Translate gitignore-style glob (without leading/trailing ``/``) to regex."""
+    out: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[" and (end := pattern.find("]", i + 2)) != -1:
+            body = pattern[i + 1 : end].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = end + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+@dataclass(frozen=True)
+class _Rule:
+    regex: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+
+
+class IgnorePatterns:
+    """
+    Gitignore-style patterns, relative to directory ``base``.
+
+    Later patterns take precedence over earlier ones.
+
+    Parameters
+    ----------
+    patterns : iterable of str
+        Lines of a ``.gitignore`` file.  Blank lines and comments are skipped.
+    base : path-like
+        Directory patterns are relative to.
+
+    Examples
+    --------
+    >>> ignore = IgnorePatterns(["build/", "*.egg-info", "!keep.egg-info", "/docs"])
+    >>> ignore.match("a/build", is_dir=True)
+    True
+    >>> ignore.match("a/build", is_dir=False) is None
+    True
+    >>> (
+    ...     ignore.match("a/b.egg-info", is_dir=True),
+    ...     ignore.match("keep.egg-info", is_dir=True),
+    ... )
+    (True, False)
+    >>> ignore.match("docs", is_dir=True), ignore.match("a/docs", is_dir=True)
+    (True, None)
+    """
+
+    def __init__(self, patterns: Iterable[str], base: str | Path = ".") -> None:
+        self.base = Path(base)
+        self._rules: list[_Rule] = []
+        for line in patterns:
+            pattern = line.rstrip("\n")
+            if not pattern.endswith("\\ "):
+                pattern = pattern.rstrip()
+            if not pattern or pattern.startswith("#"):
+                continue
+
+            negate = pattern.startswith("!")
+            if negate:
+                pattern = pattern[1:]
+            elif pattern.startswith("\\"):
+                # escaped leading "!" or "#"
+                pattern = pattern[1:] if pattern[1:2] in {"!", "#"} else pattern
+
+            dir_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            if not pattern:
+                continue
+
+            # patterns with a (non-trailing) "/" are relative to base
+            anchored = "/" in pattern
+            regex = _translate(pattern.lstrip("/"))
+            if not anchored:
+                regex = f"(?:.*/)?{regex}"
+            self._rules.append(_Rule(re.compile(regex), negate, dir_only))
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> Self:
+        """Patterns from ``.gitignore`` file ``path``."""
+        path = Path(path)
+        with path.open(encoding="utf-8", errors="replace") as f:
+            return cls(f, base=path.parent)
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def match(self, path: str, is_dir: bool) -> bool | None:
+        """
+        Whether ``path`` (posix, relative to :attr:`base`) is ignored.
+
+        Returns ``None`` if no pattern matches ``path``.
+        """
+        for rule in reversed(self._rules):
+            if (is_dir or not rule.dir_only) and rule.regex.fullmatch(path):
+                return not rule.negate
+        return None
+
+
+def _is_ignored(path: Path, is_dir: bool, patterns: Iterable[IgnorePatterns]) -> bool:
+    # patterns are ordered by precedence
+    for ignore in patterns:
+        relative = os.path.relpath(path, ignore.base).replace(os.sep, "/")
+        if (matched := ignore.match(relative, is_dir)) is not None:
+            return matched
+    return False
+
+
+def _has_config(path: Path) -> bool:
+    # Projects without a `tool.pyproject2conda` table have no outputs.
+    # Cheap check, so that such files need not be parsed.
+    try:
+        return b"pyproject2conda" in path.read_bytes()
+    except OSError:  # pragma: no cover
+        return False
+
+
+def find_projects(
+    root: str | Path,
+    exclude: Iterable[str] = (),
+    *,
+    gitignore: bool = True,
+    require_config: bool = True,
+) -> list[Path]:
+    """
+    Find ``pyproject.toml`` files under directory ``root``.
+
+    Parameters
+    ----------
+    root : path-like
+        Directory to search.
+    exclude : iterable of str
+        Gitignore-style patterns (relative to ``root``) of files and
+        directories to skip.  These take precedence over ``.gitignore`` files.
+    gitignore : bool, default True
+        If ``True``, also skip paths matching ``.gitignore`` files under
+        ``root``.
+    require_config : bool, default True
+        If ``True``, skip ``pyproject.toml`` files which do not mention
+        ``pyproject2conda`` (and so cannot have outputs).
+
+    Returns
+    -------
+    list of Path
+        Paths to ``pyproject.toml`` files, sorted.  ``.git`` directories are
+        never searched.
+    """
+    root = Path(root)
+    if not root.is_dir():
+        msg = f"{root} is not a directory"
+        raise ValueError(msg)
+
+    excluded = IgnorePatterns(exclude, base=root)
+    # patterns in effect for each directory, in order of precedence
+    in_effect: dict[str, list[IgnorePatterns]] = {
+        str(root): [excluded] if excluded else []
+    }
+    out: list[Path] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        patterns = in_effect.pop(dirpath)
+        if gitignore and IGNORE_FILE in filenames:
+            ignore = IgnorePatterns.from_file(Path(dirpath, IGNORE_FILE))
+            if ignore:
+                # deeper files take precedence, but exclude patterns come first
+                n = int(bool(excluded))
+                patterns = [*patterns[:n], ignore, *patterns[n:]]
+
+        dirnames[:] = sorted(
+            name
+            for name in dirnames
+            if name != ".git" and not _is_ignored(Path(dirpath, name), True, patterns)
+        )
+        for name in dirnames:
+            in_effect[os.path.join(dirpath, name)] = patterns  # noqa: PTH118
+
+        if PYPROJECT_NAME in filenames:
+            path = Path(dirpath, PYPROJECT_NAME)
+            if not _is_ignored(path, False, patterns) and (
+                not require_config or _has_config(path)
+            ):
+                out.append(path)
+
+    return sorted(out)
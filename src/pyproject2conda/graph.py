@@ -0,0 +1,216 @@
+"""
+Dependency graph (:mod:`~pyproject2conda.graph`)
+================================================
+
+Resolve extras and dependency groups.
+
+Nodes of the graph are extras (``project.optional-dependencies``) and
+dependency groups (``dependency-groups``).  Edges are references to the
+package itself (``package[extra]``), from extras or groups, and
+``{include-group = "..."}`` tables in groups.  Names are compared in canonical
+form (:pep:`503`, :pep:`685`, :pep:`735`).  Each node is resolved exactly
+once, in topological order, so resolving all nodes is linear in the size of
+the graph (plus the size of the output).
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal
+
+from packaging.requirements import Requirement
+from packaging.utils import canonicalize_name
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Container, Iterable, Mapping, Sequence
+    from typing import Any, TypeAlias
+
+    from .requirements import RequirementRecord
+
+    Kind: TypeAlias = Literal["extra", "group"]
+    Node: TypeAlias = tuple[Kind, str]
+    RequirementLike: TypeAlias = Requirement | RequirementRecord
+
+
+def _is_requirement(item: Any) -> bool:
+    # Requirement or RequirementRecord, without importing the latter
+    return not isinstance(item, dict) and hasattr(item, "extras")
+
+
+class DependencyCycleError(ValueError):
+    """Raised if extras or groups reference each other in a cycle."""
+
+    def __init__(self, cycle: Sequence[Node]) -> None:
+        self.cycle = tuple(cycle)
+        path = " -> ".join(f"{kind} {name!r}" for kind, name in self.cycle)
+        super().__init__(f"Cyclic dependency: {path}")
+
+
+class DependencyGraph:
+    """
+    Graph of extras and dependency groups.
+
+    Parameters
+    ----------
+    package_name : str
+        Name of the package.  Requirements on the package are references to its extras.
+    extras : mapping
+        Table ``project.optional-dependencies``.
+    groups : mapping
+        Table ``dependency-groups``.
+    parse : callable, optional
+        Function used to parse requirement strings.  Defaults to
+        :class:`~packaging.requirements.Requirement`.  May instead return
+        :class:`~pyproject2conda.requirements.RequirementRecord`.
+    """
+
+    def __init__(
+        self,
+        package_name: str | None,
+        extras: Mapping[str, Sequence[str | RequirementLike]] | None = None,
+        groups: Mapping[str, Sequence[str | RequirementLike | Mapping[str, str]]]
+        | None = None,
+        parse: Callable[[str], RequirementLike] = Requirement,
+    ) -> None:
+        self.package_name = canonicalize_name(package_name) if package_name else None
+        self._parse = parse
+        self._tables: dict[Kind, dict[str, tuple[str, Sequence[Any]]]] = {
+            "extra": self._canonical_table(extras or {}, "extra"),
+            "group": self._canonical_table(groups or {}, "dependency group"),
+        }
+        self._items: dict[Node, list[RequirementLike | Node]] = {}
+        self._resolved: dict[Node, list[RequirementLike]] = {}
+
+    @staticmethod
+    def _canonical_table(
+        table: Mapping[str, Sequence[Any]], label: str
+    ) -> dict[str, tuple[str, Sequence[Any]]]:
+        out: dict[str, tuple[str, Sequence[Any]]] = {}
+        for name, items in table.items():
+            key = canonicalize_name(name)
+            if key in out:
+                msg = f"Duplicate {label} names {out[key][0]!r} and {name!r}"
+                raise ValueError(msg)
+            out[key] = (name, items)
+        return out
+
+    def names(self, kind: Kind) -> list[str]:
+        """Names (as written) of extras or groups."""
+        return [name for name, _ in self._tables[kind].values()]
+
+    def node(self, kind: Kind, name: str) -> Node:
+        """Canonical node for extra or group ``name``."""
+        key = canonicalize_name(name)
+        if key not in self._tables[kind]:
+            msg = f"Unknown {'dependency group' if kind == 'group' else kind} {name!r}"
+            raise ValueError(msg)
+        return (kind, key)
+
+    def raw(self, node: Node) -> tuple[str, Sequence[Any]]:
+        """Name (as written) and unparsed items of ``node``."""
+        return self._tables[node[0]][node[1]]
+
+    def _package_extras(self, requirement: RequirementLike) -> list[Node] | None:
+        """Extras referenced by ``requirement``, if it is on the package itself."""
+        if (
+            self.package_name is None
+            or canonicalize_name(requirement.name) != self.package_name
+        ):
+            return None
+        return [self.node("extra", extra) for extra in sorted(requirement.extras)]
+
+    def items(self, node: Node) -> list[RequirementLike | Node]:
+        """Parsed items of ``node``.  References to other nodes are left unresolved."""
+        if (items := self._items.get(node)) is not None:
+            return items
+
+        kind, _ = node
+        name, raw = self.raw(node)
+        items = []
+        for item in raw:
+            if isinstance(item, str) or _is_requirement(item):
+                requirement = self._parse(item) if isinstance(item, str) else item
+                if (refs := self._package_extras(requirement)) is None:
+                    items.append(requirement)
+                else:
+                    items.extend(refs)
+            elif (
+                kind == "group"
+                and isinstance(item, dict)
+                and set(item) == {"include-group"}
+            ):
+                items.append(self.node("group", item["include-group"]))
+            else:
+                msg = f"Invalid item {item!r} in {kind} {name!r}"
+                raise ValueError(msg)
+
+        self._items[node] = items
+        return items
+
+    def _edges(self, node: Node) -> list[Node]:
+        return [item for item in self.items(node) if isinstance(item, tuple)]
+
+    def topological_order(
+        self, roots: Iterable[Node], skip: Container[Node] = ()
+    ) -> list[Node]:
+        """
+        Nodes reachable from ``roots``, with every node after the nodes it references.
+
+        Nodes in ``skip`` (and nodes only reachable through them) are excluded.
+
+        Raises
+        ------
+        DependencyCycleError
+            If a cycle is reachable from ``roots``.
+        """
+        order: list[Node] = []
+        done: set[Node] = set()
+        # ordered, so that a cycle can be reported as a path
+        path: dict[Node, None] = {}
+
+        for root in roots:
+            if root in done or root in skip:
+                continue
+            stack: list[tuple[Node, bool]] = [(root, False)]
+            while stack:
+                node, finished = stack.pop()
+                if finished:
+                    del path[node]
+                    done.add(node)
+                    order.append(node)
+                    continue
+                if node in done:
+                    continue
+
+                path[node] = None
+                stack.append((node, True))
+                for child in reversed(self._edges(node)):
+                    if child in path:
+                        nodes = list(path)
+                        raise DependencyCycleError(
+                            [*nodes[nodes.index(child) :], child]
+                        )
+                    if child not in done and child not in skip:
+                        stack.append((child, False))
+        return order
+
+    def resolve(self, node: Node) -> list[RequirementLike]:
+        """Requirements of ``node``, with references to other nodes expanded."""
+        if (out := self._resolved.get(node)) is not None:
+            return out
+
+        for n in self.topological_order([node], skip=self._resolved):
+            resolved: list[RequirementLike] = []
+            for item in self.items(n):
+                if isinstance(item, tuple):
+                    resolved.extend(self._resolved[item])
+                else:
+                    resolved.append(item)
+            self._resolved[n] = resolved
+        return self._resolved[node]
+
+    def resolve_all(self, kind: Kind) -> dict[str, list[RequirementLike]]:
+        """Resolve all extras or groups.  Keys are the names as written."""
+        return {
+            name: self.resolve((kind, key))
+            for key, (name, _) in self._tables[kind].items()
+        }
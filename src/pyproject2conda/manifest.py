@@ -0,0 +1,120 @@
+"""
+Output manifest (:mod:`~pyproject2conda.manifest`)
+==================================================
+
+Record of content fingerprints of the inputs used to create each output.
+Unlike file modification times, fingerprints survive ``git checkout`` and
+restoring outputs from a cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pyproject2conda.utils import atomic_write_bytes
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from ._typing_compat import Self
+
+
+MANIFEST_VERSION = 1
+
+
+def fingerprint(data: Any) -> str:
+    """Hex digest of json representation of ``data`` (with sorted keys)."""
+    from pyproject2conda import __version__
+
+    return hashlib.sha256(
+        json.dumps(
+            [__version__, data], sort_keys=True, separators=(",", ":"), default=str
+        ).encode()
+    ).hexdigest()
+
+
+def file_digest(path: str | Path) -> str | None:
+    """Hex digest of content of ``path``, or ``None`` if ``path`` does not exist."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+class Manifest:
+    """
+    Mapping from output path to fingerprints of inputs and output.
+
+    Parameters
+    ----------
+    path : path-like
+        Location of manifest file.  Output paths are stored relative to
+        the current directory.
+    entries : dict, optional
+    """
+
+    def __init__(
+        self, path: str | Path, entries: dict[str, dict[str, str]] | None = None
+    ) -> None:
+        self.path = Path(path)
+        self.entries: dict[str, dict[str, str]] = {} if entries is None else entries
+        self._changed = False
+
+    @staticmethod
+    def _key(output: str | Path) -> str:
+        return Path(output).as_posix()
+
+    def is_current(self, output: str | Path, inputs: str) -> bool:
+        """
+        Whether ``output`` was created from ``inputs`` and is unchanged since.
+
+        ``inputs`` is the fingerprint of inputs used to create ``output``.
+        """
+        if (entry := self.entries.get(self._key(output))) is None:
+            return False
+        return entry["inputs"] == inputs and entry["output"] == file_digest(output)
+
+    def record(self, output: str | Path, inputs: str) -> None:
+        """Record that ``output`` was created from ``inputs``."""
+        if (digest := file_digest(output)) is None:
+            # nothing written (for example, empty environment)
+            self.discard(output)
+            return
+
+        entry = {"inputs": inputs, "output": digest}
+        key = self._key(output)
+        if self.entries.get(key) != entry:
+            self.entries[key] = entry
+            self._changed = True
+
+    def discard(self, output: str | Path) -> None:
+        """Remove record of ``output``."""
+        if self.entries.pop(self._key(output), None) is not None:
+            self._changed = True
+
+    @classmethod
+    def from_path(cls, path: str | Path) -> Self:
+        """Load manifest from ``path``.  Missing or out of date files give an empty manifest."""
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            data = {}
+
+        if data.get("version") != MANIFEST_VERSION:
+            return cls(path)
+        return cls(path, entries=data["outputs"])
+
+    def save(self) -> None:
+        """Write manifest to ``self.path`` if anything changed."""
+        if not self._changed:
+            return
+        s = json.dumps(
+            {"version": MANIFEST_VERSION, "outputs": self.entries},
+            indent=2,
+            sort_keys=True,
+        )
+        atomic_write_bytes(self.path, (s + "\n").encode("utf-8"))
+        self._changed = False
@@ -0,0 +1,416 @@
+"""
+Environment markers (:mod:`~pyproject2conda.markers`)
+=====================================================
+
+Evaluate :pep:`508` environment markers against a partial environment.
+
+Unlike :meth:`packaging.markers.Marker.evaluate`, values missing from the
+environment are *not* taken from the running interpreter.  Instead, a marker
+which cannot be decided from the supplied values evaluates to ``None``
+(undecided).  Markers are combined with three-valued (Kleene) logic: ``False
+and x`` is ``False``, ``True or x`` is ``True``, and otherwise an undecided
+operand makes the result undecided.
+
+Markers are parsed from their string form (so that only the public interface
+of :mod:`packaging` is used) and compiled once, and results are cached per marker and per values of
+the variables the marker uses.  For example, ``python_version < "3.11"`` is
+evaluated once per python version, however many platforms are rendered.
+
+Conda platforms (subdirs, e.g., ``linux-64``) are mapped to the platform
+variables of the environment with :func:`platform_environment`.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, cast
+
+from packaging.markers import Marker
+from packaging.specifiers import InvalidSpecifier, Specifier
+
+from ._typing_compat import override
+from .timings import TIMINGS
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+    from typing import TypeAlias
+
+    Evaluator: TypeAlias = Callable[[Mapping[str, str]], bool | None]
+
+
+MARKER_ENVIRONMENT_KEYS: tuple[str, ...] = (
+    "python_version",
+    "python_full_version",
+    "sys_platform",
+    "platform_machine",
+    "implementation_name",
+    "os_name",
+    "platform_system",
+)
+"""Environment keys set by ``pyproject2conda``.  Other :pep:`508` keys may be passed."""
+
+# Keys always compared as versions.
+_VERSION_KEYS = frozenset(
+    {"python_version", "python_full_version", "implementation_version"}
+)
+
+_MISSING = object()
+
+_SYSTEMS: dict[str, dict[str, str]] = {
+    "linux": {"sys_platform": "linux", "platform_system": "Linux", "os_name": "posix"},
+    "osx": {"sys_platform": "darwin", "platform_system": "Darwin", "os_name": "posix"},
+    "win": {"sys_platform": "win32", "platform_system": "Windows", "os_name": "nt"},
+}
+
+CONDA_PLATFORMS: dict[str, str] = {
+    "linux-64": "x86_64",
+    "linux-32": "i686",
+    "linux-aarch64": "aarch64",
+    "linux-armv7l": "armv7l",
+    "linux-ppc64le": "ppc64le",
+    "linux-s390x": "s390x",
+    "osx-64": "x86_64",
+    "osx-arm64": "arm64",
+    "win-64": "AMD64",
+    "win-32": "x86",
+    "win-arm64": "ARM64",
+}
+"""Known conda platforms (subdirs), and the corresponding ``platform_machine``."""
+
+
+def platform_environment(platform: str) -> dict[str, str]:
+    """
+    Environment markers for conda ``platform``.
+
+    Parameters
+    ----------
+    platform : str
+        Conda platform (subdir).  One of :data:`CONDA_PLATFORMS`.
+
+    Returns
+    -------
+    dict
+        Values of ``sys_platform``, ``platform_system``, ``os_name``, and
+        ``platform_machine``.
+
+    Examples
+    --------
+    >>> platform_environment("osx-arm64")
+    {'sys_platform': 'darwin', 'platform_system': 'Darwin', 'os_name': 'posix', 'platform_machine': 'arm64'}
+    """
+    if (machine := CONDA_PLATFORMS.get(platform)) is None:
+        msg = f"Unknown platform {platform!r}.  Must be one of {', '.join(CONDA_PLATFORMS)}"
+        raise ValueError(msg)
+    return {**_SYSTEMS[platform.split("-", maxsplit=1)[0]], "platform_machine": machine}
+
+
+def marker_environment(
+    python_version: str | None = None, platform: str | None = None
+) -> dict[str, str]:
+    """
+    Partial environment for ``python_version`` and conda ``platform``.
+
+    Examples
+    --------
+    >>> marker_environment("3.12", "win-64")["sys_platform"]
+    'win32'
+    >>> marker_environment()
+    {}
+    """
+    environment = {"python_version": python_version} if python_version else {}
+    if platform:
+        environment.update(platform_environment(platform))
+    return environment
+
+
+# * Parsing ----------------------------------------------------------------------------
+# Markers are parsed from their (normalized) string form, so that only the
+# public interface of packaging is used.
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+    (?P<string>'[^']*'|"[^"]*")
+    |(?P<op>===|==|!=|<=|>=|~=|<|>)
+    |(?P<paren>[()])
+    |(?P<word>[A-Za-z_][A-Za-z0-9_.]*)
+    )""",
+    re.VERBOSE,
+)
+
+
+@dataclass(frozen=True)
+class _Leaf:
+    """Comparison ``lhs op rhs``.  Values are ``(is_variable, value)``."""
+
+    lhs: tuple[bool, str]
+    op: str
+    rhs: tuple[bool, str]
+
+
+# Parsed marker: a leaf, or ("and" | "or", operands)
+_Node: TypeAlias = "_Leaf | tuple[str, list[_Node]]"
+
+
+def _tokenize(marker: str) -> list[tuple[str, str]]:
+    tokens: list[tuple[str, str]] = []
+    pos, end = 0, len(marker.rstrip())
+    while pos < end:
+        if (match := _TOKEN.match(marker, pos)) is None or match.end() == pos:
+            msg = f"Cannot parse marker {marker!r} at position {pos}"
+            raise ValueError(msg)
+        kind = cast("str", match.lastgroup)
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive descent parser of :pep:`508` markers.
+
+    ``or`` binds weaker than ``and``, as in :pep:`508`.
+    """
+
+    def __init__(self, marker: str) -> None:
+        self.marker = marker
+        self.tokens = _tokenize(marker)
+        self.pos = 0
+
+    def _error(self) -> ValueError:
+        return ValueError(f"Cannot parse marker {self.marker!r}")
+
+    def _peek(self) -> tuple[str, str] | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _next(self) -> tuple[str, str]:
+        if (token := self._peek()) is None:
+            raise self._error()
+        self.pos += 1
+        return token
+
+    def parse(self) -> _Node:
+        node = self._parse_or()
+        if self._peek() is not None:
+            raise self._error()
+        return node
+
+    def _parse_bool(self, op: str, parse: Callable[[], _Node]) -> _Node:
+        nodes = [parse()]
+        while self._peek() == ("word", op):
+            self.pos += 1
+            nodes.append(parse())
+        return nodes[0] if len(nodes) == 1 else (op, nodes)
+
+    def _parse_or(self) -> _Node:
+        return self._parse_bool("or", self._parse_and)
+
+    def _parse_and(self) -> _Node:
+        return self._parse_bool("and", self._parse_expr)
+
+    def _parse_expr(self) -> _Node:
+        if self._peek() == ("paren", "("):
+            self.pos += 1
+            node = self._parse_or()
+            if self._next() != ("paren", ")"):
+                raise self._error()
+            return node
+        lhs = self._parse_value()
+        return _Leaf(lhs, self._parse_op(), self._parse_value())
+
+    def _parse_value(self) -> tuple[bool, str]:
+        kind, value = self._next()
+        if kind == "string":
+            return False, value[1:-1]
+        if kind == "word" and value not in {"and", "or", "in", "not"}:
+            return True, value
+        raise self._error()
+
+    def _parse_op(self) -> str:
+        kind, value = self._next()
+        if kind == "op" or value == "in":
+            return value
+        if value == "not" and self._next() == ("word", "in"):
+            return "not in"
+        raise self._error()
+
+
+def _parse_marker(marker: str | Marker) -> _Node:
+    """
+    Parse ``marker`` to a tree of comparisons.
+
+    Returns a leaf (with ``lhs``, ``op``, and ``rhs``) or a pair
+    ``("and" | "or", operands)``.
+    """
+    return _Parser(str(marker)).parse()
+
+
+# * Compiling --------------------------------------------------------------------------
+def _quote(value: str) -> str:
+    return f"'{value}'" if '"' in value else f'"{value}"'
+
+
+def _compile_leaf(leaf: _Leaf) -> tuple[set[str], Evaluator]:
+    (lhs_is_variable, lhs), op, (rhs_is_variable, rhs) = leaf.lhs, leaf.op, leaf.rhs
+    keys = {v for is_variable, v in (leaf.lhs, leaf.rhs) if is_variable}
+
+    if lhs_is_variable and not rhs_is_variable and lhs in _VERSION_KEYS:
+        try:
+            spec = Specifier(f"{op}{rhs}")
+        except InvalidSpecifier:
+            pass
+        else:
+
+            def evaluate_version(environment: Mapping[str, str]) -> bool | None:
+                if (value := environment.get(lhs)) is None:
+                    return None
+                return spec.contains(value, prereleases=True)
+
+            return keys, evaluate_version
+
+    # Anything else is delegated to packaging.  Only ``keys`` are used, so
+    # defaults from the running interpreter do not matter.
+    marker = Marker(
+        " ".join(
+            [
+                lhs if lhs_is_variable else _quote(lhs),
+                op,
+                rhs if rhs_is_variable else _quote(rhs),
+            ]
+        )
+    )
+
+    def evaluate(environment: Mapping[str, str]) -> bool | None:
+        values = {key: environment.get(key) for key in keys}
+        if None in values.values():
+            return None
+        return marker.evaluate(cast("dict[str, str]", values))
+
+    return keys, evaluate
+
+
+def _compile(node: _Node) -> tuple[set[str], Evaluator]:
+    if isinstance(node, _Leaf):
+        return _compile_leaf(node)
+
+    op, operands = node
+    keys: set[str] = set()
+    funcs: list[Evaluator] = []
+    for operand in operands:
+        operand_keys, func = _compile(operand)
+        keys.update(operand_keys)
+        funcs.append(func)
+
+    # Kleene logic: the absorbing value decides, otherwise undecided wins
+    absorbing = op == "or"
+
+    def evaluate(environment: Mapping[str, str]) -> bool | None:
+        out: bool | None = not absorbing
+        for func in funcs:
+            if (value := func(environment)) is absorbing:
+                return absorbing
+            if value is None:
+                out = None
+        return out
+
+    return keys, evaluate
+
+
+class CompiledMarker:
+    """
+    Marker compiled to a three-valued function of the environment.
+
+    Parameters
+    ----------
+    marker : Marker
+    """
+
+    __slots__ = ("_evaluate", "_results", "keys", "marker")
+
+    def __init__(self, marker: Marker) -> None:
+        keys, self._evaluate = _compile(_parse_marker(marker))
+        self.marker = marker
+        self.keys: tuple[str, ...] = tuple(sorted(keys))
+        """Environment keys used by the marker."""
+        self._results: dict[tuple[str | None, ...], bool | None] = {}
+
+    def evaluate(self, environment: Mapping[str, str]) -> bool | None:
+        """
+        Evaluate marker.
+
+        Returns
+        -------
+        bool or None
+            ``None`` if the result cannot be decided from ``environment``.
+        """
+        key = tuple(environment.get(k) for k in self.keys)
+        if (out := self._results.get(key, _MISSING)) is _MISSING:
+            TIMINGS.count("marker-evaluations")
+            out = self._results[key] = self._evaluate(environment)
+        else:
+            TIMINGS.count("marker-cache-hits")
+        return out  # type: ignore[return-value]
+
+    @override
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {str(self.marker)!r}>"
+
+
+class MarkerEvaluator:
+    """Cache of :class:`CompiledMarker`, keyed by marker identity."""
+
+    def __init__(self) -> None:
+        self._compiled: dict[int, CompiledMarker] = {}
+
+    def compile(self, marker: Marker) -> CompiledMarker:
+        """Compiled ``marker``."""
+        # Compiled markers reference ``marker``, so its id is not reused while
+        # it is cached.
+        if (out := self._compiled.get(id(marker))) is None:
+            out = self._compiled[id(marker)] = CompiledMarker(marker)
+        return out
+
+    def evaluate(self, marker: Marker, environment: Mapping[str, str]) -> bool | None:
+        """Evaluate ``marker``.  ``None`` means undecided."""
+        return self.compile(marker).evaluate(environment)
+
+    def clear(self) -> None:
+        """Remove all compiled markers."""
+        self._compiled.clear()
+
+    def __len__(self) -> int:
+        return len(self._compiled)
+
+
+def evaluate_marker(
+    marker: str | Marker, environment: Mapping[str, str]
+) -> bool | None:
+    """
+    Evaluate ``marker`` (uncached) against a partial ``environment``.
+
+    Parameters
+    ----------
+    marker : str or Marker
+    environment : mapping
+        Values of environment markers (e.g., ``{"python_version": "3.11"}``).
+
+    Returns
+    -------
+    bool or None
+        ``None`` if the result cannot be decided from ``environment``.
+
+    Examples
+    --------
+    >>> evaluate_marker("python_version < '3.11'", {"python_version": "3.10"})
+    True
+    >>> print(evaluate_marker("sys_platform == 'win32'", {"python_version": "3.10"}))
+    None
+    >>> evaluate_marker(
+    ...     "python_version < '3.11' and sys_platform == 'win32'",
+    ...     {"python_version": "3.12"},
+    ... )
+    False
+    """
+    if isinstance(marker, str):
+        marker = Marker(marker)
+    return CompiledMarker(marker).evaluate(environment)
@@ -1,14 +1,28 @@
 """
 Override dependencies (:mod:`~pyproject2conda.overrides`)
 =========================================================
+
+Keys of the ``tool.pyproject2conda.dependencies`` table are matched to
+requirements by canonical name (:pep:`503`), so that ``pytest_accept`` applies
+to ``Pytest-Accept``.  Keys may also be glob patterns (e.g., ``"types-*"``) or
+regular expressions prefixed with ``re:`` (e.g., ``"re:jupyterlab-.*"``),
+matched against the whole canonical name.  Exact keys take precedence over
+patterns, and patterns are tried in the order written.
 """
 
 from __future__ import annotations
 
-from typing import TypedDict
+import re
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, TypedDict
+
+from packaging.utils import canonicalize_name
 
 from ._typing_compat import override
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 
 class OverrideDict(TypedDict, total=False):
     """Dict for storing override options."""
@@ -46,3 +60,112 @@ class OverrideDeps:
     @override
     def __repr__(self) -> str:  # pragma: no cover
         return repr(self.__dict__)
+
+
+_GLOB_CHARS = frozenset("*?[")
+_MISSING = object()
+
+
+def _pattern(key: str) -> str | None:
+    """Regular expression for pattern ``key``, or ``None`` if an exact name."""
+    if key.startswith("re:"):
+        return key[3:]
+    if _GLOB_CHARS.intersection(key):
+        from fnmatch import translate
+
+        return translate(canonicalize_name(key))
+    return None
+
+
+class OverrideIndex(Mapping[str, OverrideDeps]):
+    """
+    Index of overrides, keyed by requirement name.
+
+    Iterates over keys as written.  Lookup (``index[name]``, ``index.get(name)``)
+    accepts any spelling of a requirement name, and falls back to pattern keys.
+    Consecutive glob patterns are compiled to a single regular expression.
+    Each ``re:`` pattern is compiled on its own, so that backreferences and
+    inline flags (e.g., ``(?i)``) apply to that pattern only.  Results are
+    cached per name.
+
+    Parameters
+    ----------
+    overrides : mapping
+        Mapping from key (name or pattern) to :class:`OverrideDeps`.
+    """
+
+    def __init__(self, overrides: Mapping[str, OverrideDeps]) -> None:
+        from itertools import groupby
+
+        self._overrides = dict(overrides)
+        self._exact: dict[str, str] = {}
+        patterns: list[tuple[str, str]] = []
+
+        for key in self._overrides:
+            if (pattern := _pattern(key)) is None:
+                name = canonicalize_name(key)
+                if name in self._exact:
+                    msg = (
+                        f"Duplicate dependencies keys {self._exact[name]!r} and {key!r}"
+                    )
+                    raise ValueError(msg)
+                self._exact[name] = key
+                continue
+
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                msg = f"Invalid pattern {key!r} in dependencies table: {e}"
+                raise ValueError(msg) from e
+            patterns.append((key, pattern))
+
+        # regular expression, and keys by group name of each alternative
+        self._patterns: list[tuple[re.Pattern[str], dict[str, str]]] = []
+        for is_regex, group in groupby(patterns, key=lambda x: x[0].startswith("re:")):
+            if is_regex:
+                self._patterns.extend((re.compile(p), {"": key}) for key, p in group)
+                continue
+            keys: dict[str, str] = {}
+            alternatives: list[str] = []
+            for key, p in group:
+                keys[group_name := f"_p{len(keys)}"] = key
+                alternatives.append(f"(?P<{group_name}>{p})")
+            self._patterns.append((re.compile("|".join(alternatives)), keys))
+        self._keys: dict[str, str | None] = {}
+
+    def key(self, name: str) -> str | None:
+        """Key (as written) of the override for requirement ``name``, if any."""
+        if (out := self._keys.get(name, _MISSING)) is not _MISSING:
+            return out  # type: ignore[return-value]
+
+        canonical = canonicalize_name(name)
+        if (out := self._exact.get(canonical)) is None:
+            for regex, keys in self._patterns:
+                if (match := regex.fullmatch(canonical)) is not None:
+                    # first alternative which matches
+                    out = next(
+                        key
+                        for group, key in keys.items()
+                        if len(keys) == 1 or match.group(group) is not None
+                    )
+                    break
+        self._keys[name] = out
+        return out
+
+    @override
+    def __getitem__(self, name: str) -> OverrideDeps:
+        if (key := self.key(name)) is None:
+            raise KeyError(name)
+        return self._overrides[key]
+
+    @override
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._overrides)
+
+    @override
+    def __len__(self) -> int:
+        return len(self._overrides)
+
+    @override
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"{type(self).__name__}({self._overrides!r})"
@@ -0,0 +1,347 @@
+"""
+Render project outputs (:mod:`~pyproject2conda.project`)
+=========================================================
+
+Python interface to ``pyproject2conda project``.
+
+:func:`render_project` renders the outputs configured in
+``[tool.pyproject2conda]`` in memory, so that callers can use the text
+directly, or write only the outputs they need.  Loaded files are kept for the
+process, and reloaded if they change, so repeated calls reuse the parsed
+project.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .context import ProjectContext
+from .timings import TIMINGS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping, Sequence
+    from typing import Any
+
+    from .cache import DiskCache
+    from .requirements import ParseDepends
+
+
+logger = logging.getLogger(__name__)
+
+CONTEXTS: dict[Path, ProjectContext] = {}
+"""Contexts of ``pyproject.toml`` files loaded in this process, by resolved path."""
+
+
+def get_context(path: str | Path, cache: DiskCache | None = None) -> ProjectContext:
+    """
+    Context for ``pyproject.toml`` file ``path``, shared for the process.
+
+    If any file loaded by the context changed, a new context is returned,
+    which reuses the unchanged files.  A new context parses ``pyproject.toml``
+    with ``cache`` (see :class:`~pyproject2conda.context.ProjectContext`).
+    """
+    path = Path(path).resolve()
+    if (context := CONTEXTS.get(path)) is None:
+        context = ProjectContext(path, cache=cache)
+    elif changed := context.changed():
+        context = context.reload(changed)
+    CONTEXTS[path] = context
+    return context
+
+
+def get_header_cmd(
+    custom_command: str | None,
+    header: bool | None,
+    output: str | Path | None,
+    command: str | None = None,
+) -> str | None:
+    """
+    Command in header of output, or ``None`` for no header.
+
+    If ``header`` is ``None``, only outputs with a path have a header.  The
+    command is ``custom_command`` (if passed), ``"pre-commit"`` if run by
+    pre-commit, or ``command`` (default: the command line of this process).
+    """
+    if custom_command is not None:
+        return custom_command
+
+    if (header is None or header) and ("PRE_COMMIT" in os.environ):
+        return "pre-commit"
+
+    if header is None:
+        header = output is not None
+
+    if not header:
+        return None
+    if command is None:
+        import sys
+
+        command = " ".join([Path(sys.argv[0]).name, *sys.argv[1:]])
+    return command
+
+
+@dataclass(frozen=True)
+class RenderedOutput:
+    """Single output rendered by :func:`render_project`."""
+
+    env: str
+    """Name of environment."""
+    style: str
+    """Style of output (``"yaml"`` or ``"requirements"``)."""
+    output: Path | None
+    """Path of output."""
+    text: str
+    """Rendered output."""
+    options: Mapping[str, Any] = field(repr=False)
+    """Options of output, as from :meth:`~pyproject2conda.config.Config.iter_envs`."""
+
+    @property
+    def empty(self) -> bool:
+        """Whether the environment has no dependencies (only with ``allow_empty``)."""
+        from .requirements import EMPTY_ENVIRONMENT
+
+        return self.text == EMPTY_ENVIRONMENT
+
+    def write(self) -> bool:
+        """
+        Write :attr:`text` to :attr:`output`, if changed.  Returns whether written.
+
+        Like ``project``, empty environments are not written.
+        """
+        from .utils import write_if_changed
+
+        if self.output is None:
+            msg = f"No output for {self.style} of env {self.env}"
+            raise ValueError(msg)
+        if self.empty:
+            return False
+        return write_if_changed(self.output, self.text)
+
+
+def output_fingerprint(
+    parser: ParseDepends, style: str, options: Mapping[str, Any]
+) -> str:
+    """
+    Fingerprint of inputs for single output of ``project``.
+
+    Only the parts of ``pyproject.toml`` used by the environment are included.
+    The resolved ``options`` account for the config (including user config)
+    and python versions (including ``.python-version`` files).
+    """
+    from .manifest import fingerprint
+
+    return fingerprint(
+        [
+            style,
+            parser.env_inputs(
+                extras=options["extras"],
+                groups=options["groups"],
+                extras_or_groups=options["extras_or_groups"],
+                skip_package=options["skip_package"],
+                python_include=options.get("python_include"),
+            ),
+            {k: v for k, v in options.items() if k not in {"overwrite", "verbose"}},
+        ]
+    )
+
+
+# Options which do not change the rendered text
+_RENDER_KEY_EXCLUDE = frozenset({"output", "diff_name"})
+
+
+def render_output(
+    context: ProjectContext,
+    style: str,
+    options: Mapping[str, Any],
+    cache: DiskCache | None = None,
+) -> str:
+    """
+    Render single output of ``project``.
+
+    Parameters
+    ----------
+    context : ProjectContext
+    style : {"yaml", "requirements"}
+    options : mapping
+        Options from :meth:`~pyproject2conda.config.Config.iter_envs`.  A
+        header is added if ``options["header"]`` is true, using
+        ``options["custom_command"]`` as the command.
+    cache : DiskCache, optional
+        Cache of rendered outputs, keyed by :func:`output_fingerprint` (which
+        includes the version of ``pyproject2conda``).  Each entry stores a
+        digest of its key and text, which is checked on read.  Entries which
+        do not match (e.g., corrupt) are removed and rendered again.  Use a
+        directory separate from other caches.
+
+    Returns
+    -------
+    str
+    """
+    if cache is None:
+        return _render_output(context, style, options)
+
+    from .cache import hash_key
+
+    key = hash_key(
+        "render",
+        output_fingerprint(
+            context.parser,
+            style,
+            {k: v for k, v in options.items() if k not in _RENDER_KEY_EXCLUDE},
+        ),
+    )
+    if (data := cache.get(key)) is not None:
+        if (text := _unpack_entry(key, data)) is not None:
+            TIMINGS.count("render-cache-hits")
+            return text
+        logger.warning("Removing invalid cache entry for %s", options.get("output"))
+        cache.delete(key)
+
+    TIMINGS.count("render-cache-misses")
+    text = _render_output(context, style, options)
+    cache.set(key, _pack_entry(key, text))
+    return text
+
+
+def _entry_digest(key: str, text: bytes) -> bytes:
+    import hashlib
+
+    return hashlib.sha256(key.encode() + b"\0" + text).hexdigest().encode()
+
+
+def _pack_entry(key: str, text: str) -> bytes:
+    """Cache entry of rendered ``text``, prefixed by digest of ``key`` and ``text``."""
+    encoded = text.encode()
+    return _entry_digest(key, encoded) + b"\n" + encoded
+
+
+def _unpack_entry(key: str, data: bytes) -> str | None:
+    """Rendered text of cache entry ``data``, or ``None`` if it does not match ``key``."""
+    digest, _, encoded = data.partition(b"\n")
+    if digest != _entry_digest(key, encoded):
+        return None
+    try:
+        return encoded.decode()
+    except UnicodeDecodeError:  # pragma: no cover
+        return None
+
+
+def _render_output(
+    context: ProjectContext, style: str, options: Mapping[str, Any]
+) -> str:
+    parser = context.parser
+    header_cmd = options["custom_command"] if options.get("header") else None
+
+    if style == "yaml":
+        python_include, python_version = context.parse_pythons(
+            options.get("python_include"),
+            options.get("python_version"),
+            options.get("python"),
+        )
+        platform = options.get("platform")
+        return parser.to_conda_yaml(
+            extras=options["extras"],
+            groups=options["groups"],
+            extras_or_groups=options["extras_or_groups"],
+            pip_deps=options["reqs"],
+            conda_deps=options["deps"],
+            name=options["name"],
+            channels=options["channels"] or None,
+            python_include=python_include,
+            python_version=python_version,
+            platform=platform[0] if platform else None,
+            skip_package=options["skip_package"],
+            pip_only=options["pip_only"],
+            header_cmd=header_cmd,
+            sort=options["sort"],
+            remove_whitespace=options["remove_whitespace"],
+            allow_empty=options["allow_empty"],
+        )
+
+    if style == "requirements":
+        return parser.to_requirements(
+            extras=options["extras"],
+            groups=options["groups"],
+            extras_or_groups=options["extras_or_groups"],
+            skip_package=options["skip_package"],
+            header_cmd=header_cmd,
+            sort=options["sort"],
+            pip_deps=options["reqs"],
+            allow_empty=options["allow_empty"],
+            remove_whitespace=options["remove_whitespace"],
+        )
+
+    msg = f"unknown style {style}"
+    raise ValueError(msg)
+
+
+def render_project(
+    path: str | Path = "pyproject.toml",
+    envs: Sequence[str] | None = None,
+    *,
+    user_config: str | Path | None = "infer",
+    dry: bool = True,
+    cache: DiskCache | None = None,
+    **options: Any,
+) -> Iterator[RenderedOutput]:
+    """
+    Render outputs of ``pyproject2conda project``.
+
+    Outputs are rendered lazily, in the same order as ``project``.
+
+    Parameters
+    ----------
+    path : path-like
+        Path to ``pyproject.toml`` file.
+    envs : sequence of str, optional
+        Environments to render.  Default is all environments.
+    user_config : path-like or "infer", optional
+        User config (see :meth:`~pyproject2conda.context.ProjectContext.user_config_path`).
+    dry : bool, default True
+        If ``False``, also write each output (if changed).
+    cache : DiskCache, optional
+        Cache of rendered outputs (see :func:`render_output`).
+    **options
+        Options passed to :meth:`~pyproject2conda.config.Config.iter_envs`
+        (e.g., ``template``, ``platforms``, ``header``, ``custom_command``).
+        By default, outputs with a path include a header with command
+        ``"pyproject2conda project"``.
+
+    Yields
+    ------
+    RenderedOutput
+
+    Examples
+    --------
+    >>> for x in render_project("tests/data/test-pyproject.toml", envs=["test"]):
+    ...     print(x.env, x.style, x.output)
+    test yaml py310-test.yaml
+    test yaml py311-test.yaml
+    """
+    context = get_context(path)
+    config = context.config(user_config)
+
+    for env in envs or list(config.envs):
+        for style, d in config.iter_envs(envs=[env], **options):
+            header_cmd = get_header_cmd(
+                d["custom_command"],
+                d["header"],
+                d["output"],
+                command="pyproject2conda project",
+            )
+            d.update(custom_command=header_cmd, header=header_cmd is not None)
+
+            out = RenderedOutput(
+                env=env,
+                style=style,
+                output=None if d["output"] is None else Path(d["output"]),
+                text=render_output(context, style, d, cache=cache),
+                options=d,
+            )
+            if not dry and out.output is not None:
+                out.write()
+            yield out
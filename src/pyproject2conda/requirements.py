@@ -5,50 +5,327 @@ Requirements parsing (:mod:`~pyproject2conda.requirements`)
 
 from __future__ import annotations
 
-from copy import copy
-from functools import cached_property
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Literal, cast
 
-from packaging.markers import Marker
 from packaging.requirements import InvalidRequirement, Requirement
-from packaging.specifiers import SpecifierSet
+from packaging.utils import canonicalize_name
 
 from pyproject2conda.utils import (
-    MISSING,
     get_in,
     list_to_str,
-    unique_list,
+    write_if_changed,
 )
 from pyproject2conda.utils import (
-    remove_whitespace_list as _remove_whitespace_list,
+    remove_whitespace as _remove_whitespace,
 )
 
-from .overrides import OverrideDeps
+from ._typing_compat import override
+from .dependencies import DependencySet
+from .markers import MarkerEvaluator, marker_environment
+from .overrides import OverrideDeps, OverrideIndex
+from .timings import TIMINGS
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable, Sequence
-    from typing import Any
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+    from typing import Any, TypeVar
+
+    from packaging.markers import Marker
 
-    from ._typing import (
-        MISSING_TYPE,
-    )
     from ._typing_compat import Self
+    from .cache import DiskCache
+    from .graph import DependencyGraph
+
+    _R = TypeVar("_R")
+
+
+logger = logging.getLogger(__name__)
+
+
+# * Requirement records ----------------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class RequirementRecord:
+    """
+    Compact, immutable requirement.
+
+    Used internally in place of :class:`~packaging.requirements.Requirement`,
+    which is mutable (so must be copied to derive a new requirement), and
+    larger (it holds a parsed :class:`~packaging.specifiers.SpecifierSet`).
+    The string form is computed once, on creation.  Records are converted to
+    :class:`~packaging.requirements.Requirement` only by the public interface
+    (e.g., :attr:`ParseDepends.requirements_extras`).
+
+    Parameters
+    ----------
+    name : str
+        Name (as written).
+    canonical_name : str
+        Normalized name (:pep:`503`).
+    channel : str, optional
+        Conda channel.  Written as ``channel::name``.
+    extras : tuple of str
+        Sorted extras.
+    specifier : str
+        Version specifier.
+    url : str, optional
+        Direct reference.
+    marker : Marker, optional
+        Environment marker.
+    """
+
+    name: str
+    canonical_name: str
+    channel: str | None = None
+    extras: tuple[str, ...] = ()
+    specifier: str = ""
+    url: str | None = None
+    marker: Marker | None = None
+    string: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "string", self._format())
+
+    def _format(self) -> str:
+        # same format as packaging.requirements.Requirement
+        parts = [f"{self.channel}::{self.name}" if self.channel else self.name]
+        if self.extras:
+            parts.append(f"[{','.join(self.extras)}]")
+        parts.append(self.specifier)
+        if self.url:
+            parts.append(f" @ {self.url}")
+            if self.marker:
+                parts.append(" ")
+        if self.marker:
+            parts.append(f"; {self.marker}")
+        return "".join(parts)
+
+    @override
+    def __str__(self) -> str:
+        return self.string
+
+    @classmethod
+    def from_requirement(cls, requirement: Requirement) -> Self:
+        """Create from :class:`~packaging.requirements.Requirement`."""
+        return cls(
+            name=requirement.name,
+            canonical_name=canonicalize_name(requirement.name),
+            extras=tuple(sorted(requirement.extras)),
+            specifier=str(requirement.specifier),
+            url=requirement.url,
+            marker=requirement.marker,
+        )
+
+    def to_fields(self) -> list[Any]:
+        """Fields as json-compatible list (see :meth:`from_fields`)."""
+        return [
+            self.name,
+            self.canonical_name,
+            list(self.extras),
+            self.specifier,
+            None if self.marker is None else str(self.marker),
+            self.url,
+        ]
+
+    @classmethod
+    def from_fields(cls, fields: Sequence[Any]) -> Self:
+        """
+        Create from :meth:`to_fields`, without parsing a requirement string.
+
+        Only the marker (if any) is parsed, once per distinct marker.
+        """
+        name, canonical_name, extras, specifier, marker, url = fields
+        if not (
+            isinstance(name, str)
+            and isinstance(canonical_name, str)
+            and isinstance(specifier, str)
+            and isinstance(extras, list)
+            and all(isinstance(x, str) for x in extras)
+            and isinstance(marker, (str, type(None)))
+            and isinstance(url, (str, type(None)))
+        ):
+            msg = f"Invalid requirement fields {fields!r}"
+            raise TypeError(msg)
+        return cls(
+            name=name,
+            canonical_name=canonical_name,
+            extras=tuple(extras),
+            specifier=specifier,
+            url=url,
+            marker=None if marker is None else _load_marker(marker),
+        )
+
+    def to_requirement(self) -> Requirement:
+        """Convert to :class:`~packaging.requirements.Requirement`."""
+        if self.channel:
+            msg = f"Cannot convert {self.string!r}, which has a channel, to Requirement"
+            raise ValueError(msg)
+        return Requirement(self.string)
+
+    def without_marker(self) -> Self:
+        """Record with marker removed."""
+        return replace(self, marker=None) if self.marker else self
+
+    def without_extras(self) -> Self:
+        """Record with extras removed."""
+        return replace(self, extras=()) if self.extras else self
+
+    def with_channel(self, channel: str | None) -> Self:
+        """Record with conda ``channel``."""
+        return self if channel == self.channel else replace(self, channel=channel)
+
+
+@lru_cache(maxsize=4096)
+def _load_marker(marker: str) -> Marker:
+    from packaging.markers import Marker
+
+    return Marker(marker)
+
+
+# * Requirement pool -------------------------------------------------------------------
+class RequirementPool:
+    """
+    Intern pool of parsed requirements.
+
+    Maps requirement strings to a single :class:`RequirementRecord`, so that
+    each distinct string is parsed once, no matter how many extras, groups,
+    overrides, or environments it appears in.  Lookups are counted by
+    :data:`~pyproject2conda.timings.TIMINGS` as ``requirement-pool-hits`` and
+    ``requirement-pool-misses`` (the latter equal to ``requirement-parses``).
+    Requirements parsed by an earlier process can be added with
+    :meth:`preload` (counted as ``requirement-pool-preloaded``).
+
+    Parameters
+    ----------
+    maxsize : int
+        The pool is cleared if it grows past ``maxsize`` entries.  This bounds
+        memory of long running processes (e.g., ``pyproject2conda watch``).
+    """
+
+    def __init__(self, maxsize: int = 65536) -> None:
+        self.maxsize = maxsize
+        self._requirements: dict[str, RequirementRecord] = {}
+        self._conda_records: dict[tuple[str, str | None], RequirementRecord] = {}
+        self._clean_strings: dict[str, str] = {}
+        # fields of requirements from preload, converted on first use
+        self._preloaded: dict[str, Sequence[Any]] = {}
+        self.markers = MarkerEvaluator()
+        """Compiled markers of pooled requirements."""
+
+    def get(self, requirement: str) -> RequirementRecord:
+        """
+        Parsed ``requirement``.
+
+        Invalid requirement strings raise
+        :class:`~packaging.requirements.InvalidRequirement`, and are not stored.
+        """
+        if (out := self._requirements.get(requirement)) is not None:
+            TIMINGS.count("requirement-pool-hits")
+            return out
+
+        out = None
+        if (fields := self._preloaded.pop(requirement, None)) is not None:
+            try:
+                out = RequirementRecord.from_fields(fields)
+            except (TypeError, ValueError):
+                # invalid marker: parse the string instead
+                out = None
+            else:
+                TIMINGS.count("requirement-pool-preloaded")
+
+        if out is None:
+            TIMINGS.count("requirement-pool-misses")
+            TIMINGS.count("requirement-parses")
+            out = RequirementRecord.from_requirement(Requirement(requirement))
+        if len(self._requirements) >= self.maxsize:
+            self.clear()
+        self._requirements[requirement] = out
+        return out
+
+    def preload(self, fields: Mapping[str, Sequence[Any]]) -> None:
+        """
+        Add requirements from mapping of string to :meth:`RequirementRecord.to_fields`.
+
+        Records are created on first lookup with :meth:`get`, so preloading
+        requirements which are not used is cheap.
+        """
+        if len(self._preloaded) + len(fields) > self.maxsize:
+            self._preloaded.clear()
+        self._preloaded.update(fields)
+
+    def conda_record(
+        self, record: RequirementRecord, channel: str | None = None
+    ) -> RequirementRecord:
+        """Conda form of ``record`` (no marker or extras, optional ``channel``)."""
+        key = (record.string, channel)
+        if (out := self._conda_records.get(key)) is None:
+            out = self._conda_records[key] = (
+                record.without_marker().without_extras().with_channel(channel)
+            )
+        return out
+
+    def string(
+        self, record: RequirementRecord | str, remove_whitespace: bool = False
+    ) -> str:
+        """String form of ``record``, optionally without whitespace."""
+        string = record if isinstance(record, str) else record.string
+        if not remove_whitespace:
+            return string
+        if (out := self._clean_strings.get(string)) is None:
+            out = self._clean_strings[string] = _remove_whitespace(string)
+        return out
+
+    def conda_string(
+        self,
+        record: RequirementRecord,
+        channel: str | None = None,
+        remove_whitespace: bool = False,
+    ) -> str:
+        """String of :meth:`conda_record`."""
+        return self.string(self.conda_record(record, channel), remove_whitespace)
+
+    def clear(self) -> None:
+        """Remove all requirements from the pool."""
+        self._requirements.clear()
+        self._conda_records.clear()
+        self._clean_strings.clear()
+        self._preloaded.clear()
+        self.markers.clear()
+
+    def __len__(self) -> int:
+        return len(self._requirements)
+
+    @override
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} size={len(self)}>"
+
+
+REQUIREMENT_POOL = RequirementPool()
+"""Instance of :class:`RequirementPool` used by ``pyproject2conda``."""
 
 
 # * Utilities --------------------------------------------------------------------------
+_parse_requirement = REQUIREMENT_POOL.get
+
+
+EMPTY_ENVIRONMENT = "No dependencies for this environment\n"
+"""Returned instead of an output for an environment without dependencies."""
+
+
 def _check_allow_empty(allow_empty: bool) -> str:
-    msg = "No dependencies for this environment\n"
     if allow_empty:
-        return msg
-    raise ValueError(msg)
+        return EMPTY_ENVIRONMENT
+    raise ValueError(EMPTY_ENVIRONMENT)
 
 
-def _clean_pip_reqs(reqs: list[str]) -> list[str]:
-    out: list[str] = []
+def _clean_pip_reqs(reqs: Iterable[str]) -> list[RequirementRecord | str]:
+    out: list[RequirementRecord | str] = []
     for req in reqs:
         try:
-            r = str(Requirement(req))
+            r: RequirementRecord | str = _parse_requirement(req)
         except InvalidRequirement:
             # trust that user knows what they're doing
             r = req
@@ -57,84 +334,96 @@ def _clean_pip_reqs(reqs: list[str]) -> list[str]:
     return out
 
 
-def _clean_conda_requirement(
-    requirement: Requirement,
-    python_version: str | None = None,
-    channel: str | None = None,
-) -> Requirement | None:
-    if (
-        python_version
-        and requirement.marker
-        and (not requirement.marker.evaluate({"python_version": python_version}))
-    ):
-        return None
-
-    requirement = _update_requirement(requirement, marker=None, extras=None)
-    if channel:
-        requirement.name = f"{channel}::{requirement.name}"
-    return requirement
-
-
-def _clean_conda_strings(
-    deps: list[str], python_version: str | None = None
+def _finalize_requirements(
+    values: Iterable[RequirementRecord | str],
+    remove_whitespace: bool = True,
+    unique: bool = True,
+    sort: bool = True,
+    markers: Iterable[Marker | None] | None = None,
 ) -> list[str]:
-    out: list[str] = []
-    for dep in deps:
-        # if have a channel, take it out
-        if "::" in dep:
-            channel, d = dep.split("::")
-        else:
-            channel, d = None, dep
+    """
+    Strings of requirements.
 
-        r = _clean_conda_requirement(
-            Requirement(d), python_version=python_version, channel=channel
-        )
-        if r is not None:
-            out.append(str(r))
+    If ``unique``, requirements on the same package are merged (see
+    :class:`~pyproject2conda.dependencies.DependencySet`).  ``markers`` are
+    the undecided markers (if any) of each of ``values``.
+    """
+    if unique:
+        if markers is None:
+            values = DependencySet(values)
+        else:
+            merged = DependencySet()
+            for value, marker in zip(values, markers, strict=True):
+                merged.add(value, marker)
+            values = merged
+    out = [REQUIREMENT_POOL.string(x, remove_whitespace) for x in values]
+    if sort:
+        out.sort()
     return out
 
 
-def _update_requirement(  # noqa: C901
-    requirement: str | Requirement,
-    name: str | MISSING_TYPE = MISSING,
-    url: str | MISSING_TYPE | None = MISSING,
-    extras: str | Iterable[str] | MISSING_TYPE | None = MISSING,
-    specifier: str | SpecifierSet | MISSING_TYPE | None = MISSING,
-    marker: str | Marker | MISSING_TYPE | None = MISSING,
-) -> Requirement:  # pragma: no cover
-    req = (
-        Requirement(requirement) if isinstance(requirement, str) else copy(requirement)
-    )
-
-    if name is not MISSING:
-        req.name = name
-
-    if url is not MISSING:
-        req.url = url
+def _keep_marker(
+    record: RequirementRecord, environment: Mapping[str, str]
+) -> bool | None:
+    """
+    Whether to keep ``record``, which has a marker, for ``environment``.
 
-    if extras is not MISSING:
-        if extras is None:
-            extras = set()
-        elif isinstance(extras, str):
-            extras = {extras}
-        else:
-            extras = set(extras)
-        req.extras = extras
+    Returns ``None`` if the marker cannot be decided (the requirement is kept).
+    """
+    if not environment:
+        return None
+    keep = REQUIREMENT_POOL.markers.evaluate(cast("Marker", record.marker), environment)
+    if keep is None:
+        logger.info(
+            "Cannot decide marker of %s for environment %s.  Including it.",
+            record.string,
+            dict(environment),
+        )
+    return keep
+
+
+def _decide_markers(
+    base_conda: Sequence[tuple[RequirementRecord, RequirementRecord | None]],
+    environment: Mapping[str, str],
+) -> tuple[frozenset[int], frozenset[int]]:
+    """Indices of conda requirements dropped, and undecided, for ``environment``."""
+    keep = {
+        i: _keep_marker(record, environment)
+        for i, (_, record) in enumerate(base_conda)
+        if record is not None
+    }
+    return (
+        frozenset(i for i, k in keep.items() if k is False),
+        frozenset(i for i, k in keep.items() if k is None),
+    )
 
-    if specifier is not MISSING:
-        if specifier is None:
-            specifier = SpecifierSet()
-        elif isinstance(specifier, str):
-            specifier = SpecifierSet(specifier)
-        req.specifier = specifier
 
-    if marker is not MISSING:
-        if isinstance(marker, str):
-            marker = Marker(marker)
+def _apply_markers(
+    base_conda: Sequence[tuple[RequirementRecord, RequirementRecord | None]],
+    dropped: frozenset[int],
+    undecided: frozenset[int],
+    **kwargs: Any,
+) -> ResolvedDependencies:
+    """Resolved dependencies without ``dropped`` conda requirements."""
+    kept = [(i, x) for i, x in enumerate(base_conda) if i not in dropped]
+    return ResolvedDependencies(
+        conda=[dep for _, (dep, _) in kept],
+        conda_markers=[
+            record.marker if i in undecided and record is not None else None
+            for i, (_, record) in kept
+        ]
+        if undecided
+        else None,
+        **kwargs,
+    )
 
-        req.marker = marker
 
-    return req
+def _split_channel(dep: str) -> tuple[str | None, str]:
+    # if have a channel, take it out
+    if "::" in dep:
+        channel, d = dep.split("::")
+        return channel, d
+    return None, dep
 
 
 # ** Dependencices
@@ -145,39 +434,15 @@ def resolve_extras(
     unresolved: dict[str, list[Requirement]],
 ) -> list[Requirement]:
     """Resolve extras"""
+    from .graph import DependencyGraph
+
     if isinstance(extras, str):
         extras = [extras]
 
+    graph = DependencyGraph(package_name, extras=unresolved)
     out: list[Requirement] = []
     for extra in extras:
-        for requirement in unresolved[extra]:
-            if requirement.name == package_name:
-                out.extend(
-                    resolve_extras(
-                        extras=requirement.extras,
-                        package_name=package_name,
-                        unresolved=unresolved,
-                    )
-                )
-            else:
-                out.append(requirement)
-    return out
-
-
-def resolve_group(
-    requirements: list[Requirement],
-    package_name: str,
-    extras: dict[str, list[Requirement]],
-) -> list[Requirement]:
-    """Resolve project.name[extra] in a group"""
-    out: list[Requirement] = []
-    for requirement in requirements:
-        if requirement.name == package_name:
-            for extra in requirement.extras:
-                out.extend(extras[extra])
-        else:
-            out.append(requirement)
-
+        out.extend(cast("list[Requirement]", graph.resolve(graph.node("extra", extra))))
     return out
 
 
@@ -267,18 +532,162 @@ def _add_header(string: str, header_cmd: str | None) -> str:
 def _optional_write(
     string: str,
     output: str | Path | None,
-    mode: str = "w",  # force: bool = False,
 ) -> None:
     if output is None:
         return
 
-    path = Path(output)
+    _ = write_if_changed(output, string)
 
-    with path.open(mode) as f:
-        _ = f.write(string)
+
+# * Resolved environments --------------------------------------------------------------
+class ResolvedDependencies:
+    """
+    Dependencies of an environment, resolved for a python version and platform.
+
+    Created by :meth:`ParseDepends.resolve`.  Each output style (conda yaml,
+    requirements, conda/pip requirements, json) renders from this, so several
+    outputs of an environment share a single resolution.  Rendered lists are
+    cached.
+
+    Parameters
+    ----------
+    requirements : sequence of RequirementRecord or str
+        All requirements, including extra pip requirements.  Used for
+        ``requirements.txt``.
+    conda : sequence of RequirementRecord or str
+        Conda requirements, after applying overrides and markers.
+    pip : sequence of RequirementRecord or str
+        Pip requirements of the conda environment.
+    python_include : str, optional
+        Python requirement prepended to conda requirements.
+    conda_markers : sequence of Marker or None, optional
+        Marker of each of ``conda`` which could not be decided (and so was
+        not applied), or ``None``.  Such requirements are not merged with
+        other requirements on the same package (e.g., pins split across
+        python versions).
+    """
+
+    def __init__(
+        self,
+        requirements: Sequence[RequirementRecord | str],
+        conda: Sequence[RequirementRecord | str] = (),
+        pip: Sequence[RequirementRecord | str] = (),
+        python_include: str | None = None,
+        conda_markers: Sequence[Marker | None] | None = None,
+    ) -> None:
+        self.requirements = requirements
+        self.conda = conda
+        self.pip = pip
+        self.python_include = python_include
+        self.conda_markers = conda_markers
+        self._rendered: dict[tuple[Any, ...], Any] = {}
+
+    def pip_requirements(
+        self, *, unique: bool = True, remove_whitespace: bool = True, sort: bool = True
+    ) -> list[str]:
+        """All requirements, as strings (see :meth:`ParseDepends.pip_requirements`)."""
+        key = ("requirements", unique, remove_whitespace, sort)
+        if (out := self._rendered.get(key)) is None:
+            out = self._rendered[key] = _finalize_requirements(
+                self.requirements,
+                remove_whitespace=remove_whitespace,
+                unique=unique,
+                sort=sort,
+            )
+        return list(out)
+
+    def conda_and_pip_requirements(
+        self, *, unique: bool = True, remove_whitespace: bool = True, sort: bool = True
+    ) -> tuple[list[str], list[str]]:
+        """Conda and pip requirements, as strings (see :meth:`ParseDepends.conda_and_pip_requirements`)."""
+        key = ("conda", unique, remove_whitespace, sort)
+        if (out := self._rendered.get(key)) is None:
+            conda = _finalize_requirements(
+                self.conda,
+                remove_whitespace=remove_whitespace,
+                unique=unique,
+                sort=sort,
+                markers=self.conda_markers,
+            )
+            pip = _finalize_requirements(
+                self.pip, remove_whitespace=remove_whitespace, unique=unique, sort=sort
+            )
+
+            if (python_include := self.python_include) is not None:
+                if remove_whitespace:
+                    python_include = _remove_whitespace(python_include)
+                conda.insert(0, python_include)
+
+            # special if have pip requirements or just pip in conda_deps
+            # in this case, make sure pip is last
+            if "pip" in conda:
+                conda.remove("pip")
+                conda.append("pip")
+            elif pip:
+                conda.append("pip")
+
+            out = self._rendered[key] = (conda, pip)
+        return list(out[0]), list(out[1])
+
+    @override
+    def __repr__(self) -> str:  # pragma: no cover
+        return (
+            f"<{type(self).__name__} requirements={len(self.requirements)} "
+            f"conda={len(self.conda)} pip={len(self.pip)}>"
+        )
+
+
+def _deps_tuple(deps: str | Iterable[str] | None) -> tuple[str, ...]:
+    if deps is None:
+        return ()
+    if isinstance(deps, str):
+        return (deps,)
+    return tuple(deps)
+
+
+def _cache_set(
+    cache: dict[tuple[Any, ...], _R], key: tuple[Any, ...], value: _R, maxsize: int
+) -> _R:
+    """Set ``cache[key] = value``, dropping the oldest entry if ``cache`` is full."""
+    if len(cache) >= maxsize:
+        del cache[next(iter(cache))]
+    cache[key] = value
+    return value
 
 
 # * Main class
+class _LazyRequirements(Mapping[str, "list[_R]"]):
+    """Mapping from extra (or group) name to requirements, resolved on access."""
+
+    def __init__(
+        self, kind: str, names: Iterable[str], resolve: Callable[[str], list[_R]]
+    ) -> None:
+        self._kind = kind
+        self._names = dict.fromkeys(names)
+        self._resolve = resolve
+        self._resolved: dict[str, list[_R]] = {}
+
+    def __getitem__(self, key: str) -> list[_R]:
+        if (out := self._resolved.get(key)) is not None:
+            return out
+        if key not in self._names:
+            raise KeyError(key)
+
+        with TIMINGS.phase("resolve"):
+            out = self._resolved[key] = self._resolve(key)
+        return out
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @override
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self._kind}s={list(self._names)}>"
+
+
 class ParseDepends:
     """
     Parse pyproject.toml file for dependencies
@@ -288,8 +697,24 @@ class ParseDepends:
     data : dict
     """
 
+    _conda_and_pip_base_cache_size: int = 4
+    """Number of environments cached by :meth:`_conda_and_pip_base`."""
+
+    _resolved_cache_size: int = 16
+    """Number of environments cached by :meth:`resolve`."""
+
     def __init__(self, data: dict[str, Any]) -> None:
         self.data = data
+        self._conda_and_pip_base_cache: dict[
+            tuple[Any, ...],
+            tuple[
+                list[tuple[RequirementRecord, RequirementRecord | None]],
+                list[RequirementRecord | str],
+            ],
+        ] = {}
+        self._resolved_cache: dict[tuple[Any, ...], ResolvedDependencies] = {}
+        # Latest resolution by requirements only, for python independent outputs
+        self._resolved_requirements: dict[tuple[Any, ...], ResolvedDependencies] = {}
 
     def get_in(
         self, *keys: str, default: Any = None, factory: Callable[[], Any] | None = None
@@ -355,17 +780,22 @@ class ParseDepends:
         )
 
     @cached_property
-    def override_table(self) -> dict[str, OverrideDeps]:
+    def override_table(self) -> OverrideIndex:
         """
         tool.pyproject2conda.dependencies
 
-        Mapping from requirement name to OverrideDeps instance
-
+        Mapping from requirement name (or pattern) to OverrideDeps instance.
+        Lookup matches canonical names and patterns (see
+        :class:`~pyproject2conda.overrides.OverrideIndex`).
         """
-        if out := self.get_in("tool", "pyproject2conda", "dependencies", factory=dict):
-            out = {k: OverrideDeps(**v) for k, v in out.items()}
-        # pyrefly: ignore [unbound-name]
-        return cast("dict[str, OverrideDeps]", out)
+        return OverrideIndex(
+            {
+                k: OverrideDeps(**v)
+                for k, v in self.get_in(
+                    "tool", "pyproject2conda", "dependencies", factory=dict
+                ).items()
+            }
+        )
 
     @cached_property
     def channels(self) -> list[str]:
@@ -386,56 +816,76 @@ class ParseDepends:
         """Available groups"""
         return [*self.dependency_groups, "build-system.requires"]
 
+    @cached_property
+    def _records_base(self) -> list[RequirementRecord]:
+        return [_parse_requirement(x) for x in self.dependencies]
+
     @cached_property
     def requirements_base(self) -> list[Requirement]:
         """Base requirements"""
-        return [Requirement(x) for x in self.dependencies]
+        return [r.to_requirement() for r in self._records_base]
 
     @cached_property
-    def requirements_extras(self) -> dict[str, list[Requirement]]:
-        """Extras requirements"""
-        unresolved: dict[str, list[Requirement]] = {
-            k: [Requirement(x) for x in v]
-            for k, v in self.optional_dependencies.items()
-        }
+    def graph(self) -> DependencyGraph:
+        """Graph of extras and groups, including references between them."""
+        from .graph import DependencyGraph
+
+        return DependencyGraph(
+            self.package_name,
+            extras=self.optional_dependencies,
+            groups=self.dependency_groups,
+            parse=_parse_requirement,
+        )
 
-        resolved = {
-            extra: resolve_extras(
-                extras=extra, package_name=self.package_name, unresolved=unresolved
-            )
-            for extra in unresolved
-        }
+    def _lazy_records(
+        self, kind: Literal["extra", "group"]
+    ) -> Mapping[str, list[RequirementRecord]]:
+        graph = self.graph
 
-        # add in build-system.requires
-        resolved["build-system.requires"] = [
-            Requirement(x) for x in self.build_system_requires
-        ]
+        def resolve(key: str) -> list[RequirementRecord]:
+            if key == "build-system.requires":
+                return [_parse_requirement(x) for x in self.build_system_requires]
+            return cast("list[RequirementRecord]", graph.resolve(graph.node(kind, key)))
 
-        return resolved
+        return _LazyRequirements(
+            kind, (*graph.names(kind), "build-system.requires"), resolve
+        )
 
     @cached_property
-    def requirements_groups(self) -> dict[str, list[Requirement]]:
-        """Groups requirements"""
-        from dependency_groups import resolve
+    def _records_extras(self) -> Mapping[str, list[RequirementRecord]]:
+        return self._lazy_records("extra")
 
-        unresolved: dict[str, list[Requirement]] = {
-            group: [Requirement(x) for x in resolve(self.dependency_groups, group)]
-            for group in self.dependency_groups
-        }
+    @cached_property
+    def _records_groups(self) -> Mapping[str, list[RequirementRecord]]:
+        return self._lazy_records("group")
 
-        resolved = {
-            group: resolve_group(
-                requirements, self.package_name, self.requirements_extras
-            )
-            for group, requirements in unresolved.items()
-        }
+    @staticmethod
+    def _lazy_requirements(
+        kind: str, records: Mapping[str, list[RequirementRecord]]
+    ) -> Mapping[str, list[Requirement]]:
+        return _LazyRequirements(
+            kind, records, lambda key: [r.to_requirement() for r in records[key]]
+        )
 
-        # add in build-system.requires
-        resolved["build-system.requires"] = [
-            Requirement(x) for x in self.build_system_requires
-        ]
+    @cached_property
+    def requirements_extras(self) -> Mapping[str, list[Requirement]]:
+        """
+        Extras requirements
 
-        return resolved
+        Each extra is resolved (along with any extras it references) on first
+        access.
+        """
+        return self._lazy_requirements("extra", self._records_extras)
+
+    @cached_property
+    def requirements_groups(self) -> Mapping[str, list[Requirement]]:
+        """
+        Groups requirements
+
+        Each group is resolved (along with any groups or extras it references)
+        on first access.
+        """
+        return self._lazy_requirements("group", self._records_groups)
 
     @staticmethod
     def _check_prop(vals: str | Iterable[str] | None, keys: list[str]) -> list[str]:
@@ -479,44 +929,108 @@ class ParseDepends:
 
         return extras, groups
 
-    @staticmethod
-    def _cleanup(
-        values: list[str],
-        remove_whitespace: bool = True,
-        unique: bool = True,
-        sort: bool = True,
-    ) -> list[str]:
-        if remove_whitespace:
-            values = _remove_whitespace_list(values)
+    def env_inputs(
+        self,
+        *,
+        extras: str | Iterable[str] | None = None,
+        groups: str | Iterable[str] | None = None,
+        extras_or_groups: str | Iterable[str] | None = None,
+        skip_package: bool = False,
+        python_include: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Subset of ``pyproject.toml`` that affects the requirements of an environment.
+
+        This includes the selected extras and groups, along with any extras
+        (referenced with ``package[extra]``) and groups (referenced with
+        ``{include-group = ...}``) they include, ``project.dependencies`` (unless
+        ``skip_package``), and entries of ``tool.pyproject2conda.dependencies``
+        which apply to any of these requirements.  Use this to fingerprint an
+        environment, so that unrelated edits to ``pyproject.toml`` do not affect
+        it.
+        """
+        extras, groups = self._resolve_extras_and_groups(
+            extras, groups, extras_or_groups
+        )
+        package_name = self.get_in("project", "name")
+        build_system = "build-system.requires" in {*extras, *groups}
+
+        override_table = self.override_table
+        used: set[str | None] = set()
+        if not skip_package:
+            used |= self._dependencies_override_keys
+        if build_system:
+            used |= self._build_system_override_keys
+
+        names: set[str] = set()
+        graph = self.graph
+        roots = [
+            *(graph.node("extra", x) for x in extras if x != "build-system.requires"),
+            *(graph.node("group", x) for x in groups if x != "build-system.requires"),
+        ]
+        selected: dict[str, dict[str, Any]] = {"extra": {}, "group": {}}
+        for node in graph.topological_order(roots):
+            name, raw = graph.raw(node)
+            selected[node[0]][name] = raw
+            names.update(
+                item.name for item in graph.items(node) if not isinstance(item, tuple)
+            )
+
+        used.update(override_table.key(name) for name in names)
+        return {
+            "name": package_name,
+            "dependencies": None if skip_package else self.dependencies,
+            "optional-dependencies": selected["extra"],
+            "dependency-groups": selected["group"],
+            "build-system.requires": self.build_system_requires
+            if build_system
+            else None,
+            "overrides": {
+                k: v
+                for k, v in self.get_in(
+                    "tool", "pyproject2conda", "dependencies", factory=dict
+                ).items()
+                if k in used
+            },
+            "channels": self.channels,
+            "requires-python": self.get_in("project", "requires-python")
+            if python_include == "infer"
+            else None,
+        }
 
-        if unique:  # pragma: no cover
-            values = unique_list(values)
+    def _override_keys(self, requirements: Iterable[str]) -> set[str | None]:
+        """Keys of :attr:`override_table` matching ``requirements``."""
+        override_table = self.override_table
+        return {override_table.key(_parse_requirement(x).name) for x in requirements}
 
-        if sort:
-            values = sorted(values)
+    @cached_property
+    def _dependencies_override_keys(self) -> set[str | None]:
+        return self._override_keys(self.dependencies)
 
-        return values
+    @cached_property
+    def _build_system_override_keys(self) -> set[str | None]:
+        return self._override_keys(self.build_system_requires)
 
     def _get_requirements(
         self,
         extras: Iterable[str],
         groups: Iterable[str],
         skip_package: bool = False,
-    ) -> list[Requirement]:
-        out: list[Requirement] = []
+    ) -> list[RequirementRecord]:
+        out: list[RequirementRecord] = []
 
         if not skip_package:
-            out.extend(self.requirements_base)
+            out.extend(self._records_base)
 
         def _extend_extra_or_group(
             extras: Iterable[str],
-            requirements_mapping: dict[str, list[Requirement]],
+            requirements_mapping: Mapping[str, list[RequirementRecord]],
         ) -> None:
             for extra in extras:
                 out.extend(requirements_mapping[extra])
 
-        _extend_extra_or_group(extras, self.requirements_extras)
-        _extend_extra_or_group(groups, self.requirements_groups)
+        _extend_extra_or_group(extras, self._records_extras)
+        _extend_extra_or_group(groups, self._records_groups)
 
         return out
 
@@ -536,26 +1050,102 @@ class ParseDepends:
         extras, groups = self._resolve_extras_and_groups(
             extras, groups, extras_or_groups
         )
-
-        out: list[str] = [
-            str(requirement)
-            for requirement in self._get_requirements(
+        key = (tuple(extras), tuple(groups), skip_package, _deps_tuple(pip_deps))
+        if (resolved := self._resolved_requirements.get(key)) is None:
+            resolved = self.resolve(
                 extras=extras,
                 groups=groups,
                 skip_package=skip_package,
+                pip_deps=pip_deps,
             )
-        ]
 
-        if pip_deps:
-            pip_deps = [pip_deps] if isinstance(pip_deps, str) else list(pip_deps)
-            out.extend(_clean_pip_reqs(pip_deps))  # ty: ignore[invalid-argument-type]
+        return resolved.pip_requirements(
+            remove_whitespace=remove_whitespace, unique=unique, sort=sort
+        )
+
+    def _conda_and_pip_base(
+        self,
+        *,
+        extras: list[str],
+        groups: list[str],
+        skip_package: bool,
+        pip_only: bool,
+        pip_deps: tuple[str, ...],
+        conda_deps: tuple[str, ...],
+    ) -> tuple[
+        list[tuple[RequirementRecord, RequirementRecord | None]],
+        list[RequirementRecord | str],
+    ]:
+        """
+        Python and platform independent part of :meth:`conda_and_pip_requirements`.
 
-        return self._cleanup(
-            out, remove_whitespace=remove_whitespace, unique=unique, sort=sort
+        Returns conda requirements as pairs ``(conda_record, record)``, where
+        ``record`` is set only if its marker must be checked, and pip
+        requirements.  Requirements are not merged.  The most recent results are cached, so that rendering
+        an environment for several python versions and platforms resolves it
+        once.
+        """
+        key = (
+            tuple(extras),
+            tuple(groups),
+            skip_package,
+            pip_only,
+            pip_deps,
+            conda_deps,
         )
+        if (cached := self._conda_and_pip_base_cache.get(key)) is not None:
+            return cached
+
+        pip = _clean_pip_reqs(pip_deps)
+        conda: list[tuple[RequirementRecord, str | None]] = []
+
+        def _extend_conda_strings(deps: Iterable[str]) -> None:
+            for dep in deps:
+                channel, d = _split_channel(dep)
+                conda.append((_parse_requirement(d), channel))
 
-    def conda_and_pip_requirements(  # noqa: C901, PLR0912
+        _extend_conda_strings(conda_deps)
+
+        override_table = self.override_table
+        for record in self._get_requirements(
+            extras=extras,
+            groups=groups,
+            skip_package=skip_package,
+        ):
+            if pip_only and record.name != "python":
+                pip.append(record)
+
+            elif (override := override_table.get(record.name)) is not None:
+                if override.pip:
+                    pip.append(record)
+
+                elif not override.skip:
+                    conda.append((record, override.channel))
+
+                _extend_conda_strings(override.packages)
+            else:
+                conda.append((record, None))
+
+        out = (
+            [
+                (
+                    REQUIREMENT_POOL.conda_record(record, channel),
+                    record if record.marker else None,
+                )
+                for record, channel in conda
+            ],
+            pip,
+        )
+        cache = self._conda_and_pip_base_cache
+        if len(cache) >= self._conda_and_pip_base_cache_size:
+            del cache[next(iter(cache))]
+        cache[key] = out
+        return out
+
+    def resolve_matrix(
         self,
+        python_versions: Iterable[str | None] = (None,),
+        platforms: Iterable[str | None] = (None,),
         *,
         extras: str | Iterable[str] | None = None,
         groups: str | Iterable[str] | None = None,
@@ -564,24 +1154,38 @@ class ParseDepends:
         pip_only: bool = False,
         pip_deps: str | Iterable[str] | None = None,
         conda_deps: str | Iterable[str] | None = None,
-        unique: bool = True,
-        remove_whitespace: bool = True,
-        sort: bool = True,
-        python_version: str | None = None,
         python_include: str | None = None,
-    ) -> tuple[list[str], list[str]]:
-        """Conda and pip requirements."""
-
-        def _init_deps(deps: str | Iterable[str] | None) -> list[str]:
-            if deps is None:
-                return []
-            if isinstance(deps, str):
-                return [deps]
-            return list(deps)
-
+    ) -> dict[tuple[str | None, str | None], ResolvedDependencies]:
+        """
+        Resolved dependencies for several python versions and platforms.
+
+        The environment is resolved once.  Only requirements with markers are
+        checked for each combination of python version and platform.
+        Combinations which keep the same requirements share a single
+        :class:`ResolvedDependencies`.
+
+        Parameters
+        ----------
+        python_versions : iterable of str or None
+            Python versions (see ``python_version`` of
+            :meth:`conda_and_pip_requirements`).  ``None`` means no filtering by
+            python version.
+        platforms : iterable of str or None
+            Conda platforms (see ``platform`` of
+            :meth:`conda_and_pip_requirements`).  ``None`` means no filtering by
+            platform.
+
+        Other parameters are the same as for :meth:`conda_and_pip_requirements`.
+
+        Returns
+        -------
+        dict
+            Mapping from ``(python_version, platform)`` to :class:`ResolvedDependencies`.
+        """
         extras, groups = self._resolve_extras_and_groups(
             extras, groups, extras_or_groups
         )
+        pip_deps, conda_deps = _deps_tuple(pip_deps), _deps_tuple(conda_deps)
 
         if python_include == "infer":
             # safer get
@@ -590,66 +1194,193 @@ class ParseDepends:
                 raise ValueError(msg)
             python_include = "python" + str(x)
 
-        pip_deps = _clean_pip_reqs(_init_deps(pip_deps))
-        conda_deps = _clean_conda_strings(
-            _init_deps(conda_deps), python_version=python_version
-        )
-
-        override_table = self.override_table
-        for requirement in self._get_requirements(
+        base_conda, base_pip = self._conda_and_pip_base(
             extras=extras,
             groups=groups,
             skip_package=skip_package,
-        ):
-            if pip_only and requirement.name != "python":
-                pip_deps.append(str(requirement))
+            pip_only=pip_only,
+            pip_deps=pip_deps,
+            conda_deps=conda_deps,
+        )
+        requirements = (
+            *self._get_requirements(
+                extras=extras, groups=groups, skip_package=skip_package
+            ),
+            *_clean_pip_reqs(pip_deps),
+        )
 
-            elif (override := override_table.get(requirement.name)) is not None:
-                if override.pip:
-                    pip_deps.append(str(requirement))
+        environments = {
+            (python_version, platform): marker_environment(python_version, platform)
+            for python_version in python_versions
+            for platform in platforms
+        }
 
-                elif not override.skip:
-                    r = _clean_conda_requirement(
-                        requirement,
-                        python_version=python_version,
-                        channel=override.channel,
-                    )
-
-                    if r is not None:
-                        conda_deps.append(str(r))
-
-                conda_deps.extend(
-                    _clean_conda_strings(
-                        override.packages, python_version=python_version
-                    )
+        # Environments which drop (and cannot decide) the same requirements
+        # have the same output
+        by_decided: dict[
+            tuple[frozenset[int], frozenset[int]], ResolvedDependencies
+        ] = {}
+
+        out: dict[tuple[str | None, str | None], ResolvedDependencies] = {}
+        for key, environment in environments.items():
+            decided = _decide_markers(base_conda, environment)
+            if (resolved := by_decided.get(decided)) is None:
+                resolved = by_decided[decided] = _apply_markers(
+                    base_conda,
+                    *decided,
+                    requirements=requirements,
+                    pip=base_pip,
+                    python_include=python_include,
                 )
-            else:
-                r = _clean_conda_requirement(requirement, python_version=python_version)
-                if r is not None:  # pragma: no cover
-                    conda_deps.append(str(r))
+            out[key] = resolved
 
-        pip_deps, conda_deps = (
-            self._cleanup(
-                x, remove_whitespace=remove_whitespace, unique=unique, sort=sort
-            )
-            for x in (pip_deps, conda_deps)
+        _cache_set(
+            self._resolved_requirements,
+            (tuple(extras), tuple(groups), skip_package, pip_deps),
+            next(iter(out.values())),
+            self._resolved_cache_size,
         )
+        return out
 
-        if python_include is not None:
-            conda_deps = [
-                *self._cleanup([python_include], remove_whitespace=remove_whitespace),
-                *conda_deps,
-            ]
+    def resolve(
+        self,
+        *,
+        extras: str | Iterable[str] | None = None,
+        groups: str | Iterable[str] | None = None,
+        extras_or_groups: str | Iterable[str] | None = None,
+        skip_package: bool = False,
+        pip_only: bool = False,
+        pip_deps: str | Iterable[str] | None = None,
+        conda_deps: str | Iterable[str] | None = None,
+        python_version: str | None = None,
+        python_include: str | None = None,
+        platform: str | None = None,
+    ) -> ResolvedDependencies:
+        """
+        Resolved dependencies of an environment.
 
-        # special if have pip requirements or just pip in conda_deps
-        # in this case, make sure pip is last
-        if "pip" in conda_deps:
-            conda_deps.remove("pip")
-            conda_deps.append("pip")
-        elif pip_deps:
-            conda_deps.append("pip")
+        Parameters are the same as for :meth:`conda_and_pip_requirements`.
+        The most recent results are cached, so that several outputs of the
+        same environment (e.g., a conda yaml and a requirements file) share a
+        single resolution.
+        """
+        extras, groups = self._resolve_extras_and_groups(
+            extras, groups, extras_or_groups
+        )
+        key = (
+            tuple(extras),
+            tuple(groups),
+            skip_package,
+            pip_only,
+            _deps_tuple(pip_deps),
+            _deps_tuple(conda_deps),
+            python_version,
+            python_include,
+            platform,
+        )
+        if (resolved := self._resolved_cache.get(key)) is not None:
+            return resolved
 
-        return conda_deps, pip_deps
+        resolved = self.resolve_matrix(
+            [python_version],
+            [platform],
+            extras=extras,
+            groups=groups,
+            skip_package=skip_package,
+            pip_only=pip_only,
+            pip_deps=key[4],
+            conda_deps=key[5],
+            python_include=python_include,
+        )[python_version, platform]
+        return _cache_set(
+            self._resolved_cache, key, resolved, self._resolved_cache_size
+        )
+
+    def conda_and_pip_requirements_matrix(
+        self,
+        python_versions: Iterable[str | None] = (None,),
+        platforms: Iterable[str | None] = (None,),
+        *,
+        extras: str | Iterable[str] | None = None,
+        groups: str | Iterable[str] | None = None,
+        extras_or_groups: str | Iterable[str] | None = None,
+        skip_package: bool = False,
+        pip_only: bool = False,
+        pip_deps: str | Iterable[str] | None = None,
+        conda_deps: str | Iterable[str] | None = None,
+        unique: bool = True,
+        remove_whitespace: bool = True,
+        sort: bool = True,
+        python_include: str | None = None,
+    ) -> dict[tuple[str | None, str | None], tuple[list[str], list[str]]]:
+        """
+        Conda and pip requirements for several python versions and platforms.
+
+        See :meth:`resolve_matrix`.
+
+        Returns
+        -------
+        dict
+            Mapping from ``(python_version, platform)`` to ``(conda_deps, pip_deps)``.
+        """
+        return {
+            key: resolved.conda_and_pip_requirements(
+                unique=unique, remove_whitespace=remove_whitespace, sort=sort
+            )
+            for key, resolved in self.resolve_matrix(
+                python_versions,
+                platforms,
+                extras=extras,
+                groups=groups,
+                extras_or_groups=extras_or_groups,
+                skip_package=skip_package,
+                pip_only=pip_only,
+                pip_deps=pip_deps,
+                conda_deps=conda_deps,
+                python_include=python_include,
+            ).items()
+        }
+
+    def conda_and_pip_requirements(
+        self,
+        *,
+        extras: str | Iterable[str] | None = None,
+        groups: str | Iterable[str] | None = None,
+        extras_or_groups: str | Iterable[str] | None = None,
+        skip_package: bool = False,
+        pip_only: bool = False,
+        pip_deps: str | Iterable[str] | None = None,
+        conda_deps: str | Iterable[str] | None = None,
+        unique: bool = True,
+        remove_whitespace: bool = True,
+        sort: bool = True,
+        python_version: str | None = None,
+        python_include: str | None = None,
+        platform: str | None = None,
+    ) -> tuple[list[str], list[str]]:
+        """
+        Conda and pip requirements.
+
+        Conda requirements with markers are filtered using ``python_version``
+        and the environment markers of conda ``platform`` (e.g., ``linux-64``
+        sets ``sys_platform = "linux"`` and ``platform_machine = "x86_64"``).
+        Markers which cannot be decided are kept.  Pip requirements keep their
+        markers.
+        """
+        return self.resolve(
+            extras=extras,
+            groups=groups,
+            extras_or_groups=extras_or_groups,
+            skip_package=skip_package,
+            pip_only=pip_only,
+            pip_deps=pip_deps,
+            conda_deps=conda_deps,
+            python_version=python_version,
+            python_include=python_include,
+            platform=platform,
+        ).conda_and_pip_requirements(
+            unique=unique, remove_whitespace=remove_whitespace, sort=sort
+        )
 
     def to_conda_yaml(  # noqa: PLR0913
         self,
@@ -663,6 +1394,7 @@ class ParseDepends:
         channels: str | Iterable[str] | None = None,
         python_include: str | None = None,
         python_version: str | None = None,
+        platform: str | None = None,
         skip_package: bool = False,
         pip_only: bool = False,
         header_cmd: str | None = None,
@@ -686,19 +1418,22 @@ class ParseDepends:
             sort=sort,
             python_include=python_include,
             python_version=python_version,
+            platform=platform,
         )
 
         if not conda_deps and not pip_deps:
             return _check_allow_empty(allow_empty)
 
-        out = _conda_yaml(
-            name=name,
-            channels=channels or self.channels,
-            conda_deps=conda_deps,
-            pip_deps=pip_deps,
-        )
+        TIMINGS.count("outputs-rendered")
+        with TIMINGS.phase("render"):
+            out = _conda_yaml(
+                name=name,
+                channels=channels or self.channels,
+                conda_deps=conda_deps,
+                pip_deps=pip_deps,
+            )
 
-        out = _add_header(out, header_cmd)
+            out = _add_header(out, header_cmd)
 
         _optional_write(out, output)
 
@@ -732,7 +1467,9 @@ class ParseDepends:
         if not pip_deps:
             return _check_allow_empty(allow_empty)
 
-        out = _add_header(list_to_str(pip_deps), header_cmd)
+        TIMINGS.count("outputs-rendered")
+        with TIMINGS.phase("render"):
+            out = _add_header(list_to_str(pip_deps), header_cmd)
 
         _optional_write(out, output)
         return out
@@ -746,6 +1483,7 @@ class ParseDepends:
         channels: str | Iterable[str] | None = None,
         python_include: str | None = None,
         python_version: str | None = None,
+        platform: str | None = None,
         prepend_channel: bool = False,
         output_conda: str | Path | None = None,
         output_pip: str | Path | None = None,
@@ -770,6 +1508,7 @@ class ParseDepends:
             sort=sort,
             python_include=python_include,
             python_version=python_version,
+            platform=platform,
         )
 
         if channels:  # pylint: disable=consider-ternary-expression
@@ -789,8 +1528,10 @@ class ParseDepends:
                 dep if "::" in dep else f"{channel}::{dep}" for dep in conda_deps
             ]
 
-        conda_deps_str = _add_header(list_to_str(conda_deps), header_cmd)
-        pip_deps_str = _add_header(list_to_str(pip_deps), header_cmd)
+        TIMINGS.count("outputs-rendered")
+        with TIMINGS.phase("render"):
+            conda_deps_str = _add_header(list_to_str(conda_deps), header_cmd)
+            pip_deps_str = _add_header(list_to_str(pip_deps), header_cmd)
 
         if output_conda and conda_deps_str:
             _optional_write(conda_deps_str, output_conda)
@@ -808,14 +1549,126 @@ class ParseDepends:
         """Create object from string."""
         from ._compat import tomllib
 
-        data = tomllib.loads(toml_string)
+        with TIMINGS.phase("load"):
+            data = tomllib.loads(toml_string)
         return cls(data=data)
 
     @classmethod
-    def from_path(cls, path: str | Path) -> Self:
-        """Create object from path."""
+    def from_path(cls, path: str | Path, cache: DiskCache | None = None) -> Self:
+        """
+        Create object from path.
+
+        Parameters
+        ----------
+        path : path-like
+            Path to ``pyproject.toml`` file.
+        cache : DiskCache, optional
+            If passed, look up the parsed data and parsed requirements in
+            ``cache``, keyed by the content of ``path`` and the versions of
+            ``pyproject2conda`` and ``packaging``.  On a hit, neither the toml
+            nor the requirement strings are parsed (requirements are added to
+            :data:`REQUIREMENT_POOL` with
+            :meth:`~RequirementPool.preload`), and extras and groups are still
+            resolved on first use.  On a miss, the results are stored in
+            ``cache``.
+        """
         from ._compat import tomllib
 
-        with Path(path).open("rb") as f:
-            data = tomllib.load(f)
-        return cls(data=data)
+        if cache is None:
+            with TIMINGS.phase("load"), Path(path).open("rb") as f:
+                data = tomllib.load(f)
+            return cls(data=data)
+
+        import json
+
+        import packaging
+
+        from .cache import hash_key
+
+        with TIMINGS.phase("load"):
+            content = Path(path).read_bytes()
+            key = hash_key(cls.__name__, packaging.__version__, content)
+            cached = cache.get(key)
+
+        if cached is not None:
+            try:
+                with TIMINGS.phase("load"):
+                    data, parsed = cls._load_cached_state(json.loads(cached))
+            except (ValueError, TypeError, KeyError):
+                # corrupt or foreign entry: treat as a miss
+                logger.warning("Removing invalid cache entry for %s", path)
+                cache.delete(key)
+            else:
+                REQUIREMENT_POOL.preload(parsed)
+                return cls(data=data)
+
+        with TIMINGS.phase("load"):
+            data = tomllib.loads(content.decode())
+        new = cls(data=data)
+        try:
+            # Store requirements parsed, so that later calls skip parsing.
+            encoded = json.dumps(
+                {"data": data, "requirements": new._parsed_requirements()}
+            ).encode()
+        except TypeError:
+            # e.g., dates in pyproject.toml
+            return new
+        cache.set(key, encoded)
+        return new
+
+    def _parsed_requirements(self) -> dict[str, list[Any]]:
+        """Fields of each valid requirement string in the tables of ``pyproject.toml``."""
+
+        def _strings(values: Any) -> list[str]:
+            if isinstance(values, str):
+                values = [values]
+            return (
+                [x for x in values if isinstance(x, str)]
+                if isinstance(values, list)
+                else []
+            )
+
+        def _tables(*keys: str) -> list[Any]:
+            table = self.get_in(*keys)
+            return list(table.values()) if isinstance(table, dict) else []
+
+        strings = [
+            *_strings(self.get_in("project", "dependencies")),
+            *_strings(self.get_in("build-system", "requires")),
+        ]
+        for values in (
+            *_tables("project", "optional-dependencies"),
+            *_tables("dependency-groups"),
+        ):
+            strings.extend(_strings(values))
+        # conda packages of overrides
+        for table in _tables("tool", "pyproject2conda", "dependencies"):
+            if isinstance(table, dict):
+                strings.extend(
+                    _split_channel(x)[1] for x in _strings(table.get("packages"))
+                )
+
+        out: dict[str, list[Any]] = {}
+        for string in strings:
+            if string not in out:
+                try:
+                    out[string] = _parse_requirement(string).to_fields()
+                except InvalidRequirement:
+                    # Leave errors to when (if) requirements are requested.
+                    continue
+        return out
+
+    @staticmethod
+    def _load_cached_state(
+        state: Any,
+    ) -> tuple[dict[str, Any], dict[str, list[Any]]]:
+        """Parsed data and requirement fields stored by :meth:`from_path`."""
+        data, parsed = state["data"], state["requirements"]
+        if not (
+            isinstance(data, dict)
+            and isinstance(parsed, dict)
+            and all(isinstance(fields, list) for fields in parsed.values())
+        ):
+            msg = "Invalid cache entry"
+            raise TypeError(msg)
+        return data, parsed
@@ -0,0 +1,137 @@
+"""
+Timing instrumentation (:mod:`~pyproject2conda.timings`)
+========================================================
+
+Wall time per phase and event counters, enabled with ``--timings``.
+
+When disabled (the default), :meth:`Timings.phase` returns a shared no-op
+context manager and :meth:`Timings.count` returns immediately, so that
+instrumented code pays (almost) nothing.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
+
+from ._typing_compat import override
+
+if TYPE_CHECKING:
+    from contextlib import AbstractContextManager
+    from types import TracebackType
+    from typing import Any
+
+
+_NULL_CONTEXT: AbstractContextManager[None] = nullcontext()
+
+
+class _Phase:
+    __slots__ = ("name", "start", "timings")
+
+    def __init__(self, timings: Timings, name: str) -> None:
+        self.timings = timings
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.timings._active.add(self.name)  # noqa: SLF001
+        self.start = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.timings.add_time(self.name, time.perf_counter() - self.start)
+        self.timings._active.discard(self.name)  # noqa: SLF001
+
+
+class Timings:
+    """
+    Accumulate wall time per phase and counters.
+
+    Phases are inclusive.  A phase entered while already active (e.g.,
+    recursion) is only timed by the outermost context.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.phases: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self.counters: dict[str, int] = {}
+        self._active: set[str] = set()
+        self._start: float | None = None
+
+    def reset(self) -> None:
+        """Clear all phases and counters."""
+        self.phases.clear()
+        self.calls.clear()
+        self.counters.clear()
+        self._active.clear()
+        self._start = None
+
+    def start(self) -> None:
+        """Enable and start timing ``total``."""
+        self.reset()
+        self.enabled = True
+        self._start = time.perf_counter()
+
+    def stop(self) -> None:
+        """Stop timing ``total`` and disable."""
+        if self._start is not None:
+            self.add_time("total", time.perf_counter() - self._start)
+            self._start = None
+        self.enabled = False
+
+    def phase(self, name: str) -> AbstractContextManager[None]:
+        """Context manager timing phase ``name``."""
+        if not self.enabled or name in self._active:
+            return _NULL_CONTEXT
+        return _Phase(self, name)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Add ``seconds`` to phase ``name``."""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Increment counter ``name`` by ``n``."""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self) -> dict[str, Any]:
+        """Json serializable representation.  Times are in seconds."""
+        return {
+            "phases": {
+                name: {"seconds": seconds, "calls": self.calls[name]}
+                for name, seconds in self.phases.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def report(self) -> str:
+        """Summary table."""
+        width = max((len(k) for k in (*self.phases, *self.counters)), default=0)
+        width = max(width, len("phase"), len("counter"))
+
+        lines = [f"{'phase':<{width}} {'time [ms]':>12} {'calls':>8}"]
+        lines.extend(
+            f"{name:<{width}} {seconds * 1e3:>12.3f} {self.calls[name]:>8}"
+            for name, seconds in sorted(self.phases.items(), key=lambda x: -x[1])
+        )
+        lines.extend(("", f"{'counter':<{width}} {'value':>12}"))
+        lines.extend(
+            f"{name:<{width}} {value:>12}"
+            for name, value in sorted(self.counters.items())
+        )
+        return "\n".join(lines)
+
+    @override
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} enabled={self.enabled}>"
+
+
+TIMINGS = Timings()
+"""Instance of :class:`Timings` used by ``pyproject2conda``."""
@@ -6,13 +6,13 @@ Utility methods (:mod:`pyproject2conda.utils`)
 from __future__ import annotations
 
 import enum
+import os
 import re
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from packaging.version import Version
-
 from ._typing_compat import override
+from .timings import TIMINGS
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterable, Mapping, Sequence
@@ -62,19 +62,15 @@ def get_in(
     {'c': 1}
 
     """
-    import operator
-    from functools import reduce
-
+    out: Any = nested_dict
     try:
-        return reduce(  # pyrefly: ignore[no-matching-overload]
-            operator.getitem,  # pyrefly: ignore[bad-argument-type]
-            keys,
-            nested_dict,
-        )
+        for key in keys:
+            out = out[key]
     except (KeyError, IndexError, TypeError):
         if factory is not None:
             return factory()
         return default
+    return out
 
 
 def get_default_pythons(path: str | Path = ".python-version") -> list[str]:
@@ -121,11 +117,15 @@ def get_all_pythons(
 
 def get_lowest_version(versions: Iterable[str]) -> str:
     """Get lowest version"""
+    from packaging.version import Version
+
     return min(versions, key=Version)
 
 
 def get_highest_version(versions: Iterable[str]) -> str:
     """Get highest version"""
+    from packaging.version import Version
+
     return max(versions, key=Version)
 
 
@@ -163,14 +163,24 @@ def parse_pythons(
     python_include: str | None,
     python_version: str | None,
     python: str | None,
-    toml_path: str | Path,
+    toml_path: str | Path | None = None,
+    *,
+    default_pythons: list[str] | None = None,
+    all_pythons: list[str] | None = None,
 ) -> tuple[str | None, str | None]:
-    """Create python_include/python_version."""
+    """
+    Create python_include/python_version.
+
+    If not passed, ``default_pythons`` are read from ``.python-version``, and
+    ``all_pythons`` from ``toml_path``.
+    """
     if python:
         python = select_pythons(
             [python],
-            get_default_pythons(),
-            get_all_pythons(data=None, path=toml_path),
+            get_default_pythons() if default_pythons is None else default_pythons,
+            get_all_pythons(data=None, path=toml_path)
+            if all_pythons is None
+            else all_pythons,
         )[0]
         return f"python={python}", python
 
@@ -211,10 +221,173 @@ def update_target(
     return update
 
 
+def atomic_write_bytes(path: str | Path, data: bytes) -> None:
+    """
+    Write ``data`` to ``path`` via a temporary file and rename.
+
+    Readers (and concurrent writers) only ever see a complete file.  If
+    ``path`` is a symlink, its target is replaced.  The permissions of an
+    existing file are kept.
+    """
+    import secrets
+    import shutil
+    from contextlib import suppress
+
+    path = Path(os.path.realpath(path))
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+    # 0o666 so that the umask is applied, same as `open(path, "wb")`
+    fd = os.open(
+        tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            _ = f.write(data)
+        with suppress(FileNotFoundError):
+            shutil.copymode(path, tmp)
+        _ = tmp.replace(path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+class WriteCounter:
+    """Number of files written and skipped (unchanged) by :func:`write_if_changed`."""
+
+    def __init__(self) -> None:
+        self.written = 0
+        self.skipped = 0
+
+    def reset(self) -> None:
+        """Set counts to zero."""
+        self.written = self.skipped = 0
+
+    @override
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"{type(self).__name__}(written={self.written}, skipped={self.skipped})"
+
+
+WRITE_COUNTER = WriteCounter()
+"""Counts for all calls to :func:`write_if_changed`."""
+
+
+def write_if_changed(
+    path: str | Path, string: str, encoding: str | None = None
+) -> bool:
+    """
+    Write ``string`` to ``path`` if ``path`` does not already contain it.
+
+    The file is written in text mode (with platform line endings) via a
+    temporary file and rename, so an interrupted write never leaves a partial
+    file.  An unchanged file is left alone, including its modification time.
+
+    Parameters
+    ----------
+    path : path-like
+    string : str
+    encoding : str, optional
+        Defaults to ``locale.getpreferredencoding(False)``.
+
+    Returns
+    -------
+    bool
+        Whether ``path`` was written.
+    """
+    if encoding is None:
+        import locale
+
+        encoding = locale.getpreferredencoding(False)
+
+    path = Path(path)
+    data = string.replace("\n", os.linesep).encode(encoding)
+
+    with TIMINGS.phase("write"):
+        # cheap check on size first
+        try:
+            unchanged = path.stat().st_size == len(data) and path.read_bytes() == data
+        except OSError:
+            unchanged = False
+
+        if unchanged:
+            WRITE_COUNTER.skipped += 1
+            TIMINGS.count("outputs-unchanged")
+            return False
+
+        atomic_write_bytes(path, data)
+
+    WRITE_COUNTER.written += 1
+    TIMINGS.count("bytes-written", len(data))
+    return True
+
+
+def diff_file(
+    path: str | Path,
+    string: str,
+    encoding: str | None = None,
+    name: str | None = None,
+) -> str | None:
+    """
+    Unified diff from contents of ``path`` to ``string``.
+
+    Counterpart of :func:`write_if_changed`, which compares ``string`` as it
+    would be written.  ``path`` is only read.
+
+    Parameters
+    ----------
+    path : path-like
+    string : str
+    encoding : str, optional
+        Defaults to ``locale.getpreferredencoding(False)``.
+    name : str, optional
+        Name of file in diff.  Defaults to ``path``.
+
+    Returns
+    -------
+    str or None
+        ``None`` if ``path`` already contains ``string``.  If ``path`` does
+        not exist, the diff is from ``/dev/null``.
+    """
+    from difflib import unified_diff
+
+    if encoding is None:
+        import locale
+
+        encoding = locale.getpreferredencoding(False)
+
+    path = Path(path)
+    name = str(path) if name is None else name
+    data = string.replace("\n", os.linesep).encode(encoding)
+    try:
+        current: bytes | None = path.read_bytes()
+    except FileNotFoundError:
+        current = None
+
+    if current == data:
+        return None
+
+    old = (
+        []
+        if current is None
+        else current.decode(encoding, errors="replace")
+        .replace(os.linesep, "\n")
+        .splitlines(keepends=True)
+    )
+    diff = "".join(
+        unified_diff(
+            old,
+            string.splitlines(keepends=True),
+            fromfile="/dev/null" if current is None else f"a/{name}",
+            tofile=f"b/{name}",
+        )
+    )
+    # files differing only in line endings or encoding
+    return diff or f"--- a/{name}\n+++ b/{name}\n(line endings or encoding differ)\n"
+
+
 # * filename from template
 def _get_standard_format_dict(
     env_name: str | None = None,
     python_version: str | None = None,
+    platform: str | None = None,
 ) -> dict[str, str]:
     kws: dict[str, str] = {}
     if env_name:
@@ -224,6 +397,9 @@ def _get_standard_format_dict(
         kws["py_version"] = python_version
         kws["py"] = python_version.replace(".", "")
 
+    if platform:
+        kws["platform"] = platform
+
     return kws
 
 
@@ -232,6 +408,7 @@ def filename_from_template(
     python_version: str | None = None,
     env_name: str | None = None,
     ext: str | None = ".yaml",
+    platform: str | None = None,
 ) -> str | None:
     """
     Create a filename from
@@ -241,11 +418,14 @@ def filename_from_template(
     py: 38
 
     env : name of environment
+    platform : conda platform (e.g., linux-64)
     """
     if template is None:
         return None
 
-    kws = _get_standard_format_dict(env_name=env_name, python_version=python_version)
+    kws = _get_standard_format_dict(
+        env_name=env_name, python_version=python_version, platform=platform
+    )
 
     if ext:  # pragma: no cover
         template += f"{ext}"
@@ -257,12 +437,15 @@ def conda_env_name_from_template(
     name: str | None,
     python_version: str | None = None,
     env_name: str | None = None,
+    platform: str | None = None,
 ) -> str | None:
     """Create environment name from name or template"""
     if name is None:
         return name
 
-    kws = _get_standard_format_dict(env_name=env_name, python_version=python_version)
+    kws = _get_standard_format_dict(
+        env_name=env_name, python_version=python_version, platform=platform
+    )
 
     return name.format(**kws)
 
@@ -285,11 +468,7 @@ def unique_list(values: Iterable[T]) -> list[T]:
     Return only unique values in list.
     Unlike using set(values), this preserves order.
     """
-    output: list[T] = []
-    for v in values:
-        if v not in output:
-            output.append(v)
-    return output
+    return list(dict.fromkeys(values))
 
 
 def list_to_str(values: Iterable[str] | None, eol: bool = True) -> str:
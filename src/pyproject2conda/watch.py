@@ -0,0 +1,132 @@
+"""
+Watch files (:mod:`~pyproject2conda.watch`)
+===========================================
+
+Detect changes to input files for ``pyproject2conda watch``.
+
+If `watchfiles <https://github.com/samuelcolvin/watchfiles>`_ is installed
+(extra ``pyproject2conda[watch]``), it is used to receive native file system
+notifications (inotify on Linux).  Otherwise, fall back to polling ``os.stat``
+of the watched files.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import threading
+    from collections.abc import Iterable, Iterator
+
+
+DEFAULT_INTERVAL = 0.1
+"""Default interval (in seconds) between polls/debounce of events."""
+
+
+def _stat(path: Path) -> tuple[int, int, int] | None:
+    """Signature of file, or :data:`None` if it does not exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _iter_changes_poll(
+    paths: list[Path],
+    interval: float,
+    stop_event: threading.Event | None,
+) -> Iterator[set[Path]]:
+    import time
+
+    def wait() -> bool:
+        if stop_event is None:
+            time.sleep(interval)
+            return True
+        return not stop_event.wait(interval)
+
+    snapshot = {path: _stat(path) for path in paths}
+    while wait():
+        changed: set[Path] = set()
+        for path, old in snapshot.items():
+            if (new := _stat(path)) != old:
+                snapshot[path] = new
+                changed.add(path)
+        if changed:
+            yield changed
+
+
+def _iter_changes_watchfiles(  # pragma: no cover
+    paths: list[Path],
+    interval: float,
+    stop_event: threading.Event | None,
+) -> Iterator[set[Path]]:
+    try:
+        import watchfiles  # pyright: ignore[reportMissingImports]  # pylint: disable=import-error
+    except ImportError as e:
+        msg = (
+            "Native file notifications need `watchfiles`, which could not be "
+            f"imported ({e}).  Install it with `pip install 'pyproject2conda[watch]'`."
+        )
+        raise ImportError(msg) from e
+
+    targets = set(paths)
+    # Watch parent directories, so that files replaced on save (new inode) or
+    # created after start are picked up.
+    for changes in watchfiles.watch(
+        *{path.parent for path in paths if path.parent.exists()},
+        watch_filter=lambda _, p: Path(p).resolve() in targets,
+        debounce=max(1, int(interval * 1000)),
+        step=max(1, int(interval * 500)),
+        stop_event=stop_event,
+        recursive=False,
+    ):
+        yield {Path(p).resolve() for _, p in changes}
+
+
+def has_watchfiles() -> bool:
+    """Whether native file notifications (via ``watchfiles``) are available."""
+    from importlib.util import find_spec
+
+    return find_spec("watchfiles") is not None
+
+
+def iter_changes(
+    paths: Iterable[str | Path],
+    *,
+    interval: float = DEFAULT_INTERVAL,
+    poll: bool | None = None,
+    stop_event: threading.Event | None = None,
+) -> Iterator[set[Path]]:
+    """
+    Iterate over sets of changed files.
+
+    Files which do not (yet) exist may be watched.  Their creation counts as a
+    change.
+
+    Parameters
+    ----------
+    paths : iterable of str or Path
+        Files to watch.  Yielded paths are absolute.
+    interval : float
+        Seconds between polls (or debounce time for file notifications).
+    poll : bool, optional
+        If ``True``, always poll.  Default is to use native notifications if
+        available.
+    stop_event : threading.Event, optional
+        If passed, stop iteration once set.
+
+    Yields
+    ------
+    set of Path
+    """
+    paths_ = list(dict.fromkeys(Path(p).resolve() for p in paths))
+
+    if poll is None:
+        poll = not has_watchfiles()
+
+    if poll:
+        yield from _iter_changes_poll(paths_, interval, stop_event)
+    else:  # pragma: no cover
+        yield from _iter_changes_watchfiles(paths_, interval, stop_event)
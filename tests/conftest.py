@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import shutil
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -10,6 +11,8 @@ from click.testing import CliRunner
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
+ROOT = Path(__file__).resolve().parent / "data"
+
 
 @pytest.fixture(scope="session")
 def runner() -> CliRunner:
@@ -22,3 +25,11 @@ def example_path(tmp_path: Path) -> Iterator[Path]:
     os.chdir(tmp_path)
     yield tmp_path
     os.chdir(old_cwd)
+
+
+@pytest.fixture
+def project_path(example_path: Path) -> Path:
+    shutil.copy(ROOT / "test-pyproject.toml", example_path / "pyproject.toml")
+    shutil.copytree(ROOT / "config", example_path / "config")
+    (example_path / ".python-version").write_text("3.11\n")
+    return example_path
@@ -0,0 +1,62 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+from pyproject2conda.config import Config
+from pyproject2conda.requirements import ParseDepends
+from tools.benchmark import SCALES, main
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_synthetic_project(tmp_path: Path) -> None:
+    path = tmp_path / "pyproject.toml"
+    assert main(["--scale", "tiny", "--write-pyproject", str(path)]) == 0
+
+    d = ParseDepends.from_path(path)
+    project = SCALES["tiny"]
+    assert {f"extra{j}" for j in range(project.extras)} | {"all"} <= set(
+        d.requirements_extras
+    )
+    # "all" extra references every other extra
+    assert {str(r) for r in d.requirements_extras["all"]} >= {
+        str(r) for r in d.requirements_extras[f"extra{project.extras - 1}"]
+    }
+    # "dev" includes whole chain of groups
+    assert "group0>1" in {str(r) for r in d.requirements_groups["dev"]}
+
+    c = Config.from_file(path)
+    assert len(list(c.iter_envs())) > project.envs
+
+
+def test_benchmark(tmp_path: Path) -> None:
+    output, compare = tmp_path / "new.json", tmp_path / "old.json"
+    assert main(["--scale", "tiny", "--repeat", "1", "-o", str(compare)]) == 0
+    assert (
+        main(["--scale", "tiny", "--repeat", "1", "-o", str(output)])
+        + main(["--scale", "tiny", "--repeat", "1", "--compare", str(compare)])
+        == 0
+    )
+    report = json.loads(output.read_text())
+    assert set(report["results"]) == {
+        "parse",
+        "conda_and_pip_requirements",
+        "python_matrix",
+        "platform_matrix",
+        "single_env",
+        "iter_envs",
+        "project",
+        "project_recursive",
+    }
+    assert report["results"]["project"]["peak_memory"] > 0
+    assert report["project"] == {
+        "deps": 20,
+        "extras": 5,
+        "deps_per_extra": 2,
+        "group_depth": 3,
+        "envs": 4,
+        "overrides": 10,
+    }
@@ -0,0 +1,247 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+from __future__ import annotations
+
+import copy
+import os
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pyproject2conda import cli, project, requirements
+from pyproject2conda.cache import DiskCache, TieredCache, hash_key, user_cache_dir
+from pyproject2conda.requirements import ParseDepends
+from pyproject2conda.timings import Timings
+
+if TYPE_CHECKING:
+    from click.testing import CliRunner
+
+ROOT = Path(__file__).resolve().parent / "data"
+
+
+def test_user_cache_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("P2C_CACHE_DIR", str(tmp_path))
+    assert user_cache_dir() == tmp_path
+
+    monkeypatch.delenv("P2C_CACHE_DIR")
+    assert user_cache_dir().name == "pyproject2conda"
+
+
+def test_hash_key() -> None:
+    assert hash_key("a", b"b") == hash_key("a", "b")
+    assert hash_key("a", "b") != hash_key("ab")
+
+
+def test_disk_cache(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path / "cache", max_size=25)
+
+    assert cache.get("a") is None
+
+    cache.set("a", b"0" * 10)
+    cache.set("b", b"1" * 10)
+    assert cache.get("a") == b"0" * 10
+
+    # make "b" least recently used
+    os.utime(cache._entry("b"), (0, 0))  # noqa: SLF001
+
+    cache.set("c", b"2" * 10)
+    assert cache.get("b") is None
+    assert cache.get("a") == b"0" * 10
+    assert cache.get("c") == b"2" * 10
+
+    # no leftover temporary files
+    assert sorted(p.name for p in cache.path.iterdir()) == ["a.cache", "c.cache"]
+
+    cache.clear()
+    assert not list(cache.path.iterdir())
+
+
+def test_disk_cache_size(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, max_size=25)
+    for i in range(10):
+        cache.set(str(i), b"x" * 10)
+        assert sum(p.stat().st_size for p in cache._iter_entries()) <= 25  # noqa: SLF001
+
+    # entries written by another process are accounted for on next eviction
+    DiskCache(tmp_path, max_size=100).set("other", b"y" * 20)
+    cache.set("last", b"z" * 10)
+    assert sum(p.stat().st_size for p in cache._iter_entries()) <= 25  # noqa: SLF001
+
+
+def test_tiered_cache(tmp_path: Path) -> None:
+    cache = TieredCache(tmp_path, memory_entries=2)
+    cache.set("a", b"0")
+    cache.set("b", b"1")
+
+    # served from memory
+    shutil.rmtree(tmp_path)
+    assert cache.get("a") == b"0"
+    cache.set("c", b"2")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"0"
+
+    # read from disk, then memory
+    # as sent to worker processes
+    other = copy.copy(cache)
+    assert not other._memory  # noqa: SLF001
+    assert other.get("c") == b"2"
+    (tmp_path / "c.cache").unlink()
+    assert other.get("c") == b"2"
+
+    cache.clear()
+    assert cache.get("a") is None
+
+
+@pytest.mark.parametrize("fname", ["test-pyproject.toml", "test-pyproject-groups.toml"])
+def test_parse_cache(
+    fname: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = ROOT / fname
+    cache = DiskCache(tmp_path)
+
+    cold = ParseDepends.from_path(path, cache=cache)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    from pyproject2conda._compat import tomllib
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError
+
+    monkeypatch.setattr(tomllib, "loads", _fail)
+    # as in a new process
+    requirements.REQUIREMENT_POOL.clear()
+    timings = Timings()
+    monkeypatch.setattr(requirements, "TIMINGS", timings)
+    timings.start()
+    warm = ParseDepends.from_path(path, cache=cache)
+    assert warm.data == cold.data
+    # extras and groups are resolved on first use
+    assert "_records_extras" not in warm.__dict__
+
+    for extra in cold.extras:
+        assert warm.to_conda_yaml(extras=extra) == cold.to_conda_yaml(extras=extra)
+    assert timings.counters["requirement-pool-preloaded"]
+    assert "requirement-parses" not in timings.counters
+
+    for extra in cold.extras:
+        assert warm.to_conda_yaml(extras=extra) == cold.to_conda_yaml(extras=extra)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"", b"\x80\x04K\x01.", b"[]", b'{"data": {}}', b'{"data": 1}'],
+)
+def test_parse_cache_invalid(
+    content: bytes, tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    path = ROOT / "test-pyproject.toml"
+    cache = DiskCache(tmp_path)
+    expected = ParseDepends.from_path(path).to_conda_yaml(extras="dev")
+
+    _ = ParseDepends.from_path(path, cache=cache)
+    (entry,) = tmp_path.iterdir()
+    # entries are json, not pickles
+    assert entry.read_bytes().startswith(b"{")
+    entry.write_bytes(content)
+
+    # treated as a miss, and replaced
+    d = ParseDepends.from_path(path, cache=cache)
+    assert d.to_conda_yaml(extras="dev") == expected
+    assert "invalid cache entry" in caplog.text
+    assert entry.read_bytes().startswith(b'{"data": {"')
+
+
+def test_parse_cache_error(tmp_path: Path) -> None:
+    path = tmp_path / "pyproject.toml"
+    path.write_text(
+        """\
+[project.optional-dependencies]
+dev = ["hello[test]"]
+"""
+    )
+    cache = DiskCache(tmp_path / "cache")
+
+    # errors are only raised when requirements are requested
+    for _ in range(2):
+        d = ParseDepends.from_path(path, cache=cache)
+        with pytest.raises(ValueError, match=r"project.name"):
+            d.conda_and_pip_requirements(extras="dev")
+    assert len(list(cache.path.iterdir())) == 1
+
+
+def test_cli_cache(runner: CliRunner, tmp_path: Path) -> None:
+    filename = ROOT / "test-pyproject.toml"
+    args = ["yaml", "-f", str(filename), "-e", "dev", "-p", "3.10"]
+    expected = runner.invoke(cli.app, args).output
+
+    for _ in range(2):
+        result = runner.invoke(
+            cli.app, ["--cache", "--cache-dir", str(tmp_path), *args]
+        )
+        assert result.output == expected
+        assert len(list((tmp_path / "parse").iterdir())) == 1
+
+    # reset
+    runner.invoke(cli.app, ["--no-cache", "list", "-f", str(filename)])
+    assert cli._PARSE_CACHE is None  # noqa: SLF001
+
+
+def test_cli_render_cache(
+    runner: CliRunner, example_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    shutil.copy(ROOT / "test-pyproject.toml", example_path / "pyproject.toml")
+    shutil.copytree(ROOT / "config", example_path / "config")
+    cache_dir = example_path / "cache"
+    args = ["--cache", "--cache-dir", str(cache_dir), "project", "--dry"]
+
+    expected = runner.invoke(cli.app, ["project", "--dry"]).output
+    assert runner.invoke(cli.app, args).output == expected
+    n = len(list((cache_dir / "render").iterdir()))
+    assert n > 0
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError
+
+    # outputs are served from the cache, including in a new process
+    monkeypatch.setattr(project, "_render_output", _fail)
+    assert runner.invoke(cli.app, args).output == expected
+    shutil.rmtree(cache_dir / "parse")
+    result = runner.invoke(cli.app, [*args, "--jobs", "2"])
+    assert result.output == expected
+    assert len(list((cache_dir / "render").iterdir())) == n
+
+    # changing options is a miss
+    result = runner.invoke(cli.app, [*args, "--no-sort"])
+    assert result.exit_code != 0
+
+    runner.invoke(cli.app, ["--no-cache", "list"])
+    assert cli._RENDER_CACHE is None  # noqa: SLF001
+
+
+@pytest.mark.usefixtures("example_path")
+def test_render_project_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    path = ROOT / "test-pyproject.toml"
+    cache = DiskCache(tmp_path / "render")
+    cold = [x.text for x in project.render_project(path, cache=cache)]
+    assert cold == [x.text for x in project.render_project(path)]
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError
+
+    monkeypatch.setattr(project, "_render_output", _fail)
+    assert [x.text for x in project.render_project(path, cache=cache)] == cold
+    monkeypatch.undo()
+
+    # tampered or swapped entries are rendered again, and replaced
+    entries = sorted(cache.path.iterdir())
+    assert b"python" in entries[0].read_bytes()
+    assert entries[1].read_bytes() != entries[2].read_bytes()
+    entries[0].write_bytes(entries[0].read_bytes().replace(b"python", b"pythn"))
+    entries[1].write_bytes(entries[2].read_bytes())
+    assert [x.text for x in project.render_project(path, cache=cache)] == cold
+    assert "invalid cache entry" in caplog.text
+    assert len(list(cache.path.iterdir())) == len(entries)
+    assert all(b"pythn" not in p.read_bytes() for p in entries)
@@ -3,6 +3,8 @@
 import json
 import locale
 import logging
+import os
+import shutil
 import sys
 import tempfile
 from pathlib import Path
@@ -855,6 +857,86 @@ def test_json_no_channel(runner) -> None:
         check_results_json(d / "there.json", expected)
 
 
+def test_platforms(runner, tmp_path: Path) -> None:
+    filename = tmp_path / "pyproject.toml"
+    filename.write_text(
+        dedent(
+            """\
+            [project]
+            name = "hello"
+            dependencies = [
+                "athing",
+                "bthing ; sys_platform == 'win32'",
+                "cthing ; platform_machine == 'arm64'",
+                "dthing ; sys_platform == 'linux'",
+            ]
+            """
+        )
+    )
+    platforms = ["--platform", "linux-64", "--platform", "osx-arm64"]
+
+    result = do_run(runner, "json", *platforms, filename=filename)
+    assert [json.loads(line) for line in result.output.splitlines()] == [
+        {"dependencies": ["athing", "dthing"], "pip": [], "platform": "linux-64"},
+        {"dependencies": ["athing", "cthing"], "pip": [], "platform": "osx-arm64"},
+    ]
+
+    result = do_run(
+        runner,
+        "yaml",
+        *platforms,
+        "-o",
+        str(tmp_path / "{platform}.yaml"),
+        "--no-header",
+        filename=filename,
+    )
+    assert result.exit_code == 0
+    assert (tmp_path / "osx-arm64.yaml").read_text() == dedent(
+        """\
+        dependencies:
+          - athing
+          - cthing
+        """
+    )
+    assert "dthing" in (tmp_path / "linux-64.yaml").read_text()
+
+    result = do_run(
+        runner,
+        "conda-requirements",
+        "--platform",
+        "win-64",
+        "--prefix",
+        str(tmp_path / "{platform}-"),
+        "--no-header",
+        filename=filename,
+    )
+    assert (tmp_path / "win-64-conda.txt").read_text() == "athing\nbthing\n"
+
+    filename.write_text(
+        filename.read_text() + "[tool.pyproject2conda.envs.base]\npython = ['3.12']\n"
+    )
+    result = do_run(
+        runner,
+        "project",
+        "--platform",
+        "win-64",
+        "--platform",
+        "linux-64",
+        "--dry",
+        filename=filename,
+    )
+    assert "# Creating yaml py312-base-win-64.yaml\n" in result.output
+    assert "# Creating yaml py312-base-linux-64.yaml\n" in result.output
+
+    # output must contain {platform}
+    result = do_run(
+        runner, "yaml", *platforms, "-o", str(tmp_path / "x.yaml"), filename=filename
+    )
+    assert isinstance(result.exception, ValueError)
+    result = do_run(runner, "yaml", "--platform", "linux-63", filename=filename)
+    assert isinstance(result.exception, ValueError)
+
+
 def test_alias(filename, runner) -> None:
     result = do_run(runner, "q", filename=filename)
 
@@ -887,6 +969,11 @@ def test_overwrite(filename, caplog) -> None:
         assert f"Creating yaml {path}" in caplog.text
 
         orig_time = path.stat().st_mtime
+        orig_time_ns = path.stat().st_mtime_ns
+        # make sure rewrite is detected even with coarse file system times
+        os.utime(path, ns=(orig_time_ns - 10**9, orig_time_ns - 10**9))
+        orig_time = path.stat().st_mtime
+        orig_time_ns = path.stat().st_mtime_ns
 
         for cmd in ("check", "skip", "force"):
             do_run(
@@ -901,16 +988,44 @@ def test_overwrite(filename, caplog) -> None:
                 filename=filename,
             )
 
-            if cmd == "force":
-                assert path.stat().st_mtime > orig_time
-            else:
-                assert path.stat().st_mtime == orig_time
+            # force recreates output, but unchanged files are not rewritten
+            assert path.stat().st_mtime == orig_time
 
             assert (
                 f"Skipping yaml {path}. Pass `-w force` to force recreate output"
                 in caplog.text
             )
 
+        caplog.clear()
+        do_run(
+            runner,
+            "yaml",
+            "-o",
+            str(path),
+            "-v",
+            "-w",
+            "force",
+            catch_exceptions=False,
+            filename=filename,
+        )
+        assert f"Creating yaml {path}" in caplog.text
+
+        # changed output
+        do_run(
+            runner,
+            "yaml",
+            "-o",
+            str(path),
+            "--name",
+            "hello",
+            "-w",
+            "force",
+            catch_exceptions=False,
+            filename=filename,
+        )
+        assert path.stat().st_mtime_ns > orig_time_ns
+        assert "name: hello" in path.read_text()
+
         path = d / "out.txt"
         assert not path.exists()
 
@@ -940,10 +1055,7 @@ def test_overwrite(filename, caplog) -> None:
                 filename=filename,
             )
 
-            if cmd == "force":
-                assert path.stat().st_mtime > orig_time
-            else:
-                assert path.stat().st_mtime == orig_time
+            assert path.stat().st_mtime == orig_time
             assert (
                 f"Skipping requirements {path}. Pass `-w force` to force recreate output"
                 in caplog.text
@@ -984,3 +1096,83 @@ dependencies:
     )
 
     check_result(results, expected)
+
+
+def test_project_check(runner, example_path: Path, caplog) -> None:
+    shutil.copy(ROOT / "test-pyproject.toml", example_path / "pyproject.toml")
+    shutil.copytree(ROOT / "config", example_path / "config")
+
+    # missing outputs
+    result = runner.invoke(app, ["project", "--check"])
+    assert result.exit_code == 1
+    assert "--- /dev/null\n+++ b/py310-test.yaml\n" in result.output
+    assert not list(example_path.glob("*.yaml"))
+
+    result = runner.invoke(app, ["project", "--custom-command", "make envs"])
+    assert result.exit_code == 0, result.output
+    mtimes = {p: p.stat().st_mtime_ns for p in example_path.glob("*.*")}
+
+    # command in header is not compared
+    for jobs in ["1", "2"]:
+        result = runner.invoke(app, ["project", "--check", "--jobs", jobs])
+        assert result.exit_code == 0, result.output
+        assert not result.output
+
+    path = example_path / "pyproject.toml"
+    path.write_text(path.read_text().replace('"pandas",', '"pandas>=2",'))
+    caplog.clear()
+    result = runner.invoke(app, ["project", "--check", "--jobs", "2"])
+    assert result.exit_code == 1
+    assert "--- a/py310-test.yaml\n+++ b/py310-test.yaml\n" in result.output
+    assert "-  - pandas\n+  - pandas>=2\n" in result.output
+    assert "output(s) out of date" in caplog.text
+
+    # nothing is written
+    assert {p: p.stat().st_mtime_ns for p in example_path.glob("*.*")} == mtimes | {
+        path: path.stat().st_mtime_ns
+    }
+
+    result = runner.invoke(app, ["project", "--check", "--dry"])
+    assert isinstance(result.exception, ValueError)
+
+
+def _cli_import_times() -> dict[str, int]:
+    import subprocess
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "pyproject2conda", "--version"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.startswith("pyproject2conda, version")
+
+    # lines are "import time: self [us] | cumulative | imported package"
+    cumulative: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total, name = line.split("|")
+        cumulative.setdefault(name.strip(), int(total))
+        if name == " pyproject2conda.cli":
+            break
+    return cumulative
+
+
+def test_import_time() -> None:
+    # deferred to the commands that need them
+    times = _cli_import_times()
+    for module in ("packaging", "json", "tomllib", "tomli"):
+        assert module not in times
+
+
+@pytest.mark.skipif(
+    "P2C_IMPORT_TIME_BUDGET" not in os.environ,
+    reason="set P2C_IMPORT_TIME_BUDGET (microseconds) to check import time",
+)
+def test_import_time_budget() -> None:
+    # opt-in, as wall time depends on the machine and its load
+    budget = int(os.environ["P2C_IMPORT_TIME_BUDGET"])
+    # best of several runs, to limit noise from other processes
+    runs = [_cli_import_times() for _ in range(3)]
+    assert min(run["pyproject2conda.cli"] for run in runs) < budget
@@ -981,6 +981,126 @@ def test_config_python_include_version() -> None:
     # no output:
 
 
+def test_config_platforms() -> None:
+    s = """
+    [tool.pyproject2conda]
+    platforms = ["linux-64", "osx-arm64"]
+
+    [tool.pyproject2conda.envs.test]
+    python = ["3.10", "3.11"]
+    name = "{env}-{platform}"
+
+    [tool.pyproject2conda.envs.other]
+    template = "{platform}/{env}"
+
+    [tool.pyproject2conda.envs.single]
+    platforms = "win-64"
+    output = "single.yaml"
+
+    [tool.pyproject2conda.envs.bad]
+    output = "bad.yaml"
+    """
+
+    c = Config.from_string(s)
+
+    def _outputs(env: str) -> list[tuple[str, list[str], str | None]]:
+        return [
+            (d["output"], d["platform"], d["name"]) for _, d in c.iter_envs(envs=[env])
+        ]
+
+    assert _outputs("test") == [
+        ("py310-test-linux-64.yaml", ["linux-64"], "test-linux-64"),
+        ("py311-test-linux-64.yaml", ["linux-64"], "test-linux-64"),
+        ("py310-test-osx-arm64.yaml", ["osx-arm64"], "test-osx-arm64"),
+        ("py311-test-osx-arm64.yaml", ["osx-arm64"], "test-osx-arm64"),
+    ]
+    assert _outputs("other") == [
+        ("linux-64/other.yaml", ["linux-64"], None),
+        ("osx-arm64/other.yaml", ["osx-arm64"], None),
+    ]
+    assert _outputs("single") == [("single.yaml", ["win-64"], None)]
+
+    with pytest.raises(ValueError, match=r"must contain \{platform\}"):
+        _outputs("bad")
+
+    # override from command line
+    assert [
+        d["output"] for _, d in c.iter_envs(envs=["other"], platforms=["win-64"])
+    ] == ["win-64/other.yaml"]
+
+
+def test_config_tables(monkeypatch: pytest.MonkeyPatch) -> None:
+    from pyproject2conda.timings import Timings
+
+    timings = Timings()
+    monkeypatch.setattr("pyproject2conda.config.TIMINGS", timings)
+    timings.start()
+
+    s = """
+    [tool.pyproject2conda]
+    channels = ["top"]
+    sort = false
+
+    [tool.pyproject2conda.envs.a]
+    channels = ["env"]
+
+    [tool.pyproject2conda.envs.b]
+
+    [[tool.pyproject2conda.overrides]]
+    envs = ["a", "b"]
+    channels = ["override1"]
+
+    [[tool.pyproject2conda.overrides]]
+    envs = "b"
+    channels = ["override2"]
+    """
+    c = Config.from_string(s)
+
+    assert c.channels("a") == ["override1"]
+    assert c.channels("a", inherit=False) == ["env"]
+    assert c.channels("b") == ["override2"]
+    assert c.channels() == ["top"]
+    assert c.sort("a") is False
+
+    for _ in range(3):
+        _ = list(c.iter_envs())
+    # one table per env and inherit
+    assert timings.counters["config-tables"] == 5
+
+    user = Config.from_string(
+        """
+        [tool.pyproject2conda.envs.a]
+        channels = ["user"]
+
+        [[tool.pyproject2conda.overrides]]
+        envs = ["b"]
+        sort = true
+        """
+    )
+    combined = c.assign_user_config(user)
+    assert combined.channels("a") == ["override1"]
+    assert combined.channels("a", inherit=False) == ["user"]
+    assert combined.sort("b") is True
+    # original is unchanged
+    assert c.channels("a", inherit=False) == ["env"]
+    assert c.sort("b") is False
+    assert len(c.overrides) == 2
+
+    # dashed keys at any level take precedence over underscores
+    c = Config.from_string(
+        """
+        [tool.pyproject2conda]
+        skip_package = true
+        [tool.pyproject2conda.envs.a]
+        skip-package = false
+        [tool.pyproject2conda.envs.b]
+        """
+    )
+    assert c.skip_package("a") is False
+    with pytest.warns(DeprecationWarning, match=r"Replace skip_package"):
+        assert c.skip_package("b") is True
+
+
 def test_config_user_config() -> None:
     # test overrides env
     s = """
@@ -1264,3 +1384,79 @@ def test_multiple(fname, opt, runner, caplog) -> None:
 
     t1.cleanup()
     t2.cleanup()
+
+
+@pytest.mark.parametrize("fname", ["test-pyproject.toml", "test-pyproject-groups.toml"])
+def test_jobs(fname, runner, tmp_path, caplog) -> None:
+    filename = ROOT / fname
+    do_run_ = partial(do_run, filename=filename)
+
+    dry = do_run_(runner, "project", "--dry")
+    assert dry.exit_code == 0
+    assert do_run_(runner, "project", "--dry", "--jobs", "2").output == dry.output
+
+    caplog.set_level(logging.INFO)
+    logs = {}
+    for jobs in ("1", "2"):
+        path = tmp_path / jobs
+        path.mkdir()
+        caplog.clear()
+        result = do_run_(
+            runner,
+            "project",
+            "--jobs",
+            jobs,
+            "--template-python",
+            f"{path}/" + "py{py}-{env}",
+            "--template",
+            f"{path}/" + "{env}",
+        )
+        assert result.exit_code == 0
+        logs[jobs] = [
+            r.getMessage().replace(f"{path}/", "")
+            for r in caplog.records
+            if r.getMessage().startswith("Creating")
+        ]
+
+    # same order as creation order in serial mode
+    assert logs["1"] == logs["2"]
+    assert len(logs["1"]) == dry.output.count("# Creating")
+
+    names = {p.name for p in (tmp_path / "1").iterdir()}
+    assert names == {p.name for p in (tmp_path / "2").iterdir()}
+    for name in names:
+        assert filecmp.cmp(tmp_path / "1" / name, tmp_path / "2" / name, shallow=False)
+
+
+def test_jobs_logging(runner, tmp_path, caplog) -> None:
+    filename = tmp_path / "pyproject.toml"
+    filename.write_text(
+        dedent(
+            """\
+            [project]
+            name = "hello"
+            dependencies = ["athing; platform_machine == 'x86_64'"]
+
+            [project.optional-dependencies]
+            test = ["pytest"]
+
+            [tool.pyproject2conda]
+            python = ["3.10", "3.11"]
+            default-envs = ["test"]
+            """
+        )
+    )
+
+    caplog.set_level(logging.INFO)
+    logs = {}
+    for jobs in ("1", "2"):
+        caplog.clear()
+        result = do_run(
+            runner, "project", "--dry", "-v", "--jobs", jobs, filename=filename
+        )
+        assert result.exit_code == 0
+        logs[jobs] = [r.getMessage() for r in caplog.records]
+
+    # messages of workers are handled by parent process, in the same order
+    assert logs["1"] == logs["2"]
+    assert sum(x.startswith("Cannot decide marker") for x in logs["2"]) == 2
@@ -0,0 +1,105 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+from __future__ import annotations
+
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from pyproject2conda import utils
+from pyproject2conda._compat import tomllib
+from pyproject2conda.cli import app
+from pyproject2conda.config import Config
+from pyproject2conda.context import ProjectContext
+
+ROOT = Path(__file__).resolve().parent / "data"
+
+
+@pytest.fixture
+def loads(monkeypatch: pytest.MonkeyPatch) -> Counter[str]:
+    """Count toml parses and reads of ``.python-version`` files."""
+    counter: Counter[str] = Counter()
+    load, loads, get_default_pythons = (
+        tomllib.load,
+        tomllib.loads,
+        utils.get_default_pythons,
+    )
+
+    def _load(f, **kwargs):
+        counter[Path(f.name).name] += 1
+        return load(f, **kwargs)
+
+    def _loads(s, **kwargs):
+        counter["string"] += 1
+        return loads(s, **kwargs)
+
+    def _get_default_pythons(path=".python-version"):
+        counter[str(path)] += 1
+        return get_default_pythons(path)
+
+    monkeypatch.setattr(tomllib, "load", _load)
+    monkeypatch.setattr(tomllib, "loads", _loads)
+    monkeypatch.setattr(utils, "get_default_pythons", _get_default_pythons)
+    return counter
+
+
+def test_project_loads_once(project_path: Path, runner, loads: Counter[str]) -> None:
+    result = runner.invoke(app, ["project", "--overwrite", "force"])
+    assert result.exit_code == 0, result.output
+    assert len(list(project_path.glob("*.yaml"))) > 1
+
+    assert loads == {
+        "pyproject.toml": 1,
+        "userconfig.toml": 1,
+        ".python-version-default": 1,
+        ".python-version": 1,
+    }
+
+    # each invocation loads files again
+    loads.clear()
+    result = runner.invoke(app, ["yaml", "-e", "dev", "--python", "default"])
+    assert result.exit_code == 0, result.output
+    assert "python=3.11" in result.output
+    assert loads["pyproject.toml"] == 1
+
+
+def test_context(project_path: Path, loads: Counter[str]) -> None:
+    path = project_path / "pyproject.toml"
+    context = ProjectContext(path)
+
+    assert context.parser is context.parser
+    assert context.data is context.parser.data
+    assert context.user_config_path() == project_path / "config" / "userconfig.toml"
+    assert context.user_config_path(None) is None
+    assert context.default_pythons == ["3.11"]
+    assert context.parse_pythons(None, None, "default") == ("python=3.11", "3.11")
+    assert context.parse_pythons("python", None, None) == ("python", None)
+
+    config = context.config()
+    assert config.default_pythons == ["3.11"]
+    assert context.config(None).envs.keys() < config.envs.keys()
+    assert loads["pyproject.toml"] == loads["userconfig.toml"] == 1
+
+    # reload only changed files
+    user = context.user_config_path()
+    assert user is not None
+    new = context.reload({user})
+    assert new.data is context.data
+    assert new.default_pythons is context.default_pythons
+    _ = new.config()
+    assert loads["pyproject.toml"] == 1
+    assert loads["userconfig.toml"] == 2
+
+    (project_path / ".python-version").write_text("3.12\n")
+    new = new.reload({".python-version"})
+    assert new.default_pythons == ["3.12"]
+
+    _ = context.reload({path}).data
+    assert loads["pyproject.toml"] == 2
+
+
+def test_from_toml_dict_does_not_modify() -> None:
+    data = {"tool": {"pyproject2conda": {"default-envs": ["test"]}}}
+    config = Config.from_toml_dict(data, default_pythons=["3.10"], all_pythons=[])
+    assert config.envs == {"test": {"extras-or-groups": True}}
+    assert data == {"tool": {"pyproject2conda": {"default-envs": ["test"]}}}
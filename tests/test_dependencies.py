@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from packaging.requirements import InvalidRequirement
+
+from pyproject2conda import requirements
+from pyproject2conda.cli import app
+from pyproject2conda.dependencies import (
+    DependencyConflictError,
+    DependencySet,
+    specifier_is_empty,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from click.testing import CliRunner
+
+
+def _merge(*values: str) -> list[str]:
+    records: list[requirements.RequirementRecord | str] = []
+    for value in values:
+        channel, dep = requirements._split_channel(value)  # noqa: SLF001
+        try:
+            record = requirements.REQUIREMENT_POOL.get(dep)
+        except InvalidRequirement:
+            records.append(value)
+        else:
+            records.append(record.with_channel(channel))
+    return [str(x) for x in DependencySet(records)]
+
+
+@pytest.mark.parametrize(
+    ("values", "expected"),
+    [
+        (["numpy>=1.24", "NumPy<2"], ["numpy<2,>=1.24"]),
+        (["numpy", "numpy>=1"], ["numpy>=1"]),
+        (["numpy>=1", "numpy", "numpy>=1"], ["numpy>=1"]),
+        (["conda-forge::numpy", "numpy>=1"], ["conda-forge::numpy>=1"]),
+        (["a[x]>=1", "b", "a[y]"], ["a[x,y]>=1", "b"]),
+        (
+            ["a ; python_version < '3.11'", "a>=1", "a<2 ; python_version < '3.11'"],
+            ['a<2; python_version < "3.11"', "a>=1"],
+        ),
+        (
+            ["a @ https://example.com/a.zip", "a>=1"],
+            ["a @ https://example.com/a.zip", "a>=1"],
+        ),
+        (["-e .", "a", "-e ."], ["-e .", "a"]),
+    ],
+)
+def test_merge(values: list[str], expected: list[str]) -> None:
+    assert _merge(*values) == expected
+
+
+@pytest.mark.parametrize(
+    ("values", "match"),
+    [
+        (
+            ["numpy>=2", "numpy<2"],
+            r"'numpy>=2', 'numpy<2' \(no version satisfies both\)",
+        ),
+        (["a==1.0", "a==1.1"], "no version"),
+        (["a~=1.4", "a>=2"], "no version"),
+        (["a>1", "a<=1"], "no version"),
+        (["conda-forge::a", "bioconda::a"], "different channels"),
+    ],
+)
+def test_conflict(values: list[str], match: str) -> None:
+    with pytest.raises(DependencyConflictError, match=match):
+        _merge(*values)
+
+
+@pytest.mark.parametrize(
+    ("specifier", "expected"),
+    [
+        ("", False),
+        (">=1", False),
+        (">=1,<=1", False),
+        (">=1,<1", True),
+        (">1,<=1", True),
+        (">=1,<=1,!=1", True),
+        (">=2,<1", True),
+        ("~=1.4.5,<1.4.5", True),
+        ("~=1.4.5,>=1.5", True),
+        ("~=1.4.5,<1.4.9", False),
+        ("==1.0,==1.0.0", False),
+        ("==1.0,>1", True),
+        ("==1.*,>=2", False),  # wildcards are only checked against pins
+        ("==1.5,!=1.*", True),
+        ("==2.0rc1,>=2.0a1", False),
+    ],
+)
+def test_specifier_is_empty(specifier: str, expected: bool) -> None:
+    assert specifier_is_empty(specifier) is expected
+
+
+def test_parse_depends() -> None:
+    d = requirements.ParseDepends.from_string(
+        """
+        [project]
+        name = "hello"
+        dependencies = ["numpy >= 1.24", "pandas"]
+        [project.optional-dependencies]
+        test = ["NumPy < 2", "pytest", "pandas[excel]"]
+        bad = ["numpy >= 3"]
+        [tool.pyproject2conda.dependencies]
+        pandas = {channel = "conda-forge"}
+        """
+    )
+
+    assert d.conda_and_pip_requirements(extras="test") == (
+        ["conda-forge::pandas", "numpy<2,>=1.24", "pytest"],
+        [],
+    )
+    assert d.pip_requirements(extras="test") == [
+        "numpy<2,>=1.24",
+        "pandas[excel]",
+        "pytest",
+    ]
+    # unique=False keeps all requirements
+    assert d.pip_requirements(extras="test", unique=False, sort=False) == [
+        "numpy>=1.24",
+        "pandas",
+        "NumPy<2",
+        "pytest",
+        "pandas[excel]",
+    ]
+
+    with pytest.raises(DependencyConflictError, match=r"'numpy<2,>=1.24', 'numpy>=3'"):
+        d.to_conda_yaml(extras=["test", "bad"])
+    with pytest.raises(ValueError, match=r"Conflicting requirements for 'numpy'"):
+        d.to_requirements(extras="bad", pip_deps=["numpy<1"], skip_package=True)
+
+
+def test_marker_split_pins() -> None:
+    d = requirements.ParseDepends.from_string(
+        """
+        [project]
+        name = "hello"
+        dependencies = [
+            "scipy<2; python_version < '3.10'",
+            "scipy>=2; python_version >= '3.10'",
+        ]
+        [dependency-groups]
+        dev = ["scipy>=1"]
+        """
+    )
+
+    # undecided markers are not merged
+    assert d.conda_and_pip_requirements(groups="dev")[0] == [
+        "scipy<2",
+        "scipy>=1",
+        "scipy>=2",
+    ]
+    assert d.conda_and_pip_requirements(groups="dev", python_version="3.9")[0] == [
+        "scipy<2,>=1"
+    ]
+    assert d.conda_and_pip_requirements(groups="dev", python_version="3.11")[0] == [
+        "scipy>=1,>=2"
+    ]
+    with pytest.raises(DependencyConflictError):
+        d.conda_and_pip_requirements(
+            groups="dev", python_version="3.9", conda_deps="scipy>=3"
+        )
+
+
+def test_cli_conflict(runner: CliRunner, example_path: Path) -> None:
+    (example_path / "pyproject.toml").write_text(
+        '[project]\nname = "hello"\ndependencies = ["numpy>=2", "numpy<2"]\n'
+    )
+    result = runner.invoke(app, ["yaml"])
+    assert result.exit_code == 1
+    assert "Conflicting requirements for 'numpy'" in result.output
+    assert not isinstance(result.exception, DependencyConflictError)
@@ -0,0 +1,211 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+from __future__ import annotations
+
+import logging
+import shutil
+from pathlib import Path
+
+import pytest
+
+from pyproject2conda import cli, project
+from pyproject2conda.cli import app
+from pyproject2conda.discover import IgnorePatterns, find_projects
+
+ROOT = Path(__file__).resolve().parent / "data"
+
+CONFIG = """\
+[project]
+name = "{name}"
+dependencies = ["athing"]
+
+[tool.pyproject2conda]
+channels = ["conda-forge"]
+
+[tool.pyproject2conda.envs.base]
+style = "yaml"
+"""
+
+
+def _make_project(path: Path, text: str | None = None) -> Path:
+    path.mkdir(parents=True, exist_ok=True)
+    out = path / "pyproject.toml"
+    out.write_text(CONFIG.format(name=path.name) if text is None else text)
+    return out
+
+
+@pytest.mark.parametrize(
+    ("pattern", "path", "is_dir", "expected"),
+    [
+        ("build", "a/b/build", False, True),
+        ("build/", "a/build", False, None),
+        ("/build", "a/build", True, None),
+        ("a/*/c", "a/b/c", True, True),
+        ("a/*/c", "a/b/x/c", True, None),
+        ("a/**/c", "a/b/x/c", True, True),
+        ("a/**/c", "a/c", True, True),
+        ("**/c", "x/y/c", True, True),
+        ("a/**", "a/b/c", False, True),
+        ("p[0-9]", "p1", True, True),
+        ("p[!0-9]", "p1", True, None),
+        ("p?", "p12", True, None),
+        ("\\#x", "#x", True, True),
+    ],
+)
+def test_ignore_patterns(
+    pattern: str, path: str, is_dir: bool, expected: bool | None
+) -> None:
+    assert IgnorePatterns([pattern]).match(path, is_dir) is expected
+
+
+def test_find_projects(example_path: Path) -> None:
+    paths = {
+        name: _make_project(example_path / name)
+        for name in ["a", "b/c", "build/d", "e/build/f", "g/h", "g/keep", ".git/x"]
+    }
+    _make_project(example_path / "nocfg", "[project]\nname = 'nocfg'\n")
+    (example_path / ".gitignore").write_text("# comment\nbuild/\n\n/g/*\n!/g/keep\n")
+    (example_path / "b" / ".gitignore").write_text("c\n")
+
+    def _found(*args, **kwargs) -> list[Path]:
+        return find_projects(example_path, *args, **kwargs)
+
+    assert _found() == [paths["a"], paths["g/keep"]]
+    assert _found(gitignore=False) == sorted(
+        v for k, v in paths.items() if k != ".git/x"
+    )
+    assert _found(["a"]) == [paths["g/keep"]]
+    # exclude patterns take precedence
+    assert _found(["!b/c"]) == [paths["a"], paths["b/c"], paths["g/keep"]]
+    assert example_path / "nocfg" / "pyproject.toml" in _found(require_config=False)
+
+    with pytest.raises(ValueError, match="not a directory"):
+        find_projects(paths["a"])
+
+
+@pytest.fixture
+def monorepo(example_path: Path) -> Path:
+    for name in ["pkgs/a", "pkgs/b", "pkgs/c"]:
+        _make_project(example_path / name)
+    shutil.copy(ROOT / "test-pyproject.toml", example_path / "pkgs/c/pyproject.toml")
+    shutil.copytree(ROOT / "config", example_path / "pkgs/c/config")
+    _make_project(example_path / "build/x")
+    (example_path / ".gitignore").write_text("build/\n")
+    return example_path
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_project_recursive(monorepo: Path, runner, caplog, jobs: int) -> None:
+    # header is the same for all jobs
+    args = ["project", "--recursive", ".", "--jobs", str(jobs), "--no-header"]
+    with caplog.at_level(logging.INFO):
+        result = runner.invoke(app, args)
+    assert result.exit_code == 0, result.output
+    # loaded files are released
+    assert not project.CONTEXTS
+
+    # outputs are relative to each project
+    assert (monorepo / "pkgs/a/base.yaml").read_text() == (
+        "channels:\n  - conda-forge\ndependencies:\n  - athing\n"
+    )
+    assert (monorepo / "pkgs/b/base.yaml").exists()
+    assert not (monorepo / "build/x/base.yaml").exists()
+    assert not list(monorepo.glob("*.yaml"))
+
+    # same as running `project` from the project directory
+    expected = sorted(p.name for p in (monorepo / "pkgs/c").glob("*.*"))
+    shutil.rmtree(monorepo / "pkgs/c", ignore_errors=True)
+    shutil.copytree(ROOT / "config", monorepo / "pkgs/c/config")
+    shutil.copy(ROOT / "test-pyproject.toml", monorepo / "pkgs/c/pyproject.toml")
+    with cli._working_directory(monorepo / "pkgs/c"):  # noqa: SLF001
+        result = runner.invoke(app, ["project", "--no-header"])
+    assert result.exit_code == 0, result.output
+    assert sorted(p.name for p in (monorepo / "pkgs/c").glob("*.*")) == expected
+
+    messages = [r.getMessage() for r in caplog.records]
+    processing = [m for m in messages if m.startswith("Processing")]
+    assert processing == [
+        f"Processing {monorepo.resolve() / name / 'pyproject.toml'}"
+        for name in ["pkgs/a", "pkgs/b", "pkgs/c"]
+    ]
+    assert messages.index("Creating yaml base.yaml") == 1
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_project_recursive_errors(monorepo: Path, runner, caplog, jobs: int) -> None:
+    (monorepo / "pkgs/a/pyproject.toml").write_text("[tool.pyproject2conda\n")
+
+    result = runner.invoke(
+        app, ["project", "--recursive", ".", "--dry", "--jobs", str(jobs)]
+    )
+    assert result.exit_code == 1
+    # other projects are processed
+    assert result.output.count("# Creating yaml base.yaml") == 1
+    assert "athing" in result.output
+
+    errors = [r.getMessage() for r in caplog.records if r.levelno == logging.ERROR]
+    assert len(errors) == 2
+    assert errors[0].startswith(f"{monorepo.resolve() / 'pkgs/a/pyproject.toml'}: ")
+    assert errors[1].startswith("1 of 3 project(s) failed")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_project_recursive_errors_config(
+    monorepo: Path, runner, caplog, jobs: int
+) -> None:
+    # an env which is not a table
+    path = _make_project(
+        monorepo / "pkgs/a",
+        CONFIG.replace('[tool.pyproject2conda.envs.base]\nstyle = "yaml"', "")
+        + '[tool.pyproject2conda.envs]\nbase = "oops"\n',
+    )
+
+    result = runner.invoke(
+        app, ["project", "--recursive", ".", "--dry", "--jobs", str(jobs)]
+    )
+    assert result.exit_code == 1
+    assert "athing" in result.output
+
+    errors = [r.getMessage() for r in caplog.records if r.levelno == logging.ERROR]
+    assert errors[0].startswith(f"{path.resolve()}: TypeError: ")
+    assert errors[1].startswith("1 of 3 project(s) failed")
+
+
+def test_project_files(monorepo: Path, runner) -> None:
+    result = runner.invoke(
+        app,
+        [
+            "project",
+            "-f",
+            "pkgs/a/pyproject.toml",
+            "-f",
+            "build/x/pyproject.toml",
+            "-f",
+            "pkgs/a/pyproject.toml",
+            "--dry",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert result.output.count("# Creating yaml base.yaml") == 2
+    assert not list(monorepo.rglob("*.yaml"))
+
+    # a single file is relative to current directory, as before
+    result = runner.invoke(app, ["project", "-f", "pkgs/a/pyproject.toml"])
+    assert result.exit_code == 0, result.output
+    assert (monorepo / "base.yaml").exists()
+
+
+def test_project_recursive_check(monorepo: Path, runner, caplog) -> None:
+    result = runner.invoke(app, ["project", "--recursive", "."])
+    assert result.exit_code == 0, result.output
+
+    result = runner.invoke(app, ["project", "--recursive", ".", "--check"])
+    assert result.exit_code == 0, result.output
+
+    (monorepo / "pkgs/b/base.yaml").unlink()
+    result = runner.invoke(
+        app, ["project", "--recursive", ".", "--check", "--jobs", "2"]
+    )
+    assert result.exit_code == 1
+    # paths are relative to current directory
+    assert result.output.startswith("--- /dev/null\n+++ b/pkgs/b/base.yaml\n")
+    assert "1 output(s) out of date" in caplog.text
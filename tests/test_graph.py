@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from packaging.requirements import Requirement
+
+from pyproject2conda.graph import DependencyCycleError, DependencyGraph
+from pyproject2conda.requirements import ParseDepends
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def _names(requirements: Sequence[object]) -> list[str]:
+    return [str(r) for r in requirements]
+
+
+def test_resolve() -> None:
+    graph = DependencyGraph(
+        "My_Package",
+        extras={
+            "Test_Extra": ["pytest"],
+            "dev": ["my-package[test-extra]", "ipython", "my.package"],
+        },
+        groups={
+            "Lint.Group": ["ruff"],
+            "dev": [{"include-group": "lint-group"}, "MY_PACKAGE[dev]", "mypy"],
+        },
+    )
+
+    assert graph.names("extra") == ["Test_Extra", "dev"]
+    assert graph.resolve_all("extra") == {
+        "Test_Extra": [Requirement("pytest")],
+        "dev": [Requirement("pytest"), Requirement("ipython")],
+    }
+    assert _names(graph.resolve(graph.node("group", "dev"))) == [
+        "ruff",
+        "pytest",
+        "ipython",
+        "mypy",
+    ]
+    assert graph.topological_order([graph.node("group", "dev")]) == [
+        ("group", "lint-group"),
+        ("extra", "test-extra"),
+        ("extra", "dev"),
+        ("group", "dev"),
+    ]
+
+
+def test_resolve_each_node_once() -> None:
+    parsed: list[str] = []
+
+    def parse(x: str) -> Requirement:
+        parsed.append(x)
+        return Requirement(x)
+
+    n = 100
+    extras = {
+        f"extra{i}": [f"dep{i}", *(["pkg[extra0]"] if i else [])] for i in range(n)
+    }
+    extras["all"] = ["pkg[" + ",".join(extras) + "]"]
+    graph = DependencyGraph("pkg", extras=extras, parse=parse)
+
+    resolved = graph.resolve_all("extra")
+    assert len(parsed) == 2 * n
+    assert len(resolved["all"]) == 2 * n - 1
+
+
+def test_deep_chain() -> None:
+    n = 5000
+    groups: dict[str, list[str | dict[str, str]]] = {
+        f"g{i}": [f"dep{i}", *([{"include-group": f"g{i - 1}"}] if i else [])]
+        for i in range(n)
+    }
+    graph = DependencyGraph("pkg", groups=groups)
+    assert len(graph.resolve(graph.node("group", f"g{n - 1}"))) == n
+
+
+@pytest.mark.parametrize(
+    ("extras", "groups", "node", "match"),
+    [
+        (
+            {"a": ["pkg[b]"], "b": ["pkg[a]"]},
+            {},
+            ("extra", "a"),
+            "extra 'a' -> extra 'b' -> extra 'a'",
+        ),
+        ({"a": ["pkg[a]"]}, {}, ("extra", "a"), "extra 'a' -> extra 'a'"),
+        (
+            {},
+            {"a": [{"include-group": "b"}], "b": ["x", {"include-group": "A"}]},
+            ("group", "a"),
+            "group 'a' -> group 'b' -> group 'a'",
+        ),
+    ],
+)
+def test_cycle(extras, groups, node, match) -> None:  # type: ignore[no-untyped-def]
+    graph = DependencyGraph("pkg", extras=extras, groups=groups)
+    with pytest.raises(DependencyCycleError, match=match):
+        graph.resolve(node)
+
+
+def test_errors() -> None:
+    with pytest.raises(ValueError, match=r"Duplicate extra names"):
+        DependencyGraph("pkg", extras={"a_b": [], "a-b": []})
+
+    graph = DependencyGraph(
+        "pkg", extras={"a": ["pkg[missing]"]}, groups={"g": [{"other": "x"}]}
+    )
+    with pytest.raises(ValueError, match=r"Unknown extra 'missing'"):
+        graph.resolve(graph.node("extra", "a"))
+    with pytest.raises(ValueError, match=r"Invalid item"):
+        graph.resolve(graph.node("group", "g"))
+    with pytest.raises(ValueError, match=r"Unknown dependency group"):
+        graph.node("group", "missing")
+
+
+def test_parse_depends_cycle() -> None:
+    d = ParseDepends.from_string(
+        """
+        [project]
+        name = "hello"
+        [project.optional-dependencies]
+        a = ["hello[b]", "thing"]
+        b = ["hello[a]"]
+        """
+    )
+    with pytest.raises(DependencyCycleError):
+        d.pip_requirements(extras="a")
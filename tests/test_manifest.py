@@ -0,0 +1,114 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+
+from pyproject2conda.cli import app
+from pyproject2conda.manifest import Manifest, fingerprint
+
+ROOT = Path(__file__).resolve().parent / "data"
+
+
+def test_fingerprint() -> None:
+    assert fingerprint({"a": 1, "b": [1, 2]}) == fingerprint({"b": [1, 2], "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+def test_manifest(example_path: Path) -> None:
+    path = example_path / "manifest.json"
+    output = example_path / "out.txt"
+
+    m = Manifest.from_path(path)
+    assert not m.is_current(output, "a")
+
+    output.write_text("hello")
+    m.record(output, "a")
+    assert m.is_current(output, "a")
+    assert not m.is_current(output, "b")
+
+    m.save()
+    m = Manifest.from_path(path)
+    assert m.is_current(output, "a")
+
+    # output edited
+    output.write_text("there")
+    assert not m.is_current(output, "a")
+
+    # output missing
+    output.unlink()
+    m.record(output, "a")
+    assert not m.entries
+
+    # out of date version
+    path.write_text(json.dumps({"version": -1, "outputs": {"x": {}}}))
+    assert not Manifest.from_path(path).entries
+
+
+def _get_times(path: Path) -> dict[str, int]:
+    return {
+        p.name: p.stat().st_mtime_ns
+        for p in path.glob("*.*")
+        if p.suffix in {".txt", ".yaml"}
+    }
+
+
+def test_project_manifest(project_path: Path, runner, caplog) -> None:
+    caplog.set_level(logging.INFO)
+
+    def run(*opts: str) -> None:
+        caplog.clear()
+        result = runner.invoke(
+            app, ["project", "--manifest", "manifest.json", "-w", "check", "-v", *opts]
+        )
+        assert result.exit_code == 0, result.output
+
+    run()
+    times = _get_times(project_path)
+    assert set(times) == set(
+        json.loads((project_path / "manifest.json").read_text())["outputs"]
+    )
+    assert "Skipping" not in caplog.text
+
+    # modification time of inputs is irrelevant
+    for name in ("pyproject.toml", "config/userconfig.toml"):
+        os.utime(project_path / name, (1e10, 1e10))
+    run()
+    assert "Creating" not in caplog.text
+    assert _get_times(project_path) == times
+
+    # edited output is recreated
+    (project_path / "base.txt").write_text("hello")
+    run()
+    assert caplog.text.count("Creating") == 1
+    assert "Creating requirements base.txt" in caplog.text
+
+    # changed options
+    run("--no-sort")
+    assert caplog.text.count("Creating") == len(times)
+
+    # unused table
+    with (project_path / "pyproject.toml").open("a") as f:
+        f.write('\n[dependency-groups]\nnew = ["thing"]\n')
+    run("--no-sort")
+    assert "Creating" not in caplog.text
+
+    # only environments using changed extra are recreated
+    path = project_path / "pyproject.toml"
+    path.write_text(path.read_text().replace('"build",', '"build>=1.0",'))
+    run("--no-sort")
+    assert caplog.text.count("Creating") == 2
+    assert "Creating yaml py310-dist-pypi.yaml" in caplog.text
+    assert "Creating yaml py310-user-dev.yaml" in caplog.text
+
+    # changed override
+    path.write_text(
+        path.read_text().replace(
+            'cthing = { channel = "conda-forge" }', 'cthing = { channel = "other" }'
+        )
+    )
+    run("--no-sort")
+    # everything but environments that skip package
+    assert caplog.text.count("Creating") == len(times) - 4
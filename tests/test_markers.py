@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import logging
+from itertools import product
+
+import pytest
+from packaging.markers import Marker
+
+from pyproject2conda import markers, requirements
+from pyproject2conda.markers import (
+    CONDA_PLATFORMS,
+    CompiledMarker,
+    MarkerEvaluator,
+    evaluate_marker,
+    marker_environment,
+    platform_environment,
+)
+from pyproject2conda.timings import Timings
+
+MARKERS = [
+    "python_version < '3.11'",
+    "python_version >= '3.10' and python_version < '3.12'",
+    "python_full_version >= '3.10.2'",
+    "python_version == '3.1*'",
+    "python_version ~= '3.10'",
+    "'3.11' <= python_version",
+    "sys_platform == 'win32' or sys_platform == 'darwin'",
+    "sys_platform != 'win32' and (platform_machine == 'x86_64' or python_version > '3.11')",
+    "'linux' in sys_platform",
+    "platform_machine not in 'arm64 aarch64'",
+    "implementation_name == 'cpython' and python_version < '3.12'",
+    "python_version in '3.10 3.11'",
+    "python_version < '3.11' or sys_platform == 'win32' and platform_machine == 'arm64'",
+    "(python_version < '3.11' or sys_platform == 'win32') and implementation_name != 'pypy'",
+    "sys.platform == 'linux' and ((python_version == '3.9'))",
+    "sys_platform == \"it's\" or python_version == '3.12'",
+]
+
+ENVIRONMENTS = [
+    {
+        "python_version": python_version,
+        "python_full_version": f"{python_version}.{micro}",
+        "sys_platform": sys_platform,
+        "platform_machine": platform_machine,
+        "implementation_name": implementation_name,
+    }
+    for python_version, micro, sys_platform, platform_machine, implementation_name in product(
+        ["3.9", "3.10", "3.11", "3.12"],
+        ["0", "5"],
+        ["linux", "win32", "darwin"],
+        ["x86_64", "arm64"],
+        ["cpython", "pypy"],
+    )
+]
+
+
+@pytest.mark.parametrize("marker", MARKERS)
+def test_matches_packaging(marker: str) -> None:
+    compiled = CompiledMarker(Marker(marker))
+    for environment in ENVIRONMENTS:
+        assert compiled.evaluate(environment) is Marker(marker).evaluate(environment)
+
+
+@pytest.mark.parametrize(
+    ("marker", "environment", "expected"),
+    [
+        ("sys_platform == 'win32'", {"python_version": "3.10"}, None),
+        ("python_version < '3.11'", {}, None),
+        ("python_full_version >= '3.10.2'", {"python_version": "3.10"}, None),
+        (
+            "python_version < '3.11' and sys_platform == 'win32'",
+            {"python_version": "3.12"},
+            False,
+        ),
+        (
+            "python_version < '3.11' and sys_platform == 'win32'",
+            {"python_version": "3.10"},
+            None,
+        ),
+        (
+            "python_version < '3.11' or sys_platform == 'win32'",
+            {"python_version": "3.10"},
+            True,
+        ),
+        (
+            "python_version < '3.11' or sys_platform == 'win32'",
+            {"python_version": "3.12"},
+            None,
+        ),
+        (
+            "python_version < '3.11' or sys_platform == 'win32'",
+            {"python_version": "3.12", "sys_platform": "linux"},
+            False,
+        ),
+        ("extra == 'test'", {"python_version": "3.10"}, None),
+    ],
+)
+def test_undecided(
+    marker: str, environment: dict[str, str], expected: bool | None
+) -> None:
+    assert evaluate_marker(marker, environment) is expected
+
+
+def test_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    timings = Timings()
+    monkeypatch.setattr("pyproject2conda.markers.TIMINGS", timings)
+    timings.start()
+
+    evaluator = MarkerEvaluator()
+    marker = Marker("python_version < '3.11'")
+    compiled = evaluator.compile(marker)
+    assert evaluator.compile(marker) is compiled
+    assert compiled.keys == ("python_version",)
+
+    for sys_platform in ["linux", "win32", "darwin"]:
+        for python_version in ["3.10", "3.11"]:
+            evaluator.evaluate(
+                marker, {"python_version": python_version, "sys_platform": sys_platform}
+            )
+    # only keys used by the marker are part of the cache key
+    assert timings.counters == {"marker-evaluations": 2, "marker-cache-hits": 4}
+
+    evaluator.clear()
+    assert not len(evaluator)
+
+
+def test_conda_requirements_undecided(caplog: pytest.LogCaptureFixture) -> None:
+    d = requirements.ParseDepends.from_string(
+        """
+        [project]
+        name = "hello"
+        dependencies = [
+            "a ; python_version < '3.11'",
+            "b ; sys_platform == 'win32'",
+            "c ; python_version >= '3.11' and sys_platform == 'win32'",
+        ]
+        """
+    )
+    with caplog.at_level(logging.INFO, logger="pyproject2conda"):
+        conda, _ = d.conda_and_pip_requirements(python_version="3.10")
+    assert conda == ["a", "b"]
+    assert "Cannot decide marker of b; sys_platform" in caplog.text
+
+    # no environment keeps everything
+    assert d.conda_and_pip_requirements()[0] == ["a", "b", "c"]
+    assert len(requirements.REQUIREMENT_POOL.markers) >= 3
+
+
+@pytest.mark.parametrize("platform", CONDA_PLATFORMS)
+def test_platform_environment(platform: str) -> None:
+    environment = marker_environment("3.12", platform)
+    assert environment == {"python_version": "3.12", **platform_environment(platform)}
+    assert evaluate_marker("sys_platform == 'win32'", environment) is (
+        platform.startswith("win")
+    )
+    assert evaluate_marker("os_name == 'nt'", environment) is platform.startswith("win")
+    assert evaluate_marker("platform_system == 'Darwin'", environment) is (
+        platform.startswith("osx")
+    )
+    assert evaluate_marker(
+        "platform_machine == 'x86_64' or platform_machine == 'AMD64'", environment
+    ) is platform.endswith("-64")
+
+
+def test_platform_environment_unknown() -> None:
+    with pytest.raises(ValueError, match=r"Unknown platform 'linux'"):
+        platform_environment("linux")
+
+
+@pytest.mark.parametrize(
+    "marker",
+    [
+        "python_version <",
+        "python_version < '3.11' and",
+        "(python_version < '3.11'",
+        "python_version not '3.11'",
+        "python_version < '3.11' )",
+        "and == '3.11'",
+        "python_version ! '3.11'",
+    ],
+)
+def test_parse_marker_error(marker: str) -> None:
+    with pytest.raises(ValueError, match=r"Cannot parse marker"):
+        markers._parse_marker(marker)  # noqa: SLF001
+
+
+def test_parse_marker() -> None:
+    # parsed from normalized string form of packaging
+    marker = Marker("os.name == 'nt' and (python_version < '3.11' or 'x' not in extra)")
+    assert markers._parse_marker(marker) == (  # noqa: SLF001
+        "and",
+        [
+            markers._Leaf((True, "os_name"), "==", (False, "nt")),  # noqa: SLF001
+            (
+                "or",
+                [
+                    markers._Leaf((True, "python_version"), "<", (False, "3.11")),  # noqa: SLF001
+                    markers._Leaf((False, "x"), "not in", (True, "extra")),  # noqa: SLF001
+                ],
+            ),
+        ],
+    )
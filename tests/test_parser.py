@@ -4,9 +4,11 @@ from __future__ import annotations
 
 import locale
 import tempfile
+from dataclasses import FrozenInstanceError
 from textwrap import dedent
 
 import pytest
+from packaging.requirements import InvalidRequirement, Requirement
 
 from pyproject2conda import requirements
 from pyproject2conda.utils import get_in
@@ -1007,3 +1009,450 @@ def test_include_pip() -> None:
     d = requirements.ParseDepends.from_string(toml)
 
     assert dedent(expected) == d.to_conda_yaml(extras="test", conda_deps="pip")
+
+
+def test_env_inputs() -> None:
+    toml = dedent(
+        """\
+    [project]
+    name = "hello"
+    dependencies = ["athing"]
+
+    [project.optional-dependencies]
+    test = ["pytest"]
+    other = ["other"]
+    dev = ["hello[test]", "dev-package"]
+
+    [dependency-groups]
+    test = ["pytest", "hello[test]"]
+    lint = ["ruff"]
+    dev = [{include-group = "TEST"}, "dev-package-group"]
+
+    [tool.pyproject2conda]
+    channels = "conda-forge"
+
+    [tool.pyproject2conda.dependencies]
+    athing = { pip = true }
+    pytest = { channel = "conda-forge" }
+    ruff = { pip = true }
+    """
+    )
+
+    d = requirements.ParseDepends.from_string(toml)
+
+    out = d.env_inputs(extras="dev")
+    assert out["dependencies"] == ["athing"]
+    assert out["optional-dependencies"] == {
+        "dev": ["hello[test]", "dev-package"],
+        "test": ["pytest"],
+    }
+    assert out["dependency-groups"] == {}
+    assert out["overrides"] == {
+        "athing": {"pip": True},
+        "pytest": {"channel": "conda-forge"},
+    }
+    assert out["requires-python"] is None
+
+    out = d.env_inputs(groups="dev", skip_package=True)
+    assert out["dependencies"] is None
+    assert out["optional-dependencies"] == {"test": ["pytest"]}
+    assert set(out["dependency-groups"]) == {"dev", "test"}
+    assert out["overrides"] == {"pytest": {"channel": "conda-forge"}}
+
+    # other tables do not matter
+    d2 = requirements.ParseDepends.from_string(
+        toml.replace('lint = ["ruff"]', 'lint = ["ruff", "mypy"]').replace(
+            'other = ["other"]', 'other = ["other2"]'
+        )
+    )
+    assert d.env_inputs(extras="dev") == d2.env_inputs(extras="dev")
+    assert d.env_inputs(groups="dev") == d2.env_inputs(groups="dev")
+    assert d.env_inputs(groups="lint") != d2.env_inputs(groups="lint")
+
+
+def test_lazy_resolution() -> None:
+    toml = dedent(
+        """\
+        [project]
+        name = "hello"
+        [project.optional-dependencies]
+        test = ["pytest"]
+        broken = ["not a valid requirement !!"]
+        [dependency-groups]
+        lint = ["ruff"]
+        dev = [{ include-group = "lint" }, "hello[test]", "ipython"]
+        cycle = [{ include-group = "cycle" }]
+        """
+    )
+
+    d = requirements.ParseDepends.from_string(toml)
+    assert list(d.requirements_groups) == [
+        "lint",
+        "dev",
+        "cycle",
+        "build-system.requires",
+    ]
+
+    # only requested groups (and what they include) are resolved
+    assert d.pip_requirements(groups="dev", skip_package=True) == [
+        "ipython",
+        "pytest",
+        "ruff",
+    ]
+    assert sorted(d.graph._resolved) == [  # noqa: SLF001
+        ("extra", "test"),
+        ("group", "dev"),
+        ("group", "lint"),
+    ]
+
+    with pytest.raises(ValueError, match=r"Cyclic"):
+        d.pip_requirements(groups="cycle")
+    with pytest.raises(InvalidRequirement):
+        d.pip_requirements(extras="broken")
+    with pytest.raises(KeyError):
+        d.requirements_extras["missing"]
+
+
+def test_requirement_pool() -> None:
+    pool = requirements.RequirementPool(maxsize=2)
+
+    a = pool.get("a[x] >= 1 ; python_version < '3.11'")
+    assert pool.get("a[x] >= 1 ; python_version < '3.11'") is a
+    assert str(a) == 'a[x]>=1; python_version < "3.11"'
+    assert len(pool) == 1
+
+    with pytest.raises(InvalidRequirement):
+        pool.get("not valid !!")
+    assert len(pool) == 1
+
+    assert pool.conda_string(a) == "a>=1"
+    assert pool.conda_string(a, "conda-forge") == "conda-forge::a>=1"
+    assert pool.conda_string(a) is pool.conda_string(a)
+
+    # full pool is cleared
+    pool.get("b")
+    pool.get("c")
+    assert len(pool) == 1
+    pool.clear()
+    assert not len(pool)
+
+
+def test_requirement_pool_shared() -> None:
+    requirements.REQUIREMENT_POOL.clear()
+    d = requirements.ParseDepends.from_string(
+        """
+        [project]
+        name = "hello"
+        dependencies = ["numpy"]
+        [project.optional-dependencies]
+        test = ["pytest", "numpy"]
+        [dependency-groups]
+        dev = ["pytest", "ruff"]
+        [tool.pyproject2conda.dependencies]
+        ruff = {pip = true, packages = ["numpy"]}
+        """
+    )
+    conda, pip = d.conda_and_pip_requirements(
+        extras="test", groups="dev", pip_deps="ruff"
+    )
+    assert conda == ["numpy", "pytest", "pip"]
+    assert pip == ["ruff"]
+    assert len(requirements.REQUIREMENT_POOL) == 3
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "a",
+        "A_b.C",
+        "a[y,x] >= 1, < 2",
+        "a ; python_version < '3.11'",
+        "a[x] @ https://example.com/a.tar.gz",
+        "a @ https://example.com/a.tar.gz ; sys_platform == 'win32'",
+    ],
+)
+def test_requirement_record(value: str) -> None:
+    requirement = Requirement(value)
+    record = requirements.RequirementRecord.from_requirement(requirement)
+
+    assert str(record) == str(requirement)
+    assert record.to_requirement() == requirement
+    assert record == requirements.RequirementRecord.from_requirement(Requirement(value))
+    assert hash(record) == hash(
+        requirements.RequirementRecord.from_requirement(Requirement(value))
+    )
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        record.name = "other"  # type: ignore[misc]
+
+    assert record.without_marker().marker is None
+    assert record.without_extras().extras == ()
+    assert record.without_marker().without_extras().with_channel(None) == (
+        record.without_extras().without_marker()
+    )
+
+    channel = record.with_channel("conda-forge")
+    assert str(channel).startswith(f"conda-forge::{requirement.name}")
+    assert channel.with_channel("conda-forge") is channel
+    with pytest.raises(ValueError, match=r"has a channel"):
+        channel.to_requirement()
+
+
+def test_requirements_api() -> None:
+    d = requirements.ParseDepends.from_string(
+        """
+        [project]
+        name = "hello"
+        dependencies = ["a[x] >= 1"]
+        [project.optional-dependencies]
+        test = ["b ; python_version < '3.11'"]
+        [dependency-groups]
+        dev = ["hello[test]"]
+        """
+    )
+    # public interface uses packaging.requirements.Requirement
+    assert d.requirements_base == [Requirement("a[x]>=1")]
+    assert d.requirements_extras["test"] == [Requirement("b; python_version<'3.11'")]
+    assert d.requirements_groups["dev"] == d.requirements_extras["test"]
+    assert d.requirements_groups["dev"] is d.requirements_groups["dev"]
+
+
+def test_conda_and_pip_requirements_matrix() -> None:
+    d = requirements.ParseDepends.from_string(
+        """
+        [project]
+        name = "hello"
+        requires-python = ">=3.9"
+        dependencies = [
+            "a",
+            "b ; python_version < '3.11'",
+            "c ; python_version >= '3.11'",
+            "d[x] >= 1 ; python_version >= '3.10'",
+            "e",
+        ]
+        [project.optional-dependencies]
+        test = ["f ; python_version < '3.10'", "a"]
+        [tool.pyproject2conda.dependencies]
+        e = {pip = true}
+        f = {channel = "conda-forge", packages = ["g ; python_version < '3.12'"]}
+        """
+    )
+    pythons = ["3.9", "3.10", "3.11", "3.12", None]
+    kws = {
+        "extras": "test",
+        "conda_deps": ["h ; python_version > '3.10'"],
+        "python_include": "infer",
+    }
+    matrix = d.conda_and_pip_requirements_matrix(pythons, **kws)  # type: ignore[arg-type]
+
+    assert list(matrix) == [(python_version, None) for python_version in pythons]
+    for python_version in pythons:
+        assert matrix[python_version, None] == d.conda_and_pip_requirements(
+            python_version=python_version,
+            **kws,  # type: ignore[arg-type]
+        )
+    # python independent part computed once
+    assert len(d._conda_and_pip_base_cache) == 1  # noqa: SLF001
+
+    assert matrix["3.9", None] == (
+        ["python>=3.9", "a", "b", "conda-forge::f", "g", "pip"],
+        ["e"],
+    )
+    assert matrix["3.12", None] == (
+        ["python>=3.9", "a", "c", "d>=1", "h", "pip"],
+        ["e"],
+    )
+    assert matrix[None, None][0] == [
+        "python>=3.9",
+        "a",
+        "b",
+        "c",
+        "conda-forge::f",
+        "d>=1",
+        "g",
+        "h",
+        "pip",
+    ]
+
+
+def test_conda_and_pip_requirements_platforms() -> None:
+    d = requirements.ParseDepends.from_string(
+        """
+        [project]
+        name = "hello"
+        dependencies = [
+            "a",
+            "b ; sys_platform == 'win32'",
+            "c ; sys_platform != 'win32' and python_version < '3.11'",
+            "d ; platform_machine == 'arm64'",
+            "e ; platform_system == 'Linux'",
+            "f ; sys_platform == 'linux'",
+        ]
+        [tool.pyproject2conda.dependencies]
+        f = {pip = true}
+        """
+    )
+    pythons = ["3.10", "3.12"]
+    platforms = ["linux-64", "osx-arm64", "win-64"]
+    matrix = d.conda_and_pip_requirements_matrix(pythons, platforms)
+
+    assert list(matrix) == [(p, s) for p in pythons for s in platforms]
+    for (python_version, platform), value in matrix.items():
+        assert value == d.conda_and_pip_requirements(
+            python_version=python_version, platform=platform
+        )
+    assert len(d._conda_and_pip_base_cache) == 1  # noqa: SLF001
+
+    assert matrix["3.10", "linux-64"][0] == ["a", "c", "e", "pip"]
+    assert matrix["3.12", "linux-64"][0] == ["a", "e", "pip"]
+    assert matrix["3.10", "osx-arm64"][0] == ["a", "c", "d", "pip"]
+    assert matrix["3.12", "win-64"][0] == ["a", "b", "pip"]
+    # pip requirements keep markers
+    assert matrix["3.12", "win-64"][1] == ['f;sys_platform=="linux"']
+
+    # platform only
+    assert d.conda_and_pip_requirements(platform="win-64")[0] == [
+        "a",
+        "b",
+        "pip",
+    ]
+
+    with pytest.raises(ValueError, match=r"Unknown platform"):
+        d.conda_and_pip_requirements(platform="linux-65")
+
+
+def test_override_index() -> None:
+    from pyproject2conda.overrides import OverrideDeps, OverrideIndex
+
+    index = OverrideIndex(
+        {
+            "Pytest_Accept": OverrideDeps(pip=True),
+            "types-*": OverrideDeps(pip=True),
+            "types-six": OverrideDeps(channel="conda-forge"),
+            "re:jupyterlab-.*": OverrideDeps(channel="conda-forge"),
+            "re:jupyter.*": OverrideDeps(skip=True),
+        }
+    )
+
+    assert list(index) == [
+        "Pytest_Accept",
+        "types-*",
+        "types-six",
+        "re:jupyterlab-.*",
+        "re:jupyter.*",
+    ]
+    for name in ("pytest-accept", "pytest_accept", "Pytest.Accept"):
+        assert index.key(name) == "Pytest_Accept"
+        assert name in index
+    # exact names take precedence over patterns
+    assert index.key("Types_Six") == "types-six"
+    assert index.key("types_requests") == "types-*"
+    # patterns match the whole name, in the order written
+    assert index.key("jupyterlab-git") == "re:jupyterlab-.*"
+    assert index["jupyter-server"].skip
+    assert index.key("jupyterlab") == "re:jupyter.*"
+    assert index.key("my-types-thing") is None
+    assert index.get("numpy") is None
+
+    # regular expressions are compiled separately
+    index = OverrideIndex(
+        {
+            "types-*": OverrideDeps(pip=True),
+            "re:(?i)PY-.*": OverrideDeps(skip=True),
+            "re:(\\w+)-\\1": OverrideDeps(pip=True),
+            "re:(\\w+)-plugin-\\1": OverrideDeps(pip=True),
+            "*-stubs": OverrideDeps(pip=True),
+            "*-plugin-*": OverrideDeps(),
+        }
+    )
+    assert index.key("py-thing") == "re:(?i)PY-.*"
+    assert index.key("abc-abc") == "re:(\\w+)-\\1"
+    assert index.key("abc-plugin-abc") == "re:(\\w+)-plugin-\\1"
+    assert index.key("abc-plugin-xyz") == "*-plugin-*"
+    assert index.key("thing-stubs") == "*-stubs"
+    assert index.key("types-abc") == "types-*"
+    assert index.key("abc-xyz") is None
+
+    with pytest.raises(ValueError, match=r"Duplicate dependencies keys"):
+        OverrideIndex({"a_b": OverrideDeps(), "A-B": OverrideDeps()})
+    with pytest.raises(ValueError, match=r"Invalid pattern 're:\('"):
+        OverrideIndex({"re:(": OverrideDeps()})
+
+
+def test_override_patterns() -> None:
+    d = requirements.ParseDepends.from_string(
+        """
+        [project]
+        name = "hello"
+        dependencies = [
+            "numpy",
+            "Pytest_Accept",
+            "types-requests",
+            "types-PyYAML",
+            "jupyterlab-git",
+            "jupyterlab_widgets",
+        ]
+        [tool.pyproject2conda.dependencies]
+        pytest-accept = {pip = true}
+        "types-*" = {pip = true}
+        "re:jupyterlab-.*" = {channel = "conda-forge"}
+        unused = {skip = true}
+        """
+    )
+
+    assert d.conda_and_pip_requirements() == (
+        [
+            "conda-forge::jupyterlab-git",
+            "conda-forge::jupyterlab_widgets",
+            "numpy",
+            "pip",
+        ],
+        ["Pytest_Accept", "types-PyYAML", "types-requests"],
+    )
+    assert list(d.env_inputs()["overrides"]) == [
+        "pytest-accept",
+        "types-*",
+        "re:jupyterlab-.*",
+    ]
+
+
+def test_resolve() -> None:
+    d = requirements.ParseDepends.from_string(
+        """
+        [project]
+        name = "hello"
+        dependencies = ["a", "b ; python_version < '3.11'", "c ; sys_platform == 'win32'"]
+        [project.optional-dependencies]
+        test = ["pytest"]
+        [tool.pyproject2conda.dependencies]
+        pytest = {pip = true}
+        """
+    )
+
+    resolved = d.resolve(extras="test", python_version="3.10", conda_deps="d")
+    assert (
+        d.resolve(extras=["test"], python_version="3.10", conda_deps=["d"]) is resolved
+    )
+    # undecided markers are kept
+    expected = ["a", "b", "c", "d", "pip"]
+    assert resolved.conda_and_pip_requirements() == (expected, ["pytest"])
+    # rendered lists are copies
+    resolved.conda_and_pip_requirements()[0].clear()
+    assert resolved.conda_and_pip_requirements()[0] == expected
+
+    # python independent outputs share the latest resolution
+    assert d.pip_requirements(extras="test") == [
+        "a",
+        'b;python_version<"3.11"',
+        'c;sys_platform=="win32"',
+        "pytest",
+    ]
+    assert ("requirements", True, True, True) in resolved._rendered  # noqa: SLF001
+    assert "e" in d.pip_requirements(extras="test", pip_deps="e")
+
+    # environments with the same requirements share a resolution
+    matrix = d.resolve_matrix(["3.10", "3.12"], ["linux-64", "osx-64", "win-64"])
+    assert matrix["3.12", "linux-64"] is matrix["3.12", "osx-64"]
+    assert matrix["3.12", "linux-64"] is not matrix["3.10", "linux-64"]
+    assert len({id(x) for x in matrix.values()}) == 4
+    assert matrix["3.12", "win-64"].conda_and_pip_requirements() == (["a", "c"], [])
@@ -0,0 +1,77 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from pyproject2conda.cli import app
+from pyproject2conda.project import get_context, render_project
+
+ROOT = Path(__file__).resolve().parent / "data"
+
+
+def test_render_project_matches_cli(project_path: Path, runner) -> None:
+    rendered = list(render_project(header=False))
+    assert not any(project_path.glob("*.yaml"))
+
+    result = runner.invoke(app, ["project", "--no-header"])
+    assert result.exit_code == 0, result.output
+
+    assert {x.output for x in rendered} == {
+        Path(p.name) for p in project_path.glob("*.*") if p.suffix in {".txt", ".yaml"}
+    }
+    for x in rendered:
+        assert x.output is not None
+        assert x.text == x.output.read_text()
+        assert x.style == ("yaml" if x.output.suffix == ".yaml" else "requirements")
+    assert [x.env for x in rendered if x.style == "requirements"] == [
+        "base",
+        "test-extras",
+    ]
+    assert rendered[1].options["python"] == "3.10"
+
+
+@pytest.mark.usefixtures("project_path")
+def test_render_project() -> None:
+    out = next(render_project(envs=["test"], template_python="hello-{py}"))
+    assert out.output == Path("hello-310.yaml")
+    assert out.text.startswith("#\n# This file is autogenerated by pyproject2conda")
+    assert "$ pyproject2conda project\n" in out.text
+    assert not out.output.exists()
+
+    # write only what is needed
+    assert out.write()
+    assert not out.write()
+
+    x, *_ = render_project(envs=["test"], custom_command="make env", dry=False)
+    assert "make env" in x.text
+    assert x.output is not None
+    assert x.output.read_text() == x.text
+
+    with pytest.raises(ValueError, match=r"unknown env|not in config"):
+        list(render_project(envs=["missing"]))
+
+
+def test_render_project_reuses_context(project_path: Path) -> None:
+    path = project_path / "pyproject.toml"
+
+    first = [x.text for x in render_project(path, envs=["test"])]
+    context = get_context(path)
+    assert [x.text for x in render_project(path, envs=["test"])] == first
+    assert get_context(path) is context
+
+    path.write_text(path.read_text().replace('"pandas",', '"pandas>=2",'))
+    changed = [x.text for x in render_project(path, envs=["test"])]
+    assert get_context(path) is not context
+    assert "pandas>=2" in changed[0]
+    assert "pandas>=2" not in first[0]
+
+
+@pytest.mark.usefixtures("project_path")
+def test_render_project_empty() -> None:
+    (out,) = render_project(envs=["base"], skip_package=True, allow_empty=True)
+    assert out.empty
+    assert not out.write()
+    assert out.output is not None
+    assert not out.output.exists()
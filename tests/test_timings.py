@@ -0,0 +1,86 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+from __future__ import annotations
+
+import json
+import pstats
+import shutil
+from pathlib import Path
+
+from pyproject2conda.cli import app
+from pyproject2conda.requirements import REQUIREMENT_POOL
+from pyproject2conda.timings import TIMINGS, Timings
+
+ROOT = Path(__file__).resolve().parent / "data"
+
+
+def test_timings() -> None:
+    t = Timings()
+
+    # disabled is a no-op
+    with t.phase("a"):
+        t.count("x")
+    assert not t.phases
+    assert not t.counters
+
+    t.start()
+    with t.phase("a"), t.phase("a"):
+        t.count("x")
+        t.count("x", 2)
+    t.stop()
+
+    assert not t.enabled
+    assert set(t.phases) == {"a", "total"}
+    # nested phase with same name only timed once
+    assert t.calls["a"] == 1
+    assert t.counters == {"x": 3}
+    assert t.to_dict()["counters"] == {"x": 3}
+    assert "x" in t.report()
+
+
+def test_timings_cli(example_path: Path, runner) -> None:
+    shutil.copy(ROOT / "test-pyproject.toml", example_path / "pyproject.toml")
+    shutil.copytree(ROOT / "config", example_path / "config")
+    REQUIREMENT_POOL.clear()
+
+    result = runner.invoke(
+        app,
+        [
+            "--timings",
+            "--timings-output",
+            "timings.json",
+            "--profile",
+            "p2c.prof",
+            "project",
+            "-w",
+            "force",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert not TIMINGS.enabled
+
+    data = json.loads((example_path / "timings.json").read_text())
+    assert {"total", "load", "config", "resolve", "render", "write"} <= set(
+        data["phases"]
+    )
+    counters = data["counters"]
+    assert counters["outputs-rendered"] == len(list(example_path.glob("*.yaml"))) + len(
+        list(example_path.glob("*.txt"))
+    )
+    assert counters["bytes-written"] > 0
+    assert counters["config-lookups"] > 0
+    assert counters["requirement-parses"] > 0
+    assert counters["requirement-parses"] == counters["requirement-pool-misses"]
+    assert counters["requirement-pool-hits"] > 0
+    assert counters["marker-evaluations"] > 0
+
+    assert "requirement-parses" in result.stderr
+    assert pstats.Stats(str(example_path / "p2c.prof")).total_calls > 0  # type: ignore[attr-defined]
+
+    # second run skips all outputs
+    result = runner.invoke(
+        app, ["--timings-output", "timings.json", "project", "-w", "check"]
+    )
+    assert result.exit_code == 0, result.output
+    counters = json.loads((example_path / "timings.json").read_text())["counters"]
+    assert counters["outputs-skipped"] > 0
+    assert "outputs-rendered" not in counters
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import stat
+import sys
 from contextlib import nullcontext
 from typing import TYPE_CHECKING
 
@@ -143,3 +145,57 @@ def test_conda_env_name_from_template(
             )
             == e
         )
+
+
+def test_write_if_changed(tmp_path: Path) -> None:
+    path = tmp_path / "out.txt"
+    counter = utils.WRITE_COUNTER
+    counter.reset()
+
+    assert utils.write_if_changed(path, "hello\nthere\n")
+    assert path.read_text() == "hello\nthere\n"
+    mtime = path.stat().st_mtime_ns
+
+    assert not utils.write_if_changed(path, "hello\nthere\n")
+    assert path.stat().st_mtime_ns == mtime
+
+    # same size, different content
+    assert utils.write_if_changed(path, "hello\nThere\n")
+    assert path.read_text() == "hello\nThere\n"
+
+    assert (counter.written, counter.skipped) == (2, 1)
+    # no leftover temporary files
+    assert [p.name for p in tmp_path.iterdir()] == ["out.txt"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="posix permissions and symlinks")
+def test_atomic_write_bytes(tmp_path: Path) -> None:
+    target = tmp_path / "target.txt"
+    target.write_text("old")
+    target.chmod(0o755)
+    link = tmp_path / "link.txt"
+    link.symlink_to(target)
+
+    utils.atomic_write_bytes(link, b"new")
+    # symlink is kept, and target is written with its permissions
+    assert link.is_symlink()
+    assert target.read_bytes() == b"new"
+    assert stat.S_IMODE(target.stat().st_mode) == 0o755
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["link.txt", "target.txt"]
+
+
+def test_diff_file(tmp_path: Path) -> None:
+    path = tmp_path / "out.txt"
+    diff = utils.diff_file(path, "hello\n", name="out.txt")
+    assert diff == "--- /dev/null\n+++ b/out.txt\n@@ -0,0 +1 @@\n+hello\n"
+    assert not path.exists()
+
+    assert utils.write_if_changed(path, "hello\nthere\n")
+    mtime = path.stat().st_mtime_ns
+    assert utils.diff_file(path, "hello\nthere\n") is None
+
+    diff = utils.diff_file(path, "hello\nThere\n", name="out.txt")
+    assert diff is not None
+    assert diff.splitlines()[:2] == ["--- a/out.txt", "+++ b/out.txt"]
+    assert "-there\n+There\n" in diff
+    assert path.stat().st_mtime_ns == mtime
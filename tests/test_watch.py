@@ -0,0 +1,148 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+from __future__ import annotations
+
+import shutil
+import sys
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pyproject2conda import watch
+from pyproject2conda.cli import _ProjectWatcher, app
+from pyproject2conda.project import CONTEXTS
+from pyproject2conda.watch import iter_changes
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    import pytest
+    from click.testing import CliRunner
+
+ROOT = Path(__file__).resolve().parent / "data"
+
+
+def test_iter_changes_poll(example_path: Path) -> None:
+    a, b = example_path / "a.txt", example_path / "b.txt"
+    a.write_text("a")
+
+    stop_event = threading.Event()
+    timer = threading.Timer(0.05, lambda: (a.write_text("aa"), b.write_text("b")))
+    timer.start()
+    try:
+        changes = iter_changes(
+            [a, "b.txt"], interval=0.01, poll=True, stop_event=stop_event
+        )
+        seen: set[Path] = set()
+        for changed in changes:
+            seen |= changed
+            if seen == {a, b}:
+                stop_event.set()
+    finally:
+        timer.cancel()
+
+    assert seen == {a, b}
+
+
+def test_project_watcher(example_path: Path) -> None:
+    shutil.copy(ROOT / "test-pyproject.toml", example_path / "pyproject.toml")
+    shutil.copytree(ROOT / "config", example_path / "config")
+    CONTEXTS.clear()
+
+    path = example_path / "pyproject.toml"
+    watcher = _ProjectWatcher(path, user_config="infer", options={"header": False})
+    assert watcher.user_config == example_path / "config" / "userconfig.toml"
+    assert {p.name for p in watcher.paths()} == {
+        "pyproject.toml",
+        "userconfig.toml",
+        ".python-version-default",
+        ".python-version",
+    }
+
+    created = watcher.update()
+    assert created
+    assert all(Path(output).exists() for _, output in created)
+    assert not watcher.update()
+
+    # unrelated change
+    with path.open("a") as f:
+        f.write('\n[dependency-groups]\nnew = ["thing"]\n')
+    watcher.reload({path})
+    assert not watcher.update()
+
+    # only environments using changed extra
+    path.write_text(path.read_text().replace('"build",', '"build>=1.0",'))
+    watcher.reload({path})
+    assert {Path(output).name for _, output in watcher.update()} == {
+        "py310-dist-pypi.yaml",
+        "py310-user-dev.yaml",
+    }
+    assert "build>=1.0" in (example_path / "py310-dist-pypi.yaml").read_text()
+
+    # user config
+    user = example_path / "config" / "userconfig.toml"
+    user.write_text(user.read_text().replace("user-dev", "user-dev2"))
+    watcher.reload({user})
+    assert [Path(output).name for _, output in watcher.update()] == [
+        "py310-user-dev2.yaml"
+    ]
+
+    # removed output is recreated
+    (example_path / "py310-user-dev2.yaml").unlink()
+    assert len(watcher.update()) == 1
+
+
+def test_cli_watch(
+    example_path: Path, runner: CliRunner, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    shutil.copy(ROOT / "test-pyproject.toml", example_path / "pyproject.toml")
+    shutil.copytree(ROOT / "config", example_path / "config")
+    path = example_path / "pyproject.toml"
+    moved = example_path / "other.toml"
+
+    calls: list[tuple[list[Path], bool | None]] = []
+
+    def _iter_changes(paths, *, interval, poll=None) -> Iterator[set[Path]]:  # noqa: ARG001
+        calls.append((list(paths), poll))
+        if not moved.exists():
+            # move user config
+            (example_path / "config" / "userconfig.toml").rename(moved)
+            moved.write_text(moved.read_text().replace("user-dev", "user-moved"))
+            path.write_text(
+                path.read_text().replace("config/userconfig.toml", "other.toml")
+            )
+            yield {path}
+
+    monkeypatch.setattr(watch, "iter_changes", _iter_changes)
+
+    result = runner.invoke(app, ["watch", "--no-header"])
+    assert result.exit_code == 0, result.output
+    assert (example_path / "py310-user-dev.yaml").exists()
+    assert (example_path / "py310-user-moved.yaml").exists()
+
+    # native notifications unless --poll, and new user config is watched
+    assert [poll for _, poll in calls] == [None, None]
+    assert example_path / "config" / "userconfig.toml" in calls[0][0]
+    assert moved in calls[1][0]
+
+    calls.clear()
+    result = runner.invoke(app, ["watch", "--poll"])
+    assert result.exit_code == 0, result.output
+    assert [poll for _, poll in calls] == [True]
+
+
+def test_cli_watch_import_error(
+    example_path: Path, runner: CliRunner, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    shutil.copy(ROOT / "test-pyproject.toml", example_path / "pyproject.toml")
+    shutil.copytree(ROOT / "config", example_path / "config")
+
+    # found, but cannot be imported
+    monkeypatch.setattr(watch, "has_watchfiles", lambda: True)
+    monkeypatch.setitem(sys.modules, "watchfiles", None)
+
+    result = runner.invoke(app, ["watch", "--no-header"])
+    assert result.exit_code == 1
+    # message may be wrapped
+    output = " ".join(result.output.replace("│", " ").split())
+    assert "pip install 'pyproject2conda[watch]'" in output
+    assert "Or pass `--poll`" in output
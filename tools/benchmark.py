@@ -0,0 +1,480 @@
+"""
+Benchmark pyproject2conda against synthetic projects.
+
+Generates a synthetic ``pyproject.toml`` with (optionally) thousands of
+dependencies, hundreds of extras (including an ``all`` extra that references
+the package itself), deep ``include-group`` chains, many environments, and many
+dependency overrides.  Then times the main stages of ``pyproject2conda``.
+
+Results are written as json, so runs can be compared across commits::
+
+    python tools/benchmark.py --output before.json
+    # ... change code ...
+    python tools/benchmark.py --output after.json --compare before.json
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+    from typing import Any
+
+    from pyproject2conda.requirements import ParseDepends
+
+FORMAT = "[%(name)s - %(levelname)s] %(message)s"
+logging.basicConfig(level=logging.INFO, format=FORMAT)
+logger = logging.getLogger("benchmark")
+
+
+PACKAGE_NAME = "synthpkg"
+PYTHONS = ["3.10", "3.11", "3.12", "3.13", "3.14"]
+PLATFORMS = ["linux-64", "linux-aarch64", "osx-64", "osx-arm64", "win-64"]
+
+
+@dataclass
+class SyntheticProject:
+    """Parameters of synthetic project."""
+
+    deps: int = 1000
+    extras: int = 100
+    deps_per_extra: int = 10
+    group_depth: int = 50
+    envs: int = 100
+    overrides: int = 500
+
+    def _project_lines(self) -> Iterator[str]:
+        yield from (
+            "[project]",
+            f'name = "{PACKAGE_NAME}"',
+            'requires-python = ">=3.10"',
+            "classifiers = [",
+            '    "Programming Language :: Python :: 3.10",',
+            '    "Programming Language :: Python :: 3.11",',
+            "]",
+            "dependencies = [",
+        )
+        for i in range(self.deps):
+            marker = (
+                "; python_version >= '3.10'"
+                if i % 5 == 0
+                else "; sys_platform != 'win32'"
+                if i % 11 == 0
+                else ""
+            )
+            extra = "[extra]" if i % 7 == 0 else ""
+            yield f'    "dep{i}{extra} >= {i % 10}.{i % 3}{marker}",'
+        yield "]"
+
+        yield "[project.optional-dependencies]"
+        for j in range(self.extras):
+            deps = [f'"opt{j}-{k} < {k + 1}"' for k in range(self.deps_per_extra)]
+            # chain of extras referencing the package
+            if j % 10:
+                deps.append(f'"{PACKAGE_NAME}[extra{j - 1}]"')
+            yield f"extra{j} = [{', '.join(deps)}]"
+        extras = ",".join(f"extra{j}" for j in range(self.extras))
+        yield f'all = ["{PACKAGE_NAME}[{extras}]"]'
+
+    def _group_lines(self) -> Iterator[str]:
+        yield "[dependency-groups]"
+        for i in range(self.group_depth):
+            deps = [f'"group{i} > 1"']
+            if i:
+                deps.append(f'{{ include-group = "group{i - 1}" }}')
+            yield f"group{i} = [{', '.join(deps)}]"
+        deps = [f'"{PACKAGE_NAME}[all]"']
+        if self.group_depth:
+            deps.append(f'{{ include-group = "group{self.group_depth - 1}" }}')
+        yield f"dev = [{', '.join(deps)}]"
+
+    def _config_lines(self) -> Iterator[str]:
+        yield from (
+            "[tool.pyproject2conda]",
+            'channels = ["conda-forge"]',
+            'python = ["3.10"]',
+            "header = false",
+            'default-envs = ["dev", "all"]',
+        )
+
+        yield "[tool.pyproject2conda.dependencies]"
+        for i in range(self.overrides):
+            if i % 3 == 0:
+                yield f'dep{i} = {{ channel = "conda-forge" }}'
+            elif i % 3 == 1:
+                yield f"dep{i} = {{ pip = true }}"
+            else:
+                yield f'dep{i} = {{ skip = true, packages = ["dep{i}-conda"] }}'
+
+        for e in range(self.envs):
+            yield f'[tool.pyproject2conda.envs."env{e}"]'
+            if e % 2 and self.group_depth:
+                yield f'groups = ["group{e % self.group_depth}"]'
+            elif self.extras:
+                yield f'extras = ["extra{e % self.extras}"]'
+            if e % 4 == 0:
+                yield 'style = ["yaml", "requirements"]'
+
+        envs = ", ".join(f'"env{e}"' for e in range(0, self.envs, 5))
+        yield from (
+            "[[tool.pyproject2conda.overrides]]",
+            f"envs = [{envs}]",
+            'python = ["3.10", "3.11"]',
+        )
+
+    def to_toml(self) -> str:
+        """Synthetic ``pyproject.toml`` as a string."""
+        lines = [*self._project_lines(), *self._group_lines(), *self._config_lines()]
+        return "\n".join(lines) + "\n"
+
+
+SCALES = {
+    "tiny": SyntheticProject(
+        deps=20, extras=5, deps_per_extra=2, group_depth=3, envs=4, overrides=10
+    ),
+    "small": SyntheticProject(
+        deps=200, extras=20, deps_per_extra=5, group_depth=10, envs=20, overrides=100
+    ),
+    "medium": SyntheticProject(),
+    "large": SyntheticProject(
+        deps=5000,
+        extras=500,
+        deps_per_extra=10,
+        group_depth=200,
+        envs=300,
+        overrides=2000,
+    ),
+}
+
+
+# * Benchmarks -------------------------------------------------------------------------
+def _timeit(
+    func: Callable[[], Any], repeat: int, setup: Callable[[], Any] | None = None
+) -> dict[str, Any]:
+    times: list[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "max": max(times),
+        "repeat": repeat,
+    }
+
+
+def _peak_memory(
+    func: Callable[[], Any], setup: Callable[[], Any] | None = None
+) -> int:
+    """Peak memory (in bytes) allocated by ``func``."""
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _python_matrix(parser: ParseDepends) -> None:
+    # one environment, several python versions
+    kws: dict[str, Any] = {"extras": "all", "groups": "dev", "python_include": "infer"}
+    if hasattr(parser, "conda_and_pip_requirements_matrix"):
+        parser.conda_and_pip_requirements_matrix(PYTHONS, **kws)
+    else:  # older versions
+        for python_version in PYTHONS:
+            parser.conda_and_pip_requirements(python_version=python_version, **kws)
+
+
+def _platform_matrix(parser: ParseDepends) -> None:
+    # one environment, several python versions and platforms
+    import inspect
+
+    if (
+        "platforms"
+        in inspect.signature(
+            getattr(parser, "conda_and_pip_requirements_matrix", _platform_matrix)
+        ).parameters
+    ):
+        parser.conda_and_pip_requirements_matrix(
+            PYTHONS, PLATFORMS, extras="all", groups="dev", python_include="infer"
+        )
+    else:  # older versions: one run per platform
+        for _ in PLATFORMS:
+            _python_matrix(parser)
+
+
+def run_benchmarks(
+    project: SyntheticProject, repeat: int = 5, root: Path | None = None
+) -> dict[str, dict[str, Any]]:
+    """Time stages of ``pyproject2conda`` for ``project``.  Times are in seconds."""
+    p2c_logger = logging.getLogger("pyproject2conda")
+    old_level = p2c_logger.level
+    p2c_logger.setLevel(logging.WARNING)
+    try:
+        return _run_benchmarks(project, repeat=repeat, root=root)
+    finally:
+        p2c_logger.setLevel(old_level)
+
+
+def _run_benchmarks(  # noqa: C901
+    project: SyntheticProject, repeat: int, root: Path | None
+) -> dict[str, dict[str, Any]]:
+    from click.testing import CliRunner
+
+    from pyproject2conda import cli
+    from pyproject2conda import requirements as requirements_module
+    from pyproject2conda._compat import tomllib  # noqa: PLC2701
+    from pyproject2conda.cli import app
+    from pyproject2conda.config import Config
+    from pyproject2conda.requirements import ParseDepends
+
+    text = project.to_toml()
+
+    def clear_caches() -> None:
+        # pool does not exist in older versions
+        if (pool := getattr(requirements_module, "REQUIREMENT_POOL", None)) is not None:
+            pool.clear()
+        # parsers are kept between invocations in older versions
+        getattr(cli, "_REQUIREMENT_PARSERS", {}).clear()
+
+    def parse() -> ParseDepends:
+        d = ParseDepends(tomllib.loads(text))
+        # force full resolution of extras/groups
+        _ = d.graph.resolve_all("extra"), d.graph.resolve_all("group")
+        return d
+
+    parser = parse()
+
+    def clear_parser() -> None:
+        # caches of resolved environments do not exist in older versions
+        for name in (
+            "_conda_and_pip_base_cache",
+            "_resolved_cache",
+            "_resolved_requirements",
+        ):
+            getattr(parser, name, {}).clear()
+
+    def requirements() -> None:
+        parser.conda_and_pip_requirements(
+            extras="all", groups="dev", python_include="infer"
+        )
+
+    def python_matrix() -> None:
+        _python_matrix(parser)
+
+    def platform_matrix() -> None:
+        _platform_matrix(parser)
+
+    def single_env() -> None:
+        # parse and resolve only what a single environment needs
+        ParseDepends(tomllib.loads(text)).conda_and_pip_requirements(extras="extra1")
+
+    def iter_envs() -> None:
+        _ = list(Config.from_toml_dict(tomllib.loads(text)).iter_envs())
+
+    results: dict[str, dict[str, Any]] = {
+        "parse": _timeit(parse, repeat, setup=clear_caches),
+        "conda_and_pip_requirements": _timeit(requirements, repeat, setup=clear_parser),
+        "python_matrix": _timeit(python_matrix, repeat, setup=clear_parser),
+        "platform_matrix": _timeit(platform_matrix, repeat, setup=clear_parser),
+        "single_env": _timeit(single_env, repeat, setup=clear_caches),
+        "iter_envs": _timeit(iter_envs, repeat),
+    }
+
+    with tempfile.TemporaryDirectory(dir=root) as tmpdir:
+        path = Path(tmpdir) / "pyproject.toml"
+        path.write_text(text)
+        runner = CliRunner()
+        old_cwd = Path.cwd()
+        os.chdir(tmpdir)
+        try:
+
+            def project_() -> None:
+                result = runner.invoke(
+                    app, ["project", "-f", str(path), "--overwrite", "force"]
+                )
+                if result.exit_code != 0:
+                    raise RuntimeError(result.output) from result.exception
+
+            results["project"] = _timeit(project_, repeat, setup=clear_caches)
+            results["project"]["peak_memory"] = _peak_memory(
+                project_, setup=clear_caches
+            )
+        finally:
+            os.chdir(old_cwd)
+
+    results.update(_run_monorepo_benchmarks(repeat=repeat, root=root))
+    return results
+
+
+MONOREPO_PROJECTS = 50
+"""Number of (tiny) projects in synthetic monorepo."""
+
+
+def _run_monorepo_benchmarks(
+    repeat: int, root: Path | None
+) -> dict[str, dict[str, Any]]:
+    import inspect
+
+    from click.testing import CliRunner
+
+    from pyproject2conda import cli
+    from pyproject2conda.cli import app
+
+    text = SCALES["tiny"].to_toml()
+    runner = CliRunner()
+    results: dict[str, dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(dir=root) as tmpdir:
+        paths = [
+            Path(tmpdir) / f"pkg{i}" / "pyproject.toml"
+            for i in range(MONOREPO_PROJECTS)
+        ]
+        for path in paths:
+            path.parent.mkdir()
+            path.write_text(text)
+
+        def invoke(*args: str) -> None:
+            result = runner.invoke(app, ["project", *args, "--overwrite", "force"])
+            if result.exit_code != 0:
+                raise RuntimeError(result.output) from result.exception
+
+        def project_recursive() -> None:
+            if "recursive" in inspect.signature(cli.project).parameters:
+                invoke("--recursive", tmpdir)
+                return
+            # older versions: one invocation per project
+            old_cwd = Path.cwd()
+            try:
+                for path in paths:
+                    os.chdir(path.parent)
+                    invoke("-f", str(path))
+            finally:
+                os.chdir(old_cwd)
+
+        results["project_recursive"] = _timeit(project_recursive, repeat)
+        results["project_recursive"]["peak_memory"] = _peak_memory(project_recursive)
+
+    return results
+
+
+# * Reporting --------------------------------------------------------------------------
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def create_report(
+    scale: str, project: SyntheticProject, results: dict[str, dict[str, Any]]
+) -> dict[str, Any]:
+    """Json serializable report of results."""
+    from pyproject2conda import __version__
+
+    return {
+        "version": __version__,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "project": asdict(project),
+        "results": results,
+    }
+
+
+def compare_reports(new: dict[str, Any], old: dict[str, Any]) -> str:
+    """Table comparing median times of ``new`` and ``old`` reports."""
+    out = [
+        f"{'benchmark':<30} {'old [ms]':>10} {'new [ms]':>10} {'ratio':>8}",
+    ]
+    for name, result in new["results"].items():
+        if (old_result := old["results"].get(name)) is None:
+            continue
+        t_old, t_new = old_result["median"], result["median"]
+        out.append(
+            f"{name:<30} {t_old * 1e3:>10.2f} {t_new * 1e3:>10.2f} {t_new / t_old:>8.2f}"
+        )
+        if "peak_memory" in result and "peak_memory" in old_result:
+            m_old, m_new = (
+                old_result["peak_memory"] / 2**20,
+                result["peak_memory"] / 2**20,
+            )
+            out.append(
+                f"{name + ' [MiB]':<30} {m_old:>10.2f} {m_new:>10.2f} {m_new / m_old:>8.2f}"
+            )
+    return "\n".join(out)
+
+
+def get_parser() -> ArgumentParser:
+    """Get argument parser."""
+    parser = ArgumentParser(description="Benchmark pyproject2conda.")
+    parser.add_argument(
+        "--scale",
+        choices=list(SCALES),
+        default="medium",
+        help="Size of synthetic project (default: medium).",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Repeats per benchmark.")
+    parser.add_argument("--output", "-o", type=Path, help="Write json report to file.")
+    parser.add_argument(
+        "--compare", type=Path, help="Compare with previous json report."
+    )
+    parser.add_argument(
+        "--write-pyproject",
+        type=Path,
+        help="Write synthetic pyproject.toml to file and exit.",
+    )
+    return parser
+
+
+def main(args: Sequence[str] | None = None) -> int:
+    """Main script."""
+    options = get_parser().parse_args(args)
+    project = SCALES[options.scale]
+
+    if options.write_pyproject:
+        options.write_pyproject.write_text(project.to_toml())
+        return 0
+
+    logger.info("Running %s benchmarks: %s", options.scale, project)
+    report = create_report(
+        options.scale, project, run_benchmarks(project, repeat=options.repeat)
+    )
+
+    if options.output:
+        options.output.write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))  # noqa: T201
+
+    if options.compare:
+        old = json.loads(options.compare.read_text())
+        print(compare_reports(report, old), file=sys.stderr)  # noqa: T201
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())